@@ -0,0 +1,130 @@
+"""
+Background Suppressor
+Preprocessing sebelum OCR: chat box ada di atas scene game yang bergerak,
+dan tesseract membuang waktu membaca tekstur background setiap frame.
+
+N frame grayscale terakhir disimpan di ring buffer NumPy (preallocated,
+di-update in place). Pixel yang nilainya berubah-ubah di ring buffer
+(max - min > threshold) dianggap background bergerak dan diisi dengan SATU
+nilai flat: level background frame ini, yaitu median model background
+(temporal median atau min) di semua pixel bergerak. Mengisi per pixel
+dengan model itu sendiri tidak cukup, karena median/min dari tekstur yang
+bergerak masih bertekstur dan berubah tiap frame, jadi tesseract tetap
+membacanya. Dengan fill flat, yang tersisa hanya text statis yang kontras.
+
+Catatan: text yang baru muncul butuh `depth` frame sebelum dianggap statis
+di area yang background-nya bergerak, jadi depth sebaiknya kecil (3-4).
+"""
+
+from PIL import Image
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Model background untuk pixel yang bergerak
+BACKGROUND_MEDIAN = "median"
+BACKGROUND_MIN = "min"
+
+
+class BackgroundSuppressor:
+    """Temporal background model untuk capture area"""
+
+    def __init__(self, depth=3, mode=BACKGROUND_MEDIAN, threshold=24):
+        """
+        Args:
+            depth (int): Jumlah frame di ring buffer
+            mode (str): "median" atau "min" (min = background gelap,
+                lebih murah dihitung)
+            threshold (int): Range (max - min) di atas ini = pixel bergerak
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for background suppression")
+
+        self.depth = depth
+        self.mode = mode
+        self.threshold = threshold
+
+        self._shape = None
+        self._index = 0
+        self._filled = 0
+
+        # Stats
+        self.frames = 0
+        self.suppressed_fraction = 0.0
+
+    def _allocate(self, shape):
+        """Alokasi ring buffer + buffer kerja (sekali per ukuran frame)"""
+        self._shape = shape
+        self._ring = np.empty((self.depth,) + shape, dtype=np.uint8)
+        self._max = np.empty(shape, dtype=np.uint8)
+        self._min = np.empty(shape, dtype=np.uint8)
+        self._background = np.empty(shape, dtype=np.uint8)
+        self._mask = np.empty(shape, dtype=bool)
+        self._out = np.empty(shape, dtype=np.uint8)
+        self._index = 0
+        self._filled = 0
+
+    def reset(self):
+        """Kosongkan ring buffer (misal setelah capture area berubah)"""
+        self._filled = 0
+        self._index = 0
+
+    def apply(self, gray):
+        """
+        Suppress background bergerak di satu frame
+
+        Args:
+            gray (np.ndarray): Frame grayscale uint8 (H, W)
+
+        Returns:
+            np.ndarray: Frame hasil (buffer internal, valid sampai apply
+                berikutnya). Selama ring buffer belum penuh, gray
+                dikembalikan apa adanya.
+        """
+        if gray.shape != self._shape:
+            self._allocate(gray.shape)
+
+        np.copyto(self._ring[self._index], gray)
+        self._index = (self._index + 1) % self.depth
+        self._filled = min(self._filled + 1, self.depth)
+        self.frames += 1
+
+        if self._filled < self.depth:
+            return gray
+
+        # Pixel bergerak: range temporal di atas threshold
+        np.max(self._ring, axis=0, out=self._max)
+        np.min(self._ring, axis=0, out=self._min)
+        np.subtract(self._max, self._min, out=self._max)
+        np.greater(self._max, self.threshold, out=self._mask)
+
+        if self.mode == BACKGROUND_MIN:
+            background = self._min
+        else:
+            np.median(self._ring, axis=0, out=self._background)
+            background = self._background
+
+        np.copyto(self._out, gray)
+        if self._mask.any():
+            # Satu level flat, bukan tekstur model per pixel
+            level = np.median(background[self._mask])
+            self._out[self._mask] = int(level)
+
+        self.suppressed_fraction = float(self._mask.mean())
+        return self._out
+
+    def apply_image(self, image):
+        """apply() untuk PIL Image (hasil grayscale)"""
+        gray = np.asarray(image.convert("L"))
+        return Image.fromarray(self.apply(gray))
+
+    def status(self):
+        """Ringkasan untuk log"""
+        return (
+            f"🎞️  Background: {self.mode}, depth {self.depth}, "
+            f"{self.suppressed_fraction * 100:.0f}% pixels suppressed (last frame)"
+        )
@@ -0,0 +1,358 @@
+"""
+Banner Templates
+Fast path untuk banner event yang sudah dikenal ("Aurora Borealis! Luck is
+drastically increased", "The Cursed Isle has emerged from the fog!", ...):
+banner didaftarkan sekali dari screenshot/recording, lalu setiap frame
+dicocokkan dengan normalized cross-correlation (NCC) di grayscale yang
+di-downsample. Jika match, text banner langsung dipakai tanpa tesseract
+untuk area banner itu; sisa frame (baris chat lain) di-mask lalu tetap
+lewat OCR biasa, dan tesseract hanya di-skip jika tidak ada text lain.
+
+- Template disimpan compact di satu file .npz (uint8, sudah di-downsample)
+- File baru di-load saat pertama kali dipakai (lazy)
+- Korelasi dihitung via FFT, mean/variance window via integral image
+
+Usage (CLI):
+    python banner_templates.py add "Aurora Borealis! Luck is drastically increased" frame.png --box 40,60,620,84
+    python banner_templates.py list
+    python banner_templates.py remove 0
+    python banner_templates.py test frame.png
+"""
+
+import argparse
+import os
+import time
+
+from PIL import Image, ImageFilter
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# File template default (di folder yang sama dengan app)
+TEMPLATES_FILE = "banner_templates.npz"
+
+# Downsample factor untuk template & frame
+DEFAULT_FACTOR = 2
+
+
+def to_gray(image, factor):
+    """
+    PIL Image -> grayscale float32 array yang di-downsample
+
+    Blur sebelum downsample supaya skor tetap tinggi walaupun posisi banner
+    bergeser 1 pixel (beda fase terhadap grid downsample).
+    """
+    gray = image.convert("L")
+    if factor > 1:
+        gray = gray.filter(ImageFilter.GaussianBlur(factor / 2)).reduce(factor)
+    return np.asarray(gray, dtype=np.float32)
+
+
+def window_sum(table, height, width):
+    """Sum setiap window (height, width) dari integral image"""
+    rows = table.shape[0] - height
+    cols = table.shape[1] - width
+    return (
+        table[height:, width:]
+        - table[:rows, width:]
+        - table[height:, :cols]
+        + table[:rows, :cols]
+    )
+
+
+class BannerTemplates:
+    """Library template banner + matcher NCC"""
+
+    def __init__(self, path=TEMPLATES_FILE, threshold=0.85):
+        """
+        Args:
+            path (str): File .npz template
+            threshold (float): Skor NCC minimal (0..1) untuk dianggap match.
+                Banner yang hanya beda satu kata bisa lolos threshold ini,
+                jadi jangan daftarkan template yang mirip satu sama lain.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for banner templates")
+
+        self.path = path
+        self.threshold = threshold
+
+        # Di-load lazy oleh _ensure_loaded()
+        self.factor = DEFAULT_FACTOR
+        self._templates = None
+
+        # Cache FFT template per ukuran frame
+        self._fft_shape = None
+        self._fft_cache = []
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.match_time = 0.0
+
+    def _ensure_loaded(self):
+        """Load template dari file saat pertama kali dibutuhkan"""
+        if self._templates is not None:
+            return
+        self._templates = []
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self.factor = int(data["factor"])
+                texts = [str(text) for text in data["texts"]]
+                self._templates = [
+                    (text, data[f"t{index}"].astype(np.float32))
+                    for index, text in enumerate(texts)
+                ]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️  Error loading banner templates {self.path}: {e}")
+            self._templates = []
+            return
+
+        self._fft_shape = None
+        print(f"✅ Banner templates loaded: {len(self._templates)}")
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._templates)
+
+    @property
+    def texts(self):
+        self._ensure_loaded()
+        return [text for text, _ in self._templates]
+
+    def add(self, text, image, box=None):
+        """
+        Daftarkan banner dari screenshot
+
+        Args:
+            text (str): Text banner yang akan di-emit saat match
+            image (PIL.Image): Screenshot (ukuran capture area, scale 1.0)
+            box (tuple): (left, top, right, bottom) area banner, None = semua
+        """
+        self._ensure_loaded()
+        if box:
+            image = image.crop(box)
+        template = to_gray(image, self.factor)
+        if template.size == 0 or template.std() < 1.0:
+            raise ValueError("Template is empty or has no contrast")
+
+        self._templates.append((text, template))
+        self._fft_shape = None
+
+    def remove(self, index):
+        """Hapus template berdasarkan index"""
+        self._ensure_loaded()
+        del self._templates[index]
+        self._fft_shape = None
+
+    def save(self):
+        """Simpan semua template ke file .npz (compressed, uint8)"""
+        self._ensure_loaded()
+        arrays = {
+            f"t{index}": np.clip(np.rint(template), 0, 255).astype(np.uint8)
+            for index, (_, template) in enumerate(self._templates)
+        }
+        texts = np.array([text for text, _ in self._templates], dtype=str)
+        np.savez_compressed(
+            self.path, factor=np.array(self.factor), texts=texts, **arrays
+        )
+
+    def _prepare(self, shape):
+        """FFT template (zero-mean) untuk ukuran frame ini"""
+        self._fft_shape = shape
+        self._fft_cache = []
+        for text, template in self._templates:
+            height, width = template.shape
+            if height > shape[0] or width > shape[1]:
+                self._fft_cache.append(None)
+                continue
+            centered = template - template.mean()
+            norm = float(np.sqrt((centered**2).sum()))
+            self._fft_cache.append(
+                (np.conj(np.fft.rfft2(centered, s=shape)), norm, height, width)
+            )
+
+    def match_scores(self, image):
+        """
+        Skor NCC terbaik per template
+
+        Returns:
+            list: (text, score, (x, y)) per template, koordinat frame asli
+        """
+        self._ensure_loaded()
+        if not self._templates:
+            return []
+
+        frame = to_gray(image, self.factor)
+        shape = frame.shape
+        if shape != self._fft_shape:
+            self._prepare(shape)
+
+        frame_fft = np.fft.rfft2(frame)
+
+        # Integral image untuk sum & sum kuadrat per window
+        integral = np.zeros((shape[0] + 1, shape[1] + 1), dtype=np.float64)
+        integral[1:, 1:] = frame.cumsum(0).cumsum(1)
+        integral_sq = np.zeros_like(integral)
+        integral_sq[1:, 1:] = (frame.astype(np.float64) ** 2).cumsum(0).cumsum(1)
+
+        results = []
+        for (text, _), cached in zip(self._templates, self._fft_cache):
+            if cached is None:
+                continue
+            template_fft, norm, height, width = cached
+            rows = shape[0] - height + 1
+            cols = shape[1] - width + 1
+
+            correlation = np.fft.irfft2(frame_fft * template_fft, s=shape)
+            correlation = correlation[:rows, :cols]
+
+            count = height * width
+            sums = window_sum(integral, height, width)
+            variance = window_sum(integral_sq, height, width) - sums**2 / count
+            denominator = np.sqrt(np.maximum(variance, 1e-6)) * norm
+
+            scores = correlation / denominator
+            # Window hampir flat (variance ~0) tidak bisa match text
+            scores[variance < count] = 0.0
+
+            best = int(np.argmax(scores))
+            y, x = divmod(best, cols)
+            results.append(
+                (text, float(scores.flat[best]), (x * self.factor, y * self.factor))
+            )
+        return results
+
+    def match_boxes(self, image):
+        """
+        Banner yang match di frame beserta posisinya
+
+        Returns:
+            list: (text, (left, top, right, bottom)) urut dari atas ke
+                bawah, koordinat frame asli; kosong jika tidak ada yang match
+        """
+        self._ensure_loaded()
+        if not self._templates:
+            return []
+
+        start = time.perf_counter()
+        sizes = {text: template.shape for text, template in self._templates}
+        matched = []
+        for text, score, (x, y) in self.match_scores(image):
+            if score < self.threshold:
+                continue
+            height, width = sizes[text]
+            box = (x, y, x + width * self.factor, y + height * self.factor)
+            matched.append((text, box))
+        self.match_time += time.perf_counter() - start
+
+        if matched:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return sorted(matched, key=lambda item: (item[1][1], item[1][0]))
+
+    def match(self, image):
+        """
+        Text banner yang match di frame
+
+        Returns:
+            str or None: Text banner (urut dari atas ke bawah jika lebih dari
+                satu), None jika tidak ada yang match -> pakai OCR
+        """
+        matched = self.match_boxes(image)
+        if not matched:
+            return None
+        return "\n".join(text for text, _ in matched)
+
+    def status(self):
+        """Ringkasan untuk log"""
+        frames = self.hits + self.misses
+        average = self.match_time / frames * 1000 if frames else 0.0
+        return (
+            f"🏷️  Templates: {self.hits}/{frames} frames matched "
+            f"(avg {average:.1f} ms/frame)"
+        )
+
+
+def mask_boxes(image, boxes):
+    """
+    Tutup area banner dengan warna background supaya tidak ikut di-OCR
+
+    Warna background = median pixel di luar semua box (chat overlay
+    biasanya satu warna dominan); kalau box menutup seluruh frame, median
+    seluruh frame.
+
+    Args:
+        image (PIL.Image): Screenshot
+        boxes (list): (left, top, right, bottom) per banner
+
+    Returns:
+        PIL.Image: Copy screenshot dengan box terisi warna background
+    """
+    pixels = np.array(image.convert("RGB"))
+    outside = np.ones(pixels.shape[:2], dtype=bool)
+    for left, top, right, bottom in boxes:
+        outside[top:bottom, left:right] = False
+    source = pixels[outside] if outside.any() else pixels.reshape(-1, 3)
+    fill = np.median(source, axis=0).astype(np.uint8)
+    pixels[~outside] = fill
+    return Image.fromarray(pixels)
+
+
+def parse_box(value):
+    """'l,t,r,b' -> tuple of int"""
+    box = tuple(int(part) for part in value.split(","))
+    if len(box) != 4:
+        raise argparse.ArgumentTypeError("box must be left,top,right,bottom")
+    return box
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage banner templates")
+    parser.add_argument("--file", default=TEMPLATES_FILE, help="Template file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = sub.add_parser("add", help="Register a banner from a screenshot")
+    add_parser.add_argument("text")
+    add_parser.add_argument("image")
+    add_parser.add_argument("--box", type=parse_box, help="left,top,right,bottom")
+
+    sub.add_parser("list", help="List registered banners")
+
+    remove_parser = sub.add_parser("remove", help="Remove a banner by index")
+    remove_parser.add_argument("index", type=int)
+
+    test_parser = sub.add_parser("test", help="Match a screenshot")
+    test_parser.add_argument("image")
+
+    args = parser.parse_args()
+    templates = BannerTemplates(args.file)
+
+    if args.command == "add":
+        templates.add(args.text, Image.open(args.image), args.box)
+        templates.save()
+        print(f"✅ Added template #{len(templates) - 1}: {args.text}")
+    elif args.command == "list":
+        for index, text in enumerate(templates.texts):
+            print(f"{index}: {text}")
+    elif args.command == "remove":
+        text = templates.texts[args.index]
+        templates.remove(args.index)
+        templates.save()
+        print(f"✅ Removed template #{args.index}: {text}")
+    elif args.command == "test":
+        for text, score, position in templates.match_scores(Image.open(args.image)):
+            print(f"{score:.3f} at {position}: {text}")
+        print(f"Match: {templates.match(Image.open(args.image))}")
+
+
+if __name__ == "__main__":
+    main()
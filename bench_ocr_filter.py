@@ -0,0 +1,116 @@
+"""
+OCR Filter Micro-Benchmark
+Ukur biaya per-call OCRFilter.filter pada corpus sintetis 100k baris
+
+Usage:
+    python bench_ocr_filter.py
+    python bench_ocr_filter.py --lines 100000 --mode smart
+    python bench_ocr_filter.py --batch  # bandingkan dengan filter_many()
+"""
+
+import argparse
+import random
+import time
+
+from ocr_filter import OCRFilter
+
+# Contoh baris OCR dari chat game (campuran event, noise, dan chat biasa)
+SAMPLE_LINES = [
+    "Shiro used a Sundial Totem to speed up the celestial cycle.",
+    "Divine Secret 1/1000 Aetherfin!.",
+    "The Cursed Isle has emerged from the fog!",
+    "A Megalodon has been spotted past Ancient Isle!",
+    "Aurora Borealis! Luck is drastically increased",
+    "The Kraken has vanished into the depths...",
+    "Player123 joined the server",
+    "Nobody caught a Narwhal today",
+    "scan chat with you",
+    "Events Catches",
+    "...",
+    "@@##$$%%^^&&**",
+    "1234567890123",
+    "ab",
+    "âŒ Error in message queue",
+    "lol anyone want to trade rods?",
+    "---- ~~~~ ---- ~~~~ ----",
+]
+
+
+def build_corpus(n_lines, seed=42):
+    """Build deterministic corpus of noisy OCR lines"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_lines):
+        line = rng.choice(SAMPLE_LINES)
+        roll = rng.random()
+        if roll < 0.5:
+            # Variasi unik supaya tidak semuanya duplicate
+            line = f"{line} #{i}"
+        elif roll < 0.6:
+            line = f"  {line}   \n  "
+        corpus.append(line)
+    return corpus
+
+
+def run(corpus, mode):
+    """Run filter over corpus, return (elapsed seconds, accepted count)"""
+    ocr_filter = OCRFilter()
+    accepted = 0
+    start = time.perf_counter()
+    for text in corpus:
+        if ocr_filter.filter(text, mode=mode)[0]:
+            accepted += 1
+    return time.perf_counter() - start, accepted
+
+
+def run_batch(corpus, mode):
+    """Run filter_many over corpus, return (elapsed seconds, accepted count)"""
+    ocr_filter = OCRFilter()
+    start = time.perf_counter()
+    results = ocr_filter.filter_many(corpus, mode=mode)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(1 for should_send, _, _ in results if should_send)
+
+
+def measure(func, corpus, mode, repeat):
+    """Best-of-N timing"""
+    best = None
+    for _ in range(repeat):
+        elapsed, accepted = func(corpus, mode)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, accepted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCRFilter micro-benchmark")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--mode", default="smart")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--batch", action="store_true", help="Also benchmark filter_many()"
+    )
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.lines)
+    best, accepted = measure(run, corpus, args.mode, args.repeat)
+
+    print("=" * 50)
+    print(f"OCRFilter.filter benchmark (mode={args.mode})")
+    print("=" * 50)
+    print(f"Lines:      {len(corpus)}")
+    print(f"Accepted:   {accepted}")
+    print(f"Total:      {best:.3f} s (best of {args.repeat})")
+    print(f"Per call:   {best / len(corpus) * 1e6:.2f} µs")
+
+    if args.batch:
+        batch_best, batch_accepted = measure(run_batch, corpus, args.mode, args.repeat)
+        print("-" * 50)
+        print("OCRFilter.filter_many")
+        print(f"Accepted:   {batch_accepted}")
+        print(f"Total:      {batch_best:.3f} s (best of {args.repeat})")
+        print(f"Per line:   {batch_best / len(corpus) * 1e6:.2f} µs")
+        print(f"Speedup:    {best / batch_best:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
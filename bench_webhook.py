@@ -0,0 +1,183 @@
+"""
+Discord Webhook Load Generator
+Kirim N message/detik lewat DiscordWebhook ke FakeDiscordServer lokal, lalu
+laporkan throughput yang benar-benar sampai, latency (send_ocr_result sampai
+server membalas 2xx) dan message yang hilang.
+
+Usage:
+    python bench_webhook.py
+    python bench_webhook.py --rate 50 --duration 10 --latency 0.1
+    python bench_webhook.py --error-rate 0.2 --outbox   # retry lewat outbox
+    python bench_webhook.py --edit-mode --important 0.05
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from discord_outbox import Outbox
+from discord_webhook import DiscordWebhook
+from fake_discord import DEFAULT_RATE_LIMIT, DEFAULT_RATE_PERIOD, FakeDiscordServer
+
+# Marker unik per message supaya bisa dicocokkan di payload yang di-coalesce
+MARKER = re.compile(r"\blg-(\d+)\b")
+
+IMPORTANT_PRIORITY = 5
+
+
+def payload_text(body):
+    """Semua text di payload webhook (content + embed description)"""
+    parts = [body.get("content") or ""]
+    parts.extend(embed.get("description", "") for embed in body.get("embeds") or [])
+    return "\n".join(parts)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile dari list yang sudah diurutkan"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def generate(webhook, rate, duration, important):
+    """
+    Kirim message dengan rate tetap
+
+    Returns:
+        dict: seq -> waktu send_ocr_result (time.monotonic)
+    """
+    sent = {}
+    total = int(rate * duration)
+    # Setiap 1/important message dikirim sebagai event penting
+    every = round(1 / important) if important else 0
+    start = time.monotonic()
+    for seq in range(total):
+        delay = start + seq / rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        priority = IMPORTANT_PRIORITY if every and seq % every == 0 else 0
+        sent[seq] = time.monotonic()
+        webhook.send_ocr_result(f"lg-{seq} Player{seq % 100} joined", priority)
+    return sent
+
+
+def collect(server):
+    """
+    Pertama kali setiap marker sampai di server
+
+    Returns:
+        tuple: (seq -> waktu 2xx pertama, jumlah POST yang membawa marker
+            yang sudah pernah sampai)
+    """
+    delivered = {}
+    duplicates = 0
+    for request in server.delivered():
+        for match in MARKER.finditer(payload_text(request.body)):
+            seq = int(match.group(1))
+            if seq not in delivered:
+                delivered[seq] = request.answered
+            elif request.method == "POST":
+                duplicates += 1
+    return delivered, duplicates
+
+
+def wait_delivered(server, expected, timeout):
+    """Tunggu semua message sampai (atau timeout)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(collect(server)[0]) >= expected:
+            return
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DiscordWebhook load generator")
+    parser.add_argument("--rate", type=float, default=20, help="Messages/sec")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds")
+    parser.add_argument("--drain", type=float, default=15, help="Max wait after")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+    parser.add_argument("--rate-period", type=float, default=DEFAULT_RATE_PERIOD)
+    parser.add_argument("--rate-limit-chance", type=float, default=0.0)
+    parser.add_argument("--coalesce-window", type=float, default=0.3)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--overflow", default="drop_lowest")
+    parser.add_argument("--embeds", action="store_true")
+    parser.add_argument("--edit-mode", action="store_true")
+    parser.add_argument(
+        "--important", type=float, default=0.0, help="Fraction sent as events"
+    )
+    parser.add_argument(
+        "--outbox", action="store_true", help="Use a temporary durable outbox"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = FakeDiscordServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_period=args.rate_period,
+        rate_limit_chance=args.rate_limit_chance,
+        seed=args.seed,
+    ).start()
+
+    outbox = None
+    if args.outbox:
+        outbox_dir = tempfile.mkdtemp(prefix="bench_webhook_")
+        outbox = Outbox(
+            os.path.join(outbox_dir, "outbox.db"), base_backoff=0.5, max_backoff=5.0
+        )
+
+    webhook = DiscordWebhook(
+        server.webhook_url(),
+        coalesce_window=args.coalesce_window,
+        use_embeds=args.embeds,
+        outbox=outbox,
+        queue_size=args.queue_size,
+        overflow=args.overflow,
+        edit_mode=args.edit_mode,
+    )
+
+    start = time.monotonic()
+    sent = generate(webhook, args.rate, args.duration, args.important)
+    send_elapsed = time.monotonic() - start
+    wait_delivered(server, len(sent), args.drain)
+    webhook.close(timeout=5)
+    server.stop()
+
+    delivered, duplicates = collect(server)
+    latencies = sorted(delivered[seq] - sent[seq] for seq in delivered if seq in sent)
+    elapsed = (max(delivered.values()) - start) if delivered else send_elapsed
+    statuses = server.status_counts()
+
+    print("=" * 50)
+    print("DiscordWebhook load test (fake Discord server)")
+    print("=" * 50)
+    print(f"Offered:    {len(sent)} msgs at {len(sent) / send_elapsed:.1f} msg/s")
+    print(f"Delivered:  {len(delivered)} ({len(delivered) / elapsed:.1f} msg/s)")
+    print(f"Lost:       {len(sent) - len(delivered)}")
+    print(f"Duplicates: {duplicates}")
+    print("-" * 50)
+    print(f"Latency p50: {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Latency p95: {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"Latency p99: {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Latency max: {percentile(latencies, 100) * 1000:.1f} ms")
+    print("-" * 50)
+    print(f"Requests:   {len(server.requests)} {dict(sorted(statuses.items()))}")
+    print(f"Edits:      {webhook.edits_sent}")
+    print(f"429 seen:   {webhook.rate_limited_count}")
+    print(webhook.message_queue.status())
+    if outbox is not None:
+        print(outbox.status())
+        outbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Capture Scheduler
+Atur interval capture berdasarkan statistik inter-arrival dari EventAnalytics:
+capture cepat di window di mana event kemungkinan muncul, lambat di luar
+window, selalu di antara min_interval dan max_interval.
+
+Window "hot" untuk satu keyword = elapsed sejak last_seen berada di antara
+quantile bawah dan atas jarak antar kemunculannya (plus margin). Keyword
+yang belum punya cukup data diabaikan; jika tidak ada keyword yang bisa
+diprediksi, dipakai base_interval (perilaku lama).
+
+Keyword yang sudah lewat window (overdue) dicek dengan base_interval hanya
+selama satu gap rata-rata setelah window tutup, setelah itu dianggap idle
+sampai muncul lagi.
+"""
+
+import time
+
+# Mode capture
+SCHEDULE_FIXED = "fixed"
+SCHEDULE_PREDICTIVE = "predictive"
+
+
+class CaptureScheduler:
+    """Hitung interval capture berikutnya dari statistik event"""
+
+    def __init__(
+        self,
+        analytics,
+        base_interval=1.0,
+        min_interval=0.5,
+        max_interval=3.0,
+        keywords=None,
+        min_samples=5,
+        low_quantile=0.05,
+        high_quantile=0.95,
+        margin=0.1,
+        hold=30.0,
+    ):
+        """
+        Args:
+            analytics (EventAnalytics): Sumber statistik per keyword
+            base_interval (float): Interval jika belum ada prediksi
+            min_interval (float): Interval di window hot
+            max_interval (float): Interval paling lambat; harus lebih pendek
+                dari lama banner tampil di layar supaya event tidak terlewat
+            keywords (iterable): Keyword (lowercase) yang diprediksi,
+                None = semua keyword di analytics
+            min_samples (int): Minimal jumlah gap sebelum keyword dipakai
+            low_quantile (float): Awal window (quantile gap)
+            high_quantile (float): Akhir window (quantile gap)
+            margin (float): Perlebar window (fraksi dari quantile)
+            hold (float): Tetap hot N detik setelah event diterima
+        """
+        self.analytics = analytics
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.keywords = set(keywords) if keywords is not None else None
+        self.min_samples = min_samples
+        self.low_quantile = low_quantile
+        self.high_quantile = high_quantile
+        self.margin = margin
+        self.hold = hold
+
+        self.last_accepted = None
+        self.last_reason = "no history"
+
+        # Stats
+        self.captures = 0
+        self.total_interval = 0.0
+
+    def mark_accepted(self, timestamp=None):
+        """
+        Dipanggil setelah event lolos filter (event sering beruntun)
+
+        Hanya untuk event keyword (priority di atas default), bukan baris
+        rutin seperti join/catch, supaya server ramai tidak membuat
+        scheduler selalu hot.
+        """
+        self.last_accepted = time.time() if timestamp is None else timestamp
+
+    def _windows(self):
+        """(keyword, window_start, window_end, gap_mean) dalam epoch seconds"""
+        windows = []
+        for keyword, stats in list(self.analytics.stats.items()):
+            if self.keywords is not None and keyword not in self.keywords:
+                continue
+            if stats.gap_count < self.min_samples or stats.last_seen is None:
+                continue
+
+            low = stats.gaps.quantile(self.low_quantile)
+            high = stats.gaps.quantile(self.high_quantile)
+            windows.append(
+                (
+                    keyword,
+                    stats.last_seen + low * (1 - self.margin),
+                    stats.last_seen + high * (1 + self.margin),
+                    stats.gap_mean,
+                )
+            )
+        return windows
+
+    def next_interval(self, now=None):
+        """
+        Interval sebelum capture berikutnya
+
+        Returns:
+            float: Detik, di antara min_interval dan max_interval
+        """
+        if now is None:
+            now = time.time()
+
+        interval, self.last_reason = self._decide(now)
+        interval = min(self.max_interval, max(self.min_interval, interval))
+
+        self.captures += 1
+        self.total_interval += interval
+        return interval
+
+    def _decide(self, now):
+        """(interval, reason) sebelum di-clamp"""
+        if self.last_accepted is not None and now - self.last_accepted < self.hold:
+            return self.min_interval, "recent message"
+
+        windows = self._windows()
+        if not windows:
+            return self.base_interval, "no history"
+
+        hot = [keyword for keyword, start, end, _ in windows if start <= now <= end]
+        if hot:
+            return self.min_interval, f"{hot[0]} likely"
+
+        # Baru lewat quantile atas: pola mungkin berubah, jangan terlalu
+        # lambat - tapi hanya selama satu gap rata-rata setelah window tutup
+        overdue = [
+            keyword
+            for keyword, _, end, gap_mean in windows
+            if end < now <= end + gap_mean
+        ]
+        if overdue:
+            return self.base_interval, f"{overdue[0]} overdue"
+
+        # Di luar semua window: lambat, tapi bangun tepat saat window dibuka
+        upcoming = [start for _, start, _, _ in windows if start > now]
+        if not upcoming:
+            return self.max_interval, "idle"
+        return min(self.max_interval, min(upcoming) - now), "idle"
+
+    @property
+    def average_interval(self):
+        if not self.captures:
+            return None
+        return self.total_interval / self.captures
+
+    def status(self):
+        """Ringkasan untuk log / status bar"""
+        average = self.average_interval
+        average_text = f"{average:.2f}s" if average is not None else "-"
+        return f"🗓️  Schedule: {self.last_reason} (avg interval {average_text})"
@@ -0,0 +1,134 @@
+"""
+CPU Budget Governor
+Batasi CPU yang dipakai capture + OCR (misal "maksimal 15% dari satu core")
+supaya aman dijalankan bersama game.
+
+CPU time diukur dari os.times(): process ini (semua thread) ditambah child
+process yang sudah selesai (tesseract dipanggil pytesseract sebagai
+subprocess). Dari sliding window sample dihitung usage = delta CPU / delta
+wall time, lalu governor menaikkan/menurunkan:
+
+1. interval multiplier (capture lebih jarang)
+2. scale factor screenshot (gambar lebih kecil = tesseract lebih cepat)
+
+Catatan: di Windows os.times() tidak mengisi waktu child process, jadi di
+sana yang terukur hanya process Python.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+
+def cpu_seconds():
+    """Total CPU time process + child process yang sudah selesai"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class CPUGovernor:
+    """Atur interval & scale capture supaya CPU tetap di bawah budget"""
+
+    def __init__(
+        self,
+        budget=0.15,
+        window=10.0,
+        adjust_every=2.0,
+        max_multiplier=10.0,
+        min_scale=0.6,
+        scale_step=0.1,
+        interval_step=1.25,
+        low_water=0.7,
+    ):
+        """
+        Args:
+            budget (float): Fraksi satu core (0.15 = 15%)
+            window (float): Panjang sliding window (detik)
+            adjust_every (float): Minimal detik antar perubahan keputusan
+            max_multiplier (float): Batas atas pengali interval capture
+            min_scale (float): Scale screenshot terkecil
+            scale_step (float): Perubahan scale per langkah
+            interval_step (float): Faktor perubahan interval per langkah
+            low_water (float): Longgarkan lagi jika usage < budget * low_water
+        """
+        self.budget = budget
+        self.window = window
+        self.adjust_every = adjust_every
+        self.max_multiplier = max_multiplier
+        self.min_scale = min_scale
+        self.scale_step = scale_step
+        self.interval_step = interval_step
+        self.low_water = low_water
+
+        # Keputusan saat ini
+        self.multiplier = 1.0
+        self.scale = 1.0
+        self.usage = 0.0
+        self.last_action = "ok"
+
+        self._samples = deque()
+        self._last_adjust = time.monotonic()
+        self._lock = threading.Lock()
+
+    def sample(self, now=None, cpu=None):
+        """
+        Ambil satu sample CPU dan update keputusan (dipanggil tiap loop)
+
+        Returns:
+            float: CPU usage di window (fraksi satu core)
+        """
+        now = time.monotonic() if now is None else now
+        cpu = cpu_seconds() if cpu is None else cpu
+
+        with self._lock:
+            self._samples.append((now, cpu))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+                self._samples.popleft()
+
+            first_time, first_cpu = self._samples[0]
+            if now > first_time:
+                self.usage = (cpu - first_cpu) / (now - first_time)
+
+            if now - self._last_adjust >= self.adjust_every:
+                self._last_adjust = now
+                self._adjust()
+
+            return self.usage
+
+    def _adjust(self):
+        """Satu langkah kontrol"""
+        if self.usage > self.budget:
+            # Over budget: capture lebih jarang dulu, baru kecilkan gambar
+            if self.multiplier < self.max_multiplier:
+                self.multiplier = min(
+                    self.max_multiplier, self.multiplier * self.interval_step
+                )
+                self.last_action = "slower"
+            elif self.scale > self.min_scale:
+                self.scale = max(self.min_scale, self.scale - self.scale_step)
+                self.last_action = "downscale"
+            else:
+                self.last_action = "at limit"
+        elif self.usage < self.budget * self.low_water:
+            # Ada sisa budget: kembalikan kualitas dulu, baru kecepatan
+            if self.scale < 1.0:
+                self.scale = min(1.0, self.scale + self.scale_step)
+                self.last_action = "upscale"
+            elif self.multiplier > 1.0:
+                self.multiplier = max(1.0, self.multiplier / self.interval_step)
+                self.last_action = "faster"
+            else:
+                self.last_action = "ok"
+
+    def apply_interval(self, interval):
+        """Interval capture setelah governor"""
+        return interval * self.multiplier
+
+    def status(self):
+        """Text untuk status bar"""
+        return (
+            f"CPU {self.usage * 100:.0f}% / {self.budget * 100:.0f}% · "
+            f"interval ×{self.multiplier:.2f} · scale {self.scale:.1f} "
+            f"({self.last_action})"
+        )
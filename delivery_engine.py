@@ -0,0 +1,141 @@
+"""
+Delivery Engine
+Satu event loop asyncio (thread sendiri, hidup selama app jalan) untuk semua
+pengiriman ke Discord: worker webhook per destination dan discord.py bot
+berjalan sebagai task di loop yang sama, bukan satu thread per destination.
+
+Capture thread menyerahkan message lewat Handoff: put() langsung
+membangunkan task penerima via call_soon_threadsafe (tanpa polling).
+
+HTTP request `requests` yang blocking dijalankan di thread pool kecil yang
+di-share (run_blocking), jadi request ke beberapa destination bisa berjalan
+bersamaan tanpa menahan event loop.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+
+# Maksimal HTTP request yang berjalan bersamaan (semua destination)
+DEFAULT_MAX_IN_FLIGHT = 8
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class DeliveryEngine:
+    """Event loop asyncio di background thread"""
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """
+        Args:
+            max_in_flight (int): Ukuran thread pool untuk HTTP request blocking
+        """
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="discord-http"
+        )
+        self.loop.set_default_executor(self.executor)
+
+        self.thread = threading.Thread(
+            target=self._run, name="delivery-engine", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def in_loop(self):
+        """True jika dipanggil dari thread event loop"""
+        return threading.current_thread() is self.thread
+
+    def submit(self, coro):
+        """
+        Jalankan coroutine di loop engine (aman dari thread manapun)
+
+        Returns:
+            concurrent.futures.Future: Hasil coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Jadwalkan callback di loop engine (aman dari thread manapun)"""
+        if self.in_loop:
+            callback(*args)
+        else:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    async def run_blocking(self, func, *args):
+        """Jalankan fungsi blocking (HTTP request) di thread pool engine"""
+        return await self.loop.run_in_executor(self.executor, func, *args)
+
+    def stop(self, timeout=5.0):
+        """Stop event loop (task yang masih jalan dibatalkan)"""
+        if not self.loop.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        self.executor.shutdown(wait=False)
+
+
+def get_engine():
+    """Engine yang di-share semua pengiriman Discord (dibuat saat pertama dipakai)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = DeliveryEngine()
+        return _engine
+
+
+class Handoff:
+    """
+    Queue thread-safe (queue.Queue, PriorityMessageQueue, ...) yang dibaca
+    task asyncio tanpa polling: put() dari thread lain membangunkan get()
+    """
+
+    def __init__(self, queue, engine=None):
+        """
+        Args:
+            queue: Object dengan put() dan get_nowait() (raise queue.Empty)
+            engine (DeliveryEngine): Default get_engine()
+        """
+        self.queue = queue
+        self.engine = engine or get_engine()
+        self._ready = asyncio.Event()
+
+    def put(self, item, *args, **kwargs):
+        """Masukkan item (argumen tambahan diteruskan ke queue.put)"""
+        result = self.queue.put(item, *args, **kwargs)
+        self.engine.call_soon(self._ready.set)
+        return result
+
+    async def get(self, timeout=None):
+        """
+        Ambil item berikutnya (dipanggil dari task di loop engine)
+
+        Raises:
+            queue.Empty: Timeout sebelum ada item
+        """
+        deadline = None if timeout is None else self.engine.loop.time() + timeout
+        while True:
+            self._ready.clear()
+            try:
+                return self.queue.get_nowait()
+            except Empty:
+                pass
+
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - self.engine.loop.time()
+                if remaining <= 0:
+                    raise Empty
+            try:
+                await asyncio.wait_for(self._ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_nowait(self):
+        return self.queue.get_nowait()
@@ -1,14 +1,20 @@
 """
 Discord Bot Integration (Optional)
 Add this to your OCR app when you're ready to send data to Discord
+
+Bot berjalan di event loop DeliveryEngine yang sama dengan webhook:
+start dengan get_engine().submit(bot.start_bot()).
 """
 
 import asyncio
+import time
 from queue import Queue
 
 import discord
 from discord.ext import commands
 
+from delivery_engine import Handoff, get_engine
+
 
 class DiscordOCRBot:
     """Handles sending OCR results to Discord"""
@@ -26,7 +32,9 @@ class DiscordOCRBot:
         self.bot = None
         self.channel = None
         self.is_ready = False
-        self.message_queue = Queue()
+        self.engine = get_engine()
+        # put() dari capture thread langsung membangunkan queue processor
+        self.message_queue = Handoff(Queue(), self.engine)
 
     async def start_bot(self):
         """Start the Discord bot"""
@@ -53,11 +61,10 @@ class DiscordOCRBot:
     async def process_message_queue(self):
         """Process messages from queue and send to Discord"""
         while True:
+            # Tunggu message tanpa polling
+            text = await self.message_queue.get()
             try:
-                if not self.message_queue.empty():
-                    text = self.message_queue.get()
-                    await self._send_message(text)
-                await asyncio.sleep(0.1)  # Small delay to prevent CPU spinning
+                await self._send_message(text)
             except Exception as e:
                 print(f"❌ Error in message queue: {e}")
                 await asyncio.sleep(1)
@@ -102,6 +109,10 @@ class DiscordOCRBot:
             await self.bot.close()
             print("🔴 Discord bot disconnected")
 
+    def close(self, timeout=10.0):
+        """Stop bot dari thread lain (misal saat app ditutup)"""
+        self.engine.submit(self.stop_bot()).result(timeout)
+
 
 # Standalone test
 if __name__ == "__main__":
@@ -109,20 +120,16 @@ if __name__ == "__main__":
     TOKEN = "TOKEN"
     CHANNEL_ID = 1234567890  # Your channel ID
 
-    async def test():
-        bot = DiscordOCRBot(TOKEN, CHANNEL_ID)
-        await bot.start_bot()
-
-        # Wait for bot to be ready
-        while not bot.is_ready:
-            await asyncio.sleep(1)
+    bot = DiscordOCRBot(TOKEN, CHANNEL_ID)
+    bot.engine.submit(bot.start_bot())
 
-        # Send test message
-        await bot.send_ocr_result("Test OCR result from screen capture")
+    # Wait for bot to be ready
+    while not bot.is_ready:
+        time.sleep(1)
 
-        # Keep alive
-        await asyncio.sleep(5)
-        await bot.stop_bot()
+    # Send test message (dari thread biasa, seperti capture thread)
+    bot.send_ocr_result("Test OCR result from screen capture")
 
-    # Run test
-    asyncio.run(test())
+    # Keep alive
+    time.sleep(5)
+    bot.close()
@@ -0,0 +1,233 @@
+"""
+Discord Outbox
+Simpan message Discord ke SQLite sebelum dikirim supaya tidak hilang saat
+network mati, webhook error, atau app ditutup.
+
+- Message dicatat dulu (add), dihapus setelah Discord balas 2xx (ack)
+- Gagal kirim: retry dengan exponential backoff + jitter (fail)
+- Message yang belum di-ack di-replay saat app start lagi
+- WAL + synchronous=NORMAL: commit tidak fsync satu per satu, fsync
+  di-batch saat checkpoint (aman dari crash app, throughput tetap tinggi)
+- Ukuran dibatasi max_messages dengan drop policy yang eksplisit
+
+Delivery at-least-once: message yang terkirim tapi ack-nya gagal tercatat
+(misal app crash tepat setelah POST) bisa terkirim dua kali.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+
+# Database default (di folder yang sama dengan app)
+OUTBOX_FILE = "discord_outbox.db"
+
+# Drop policy saat outbox penuh
+DROP_OLDEST = "oldest"  # Buang message tertua, terima yang baru
+DROP_NEWEST = "newest"  # Tolak message baru
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    destination TEXT NOT NULL,
+    text TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 1,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_destination_next
+    ON outbox(destination, next_attempt);
+"""
+
+
+class Outbox:
+    """Durable outbox (SQLite) untuk satu atau lebih webhook"""
+
+    def __init__(
+        self,
+        path=OUTBOX_FILE,
+        max_messages=10000,
+        drop_policy=DROP_OLDEST,
+        base_backoff=2.0,
+        max_backoff=300.0,
+    ):
+        """
+        Args:
+            path (str): File database SQLite
+            max_messages (int): Maksimal message yang belum di-ack
+            drop_policy (str): "oldest" atau "newest" saat outbox penuh
+            base_backoff (float): Delay retry pertama (detik)
+            max_backoff (float): Delay retry maksimal (detik)
+        """
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.path = path
+        self.max_messages = max_messages
+        self.drop_policy = drop_policy
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        # Stats
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")]
+        if "priority" not in columns:
+            # Database dari versi sebelum ada priority
+            self._conn.execute(
+                "ALTER TABLE outbox ADD COLUMN priority INTEGER NOT NULL DEFAULT 1"
+            )
+        self._conn.commit()
+
+        self._count = self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def add(self, destination, text, priority=1):
+        """
+        Catat message sebelum dikirim
+
+        Args:
+            destination (str): Webhook tujuan
+            text (str): Isi message
+            priority (int): Priority keyword (urutan replay/retry)
+
+        Returns:
+            int or None: Id message, None jika ditolak (outbox penuh,
+                policy "newest")
+        """
+        with self._lock, self._conn:
+            if self._count >= self.max_messages:
+                if self.drop_policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return None
+                excess = self._count - self.max_messages + 1
+                self._conn.execute(
+                    "DELETE FROM outbox WHERE id IN "
+                    "(SELECT id FROM outbox ORDER BY id LIMIT ?)",
+                    (excess,),
+                )
+                self._count -= excess
+                self.dropped += excess
+
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (destination, text, priority, created) "
+                "VALUES (?, ?, ?, ?)",
+                (destination, text, priority, time.time()),
+            )
+            self._count += 1
+            return cursor.lastrowid
+
+    def ack(self, ids):
+        """Hapus message yang sudah terkirim (2xx)"""
+        ids = [message_id for message_id in ids if message_id is not None]
+        if not ids:
+            return
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM outbox WHERE id = ?", [(i,) for i in ids]
+            )
+            self._count -= cursor.rowcount
+
+    def discard(self, ids):
+        """Hapus message yang sengaja dibuang (overflow queue), dihitung dropped"""
+        ids = [message_id for message_id in ids if message_id is not None]
+        if not ids:
+            return
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM outbox WHERE id = ?", [(i,) for i in ids]
+            )
+            self._count -= cursor.rowcount
+            self.dropped += cursor.rowcount
+
+    def backoff(self, attempts):
+        """Delay retry ke-attempts: exponential, dibatasi max_backoff"""
+        return min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+
+    def fail(self, ids, error=None):
+        """
+        Tandai gagal kirim, jadwalkan retry dengan backoff
+
+        Jitter (50-100% dari delay) sama untuk satu batch supaya urutan
+        message tetap terjaga saat retry, tapi berbeda antar batch/webhook
+        supaya retry tidak serentak.
+        """
+        ids = [message_id for message_id in ids if message_id is not None]
+        if not ids:
+            return
+        now = time.time()
+        jitter = random.uniform(0.5, 1.0)
+        with self._lock, self._conn:
+            for message_id in ids:
+                row = self._conn.execute(
+                    "SELECT attempts FROM outbox WHERE id = ?", (message_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                attempts = row[0] + 1
+                self._conn.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt = ?, "
+                    "last_error = ? WHERE id = ?",
+                    (
+                        attempts,
+                        now + self.backoff(attempts) * jitter,
+                        error,
+                        message_id,
+                    ),
+                )
+
+    def pending(self, destination, retries=False, limit=None):
+        """
+        Message yang belum di-ack untuk destination (priority tertinggi dulu,
+        lalu urut id)
+
+        Args:
+            destination (str): Webhook tujuan
+            retries (bool): False = message yang belum pernah dicoba (replay
+                saat start), True = message gagal yang sudah waktunya retry
+            limit (int): Maksimal row, None = semua
+
+        Returns:
+            list: (id, text, priority)
+        """
+        if retries:
+            sql = (
+                "SELECT id, text, priority FROM outbox WHERE destination = ? "
+                "AND attempts > 0 AND next_attempt <= ? ORDER BY priority DESC, id LIMIT ?"
+            )
+            params = (destination, time.time(), limit or -1)
+        else:
+            sql = (
+                "SELECT id, text, priority FROM outbox WHERE destination = ? "
+                "AND attempts = 0 ORDER BY priority DESC, id LIMIT ?"
+            )
+            params = (destination, limit or -1)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def next_retry(self, destination):
+        """Epoch seconds retry berikutnya untuk destination (None jika tidak ada)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt) FROM outbox "
+                "WHERE destination = ? AND attempts > 0",
+                (destination,),
+            ).fetchone()
+        return row[0]
+
+    def status(self):
+        """Ringkasan untuk log"""
+        return f"📮 Outbox: {self._count} pending, {self.dropped} dropped"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,120 +1,959 @@
 """
 Discord Webhook Integration (Lightweight Alternative)
 Tidak perlu discord.py - hanya pakai requests library!
+
+Setiap webhook adalah task di event loop DeliveryEngine (satu thread untuk
+semua destination), bukan thread sendiri.
 """
 
+import asyncio
+import concurrent.futures
 import json
+import re
+import sqlite3
 import threading
 import time
-from queue import Queue
+from queue import Empty
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from delivery_engine import Handoff, get_engine
+from discord_outbox import DROP_OLDEST, OUTBOX_FILE, Outbox
+from filter_rules import DEFAULT_PRIORITY
+from priority_queue import OVERFLOW_DROP_LOWEST, PriorityMessageQueue
+
+# Sentinel untuk stop processor task (setelah queue habis dikirim)
+_STOP = object()
+
+# Default limit webhook Discord: 5 request per 2 detik
+DEFAULT_RATE_LIMIT = 5
+DEFAULT_RATE_PERIOD = 2.0
+
+# Limit Discord per message
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBED_DESCRIPTION = 4096
+MAX_EMBEDS = 10
+MAX_EMBED_TOTAL = 6000
+
+# Setiap chunk dibungkus code block: "```\n" + chunk + "\n```"
+CODE_FENCE_OVERHEAD = 8
+
+
+def split_long_line(line, limit):
+    """Pecah satu baris yang lebih panjang dari limit (di spasi jika bisa)"""
+    while len(line) > limit:
+        cut = line.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        yield line[:cut]
+        line = line[cut:].lstrip(" ")
+    yield line
+
+
+def pack_lines(texts, limit, keys=None):
+    """
+    Gabungkan beberapa text menjadi chunk <= limit karakter
+
+    Chunk hanya dipotong di batas baris (baris yang sendirian sudah lebih
+    panjang dari limit baru dipecah). "```" di dalam text di-escape supaya
+    tidak menutup code block.
+
+    Args:
+        texts (list): Text OCR yang akan dikirim (urutan dipertahankan)
+        limit (int): Panjang maksimal per chunk
+        keys (list): Key per text (misal index di batch / outbox id),
+            None = tidak perlu tahu text mana masuk chunk mana
+
+    Returns:
+        list: Chunk text, atau (chunk, key text yang ada di chunk itu) jika
+            keys diisi
+    """
+    chunks = []
+    current = []
+    current_keys = []
+    size = 0
+    for key, text in zip(keys if keys is not None else texts, texts):
+        for line in text.split("\n"):
+            line = line.replace("```", "`\u200b``")
+            for piece in split_long_line(line, limit):
+                added = len(piece) + (1 if current else 0)
+                if current and size + added > limit:
+                    chunks.append(("\n".join(current), current_keys))
+                    current = []
+                    current_keys = []
+                    size = 0
+                    added = len(piece)
+                current.append(piece)
+                if not current_keys or current_keys[-1] != key:
+                    current_keys.append(key)
+                size += added
+    if current:
+        chunks.append(("\n".join(current), current_keys))
+    if keys is None:
+        return [chunk for chunk, _ in chunks]
+    return chunks
+
+
+def completed_keys(chunks):
+    """
+    Key yang selesai terkirim setelah setiap chunk (dari pack_lines dengan
+    keys): text yang dipecah ke beberapa chunk baru selesai di chunk
+    terakhirnya
+
+    Returns:
+        list: List key per chunk
+    """
+    last = {}
+    for index, (_, keys) in enumerate(chunks):
+        for key in keys:
+            last[key] = index
+    completed = [[] for _ in chunks]
+    for key, index in last.items():
+        completed[index].append(key)
+    return completed
+
+
+class RateLimiter:
+    """
+    Token bucket per webhook, disinkronkan dengan header X-RateLimit-*
+
+    Bucket mengatur pace secara proaktif (tidak menunggu 429), header dari
+    response Discord mengoreksi sisa token dan waktu reset.
+    """
+
+    def __init__(self, capacity=DEFAULT_RATE_LIMIT, period=DEFAULT_RATE_PERIOD):
+        """
+        Args:
+            capacity (int): Maksimal request beruntun (burst)
+            period (float): Detik sampai bucket penuh lagi
+        """
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        rate = self.capacity / self.period
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Tunggu (tanpa block event loop) sampai boleh kirim, ambil satu token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) * self.period / self.capacity
+            await asyncio.sleep(wait)
+
+    def update(self, headers):
+        """Sesuaikan bucket dengan header X-RateLimit-* dari response"""
+        try:
+            limit = headers.get("X-RateLimit-Limit")
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+
+            with self._lock:
+                if limit is not None:
+                    self.capacity = max(1, int(limit))
+                if remaining is not None:
+                    self.tokens = min(self.tokens, float(remaining))
+                if remaining is not None and int(remaining) == 0 and reset_after:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + float(reset_after)
+                    )
+        except ValueError:
+            pass
+
+    def backoff(self, seconds):
+        """Blok semua request sampai seconds dari sekarang (429)"""
+        with self._lock:
+            self.tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class RateLimited(Exception):
+    """Response 429 dari Discord"""
+
+    def __init__(self, retry_after, is_global=False):
+        super().__init__(f"Rate limited, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+        self.is_global = is_global
+
+
+class WebhookError(Exception):
+    """Response non-2xx (selain 429) dari Discord"""
+
+    def __init__(self, status_code):
+        super().__init__(f"Webhook returned status {status_code}")
+        self.status_code = status_code
+
+    @property
+    def permanent(self):
+        """4xx = request ditolak (webhook dihapus, payload invalid), retry percuma"""
+        return 400 <= self.status_code < 500
 
 
 class DiscordWebhook:
     """Lightweight Discord integration using webhooks - NO discord.py needed!"""
 
-    def __init__(self, webhook_url):
+    def __init__(
+        self,
+        webhook_url,
+        max_retries=5,
+        coalesce_window=0.3,
+        max_batch=50,
+        use_embeds=False,
+        outbox=None,
+        queue_size=1000,
+        overflow=OVERFLOW_DROP_LOWEST,
+        edit_mode=False,
+        edit_max_priority=0,
+        engine=None,
+    ):
         """
         Initialize Discord webhook
 
         Args:
             webhook_url (str): Discord webhook URL
+            max_retries (int): Maksimal retry per message saat kena 429
+            coalesce_window (float): Detik menunggu result lain untuk
+                digabung ke request yang sama (0 = hanya gabung backlog)
+            max_batch (int): Maksimal result per batch
+            use_embeds (bool): Kirim sebagai embeds (sampai 10 per request)
+                bukan satu content code block
+            outbox (Outbox): Outbox durable (message dicatat sebelum dikirim,
+                di-retry jika gagal, di-replay saat start), None = in-memory
+            queue_size (int): Maksimal message menunggu di queue
+            overflow (str): Policy saat queue penuh: "drop_lowest",
+                "drop_oldest" atau "block"
+            edit_mode (bool): Rolling message: result dengan priority
+                <= edit_max_priority ditambahkan ke satu message "live" yang
+                di-edit, bukan message baru
+            edit_max_priority (int): Priority maksimal untuk rolling message,
+                result yang lebih penting tetap dikirim sebagai message baru
+            engine (DeliveryEngine): Event loop pengiriman, default engine
+                yang di-share (get_engine)
         """
         self.webhook_url = webhook_url
         self.is_ready = True
-        self.message_queue = Queue()
-
-        # Start message queue processor
-        self.processor_thread = threading.Thread(
-            target=self._process_queue, daemon=True
+        self.engine = engine or get_engine()
+        self.message_queue = PriorityMessageQueue(
+            queue_size, overflow, on_drop=self._on_queue_drop
         )
-        self.processor_thread.start()
+        # put() dari capture thread langsung membangunkan processor task
+        self._handoff = Handoff(self.message_queue, self.engine)
+        self.max_retries = max_retries
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.use_embeds = use_embeds
+        self.outbox = outbox
+        self._next_retry = None
+
+        # Rolling message (edit mode): id + isi message live saat ini
+        self.edit_mode = edit_mode
+        self.edit_max_priority = edit_max_priority
+        self._live_id = None
+        self._live_text = ""
+        self.edits_sent = 0
+
+        # Stats
+        self.results_sent = 0
+        self.requests_sent = 0
+
+        # Pace request per webhook (task sendiri, jadi webhook lain tidak
+        # ikut menunggu)
+        self.rate_limiter = RateLimiter()
+        self.rate_limited_count = 0
+
+        # Keep-alive session: koneksi TCP/TLS dipakai ulang antar message
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Replay message yang belum terkirim dari sesi sebelumnya
+        if self.outbox is not None:
+            replay = self.outbox.pending(self.webhook_url)
+            for message_id, text, priority in replay:
+                self._handoff.put((message_id, text, priority, None), priority)
+            self._next_retry = self.outbox.next_retry(self.webhook_url)
+            if replay or self._next_retry is not None:
+                print(f"📮 Replaying unsent Discord messages ({len(self.outbox)})")
+
+        # Start message queue processor (task di event loop engine)
+        self._task = self.engine.submit(self._process_queue())
 
         print("✅ Discord webhook ready")
 
-    def _process_queue(self):
+    async def _process_queue(self):
         """Process messages from queue and send to Discord"""
-        while True:
-            try:
-                if not self.message_queue.empty():
-                    text = self.message_queue.get()
-                    self._send_message(text)
-                time.sleep(0.1)  # Small delay to prevent CPU spinning
-            except Exception as e:
-                print(f"❌ Error in message queue: {e}")
-                time.sleep(1)
-
-    def _send_message(self, text, max_length=2000):
-        """Internal method to send message via webhook"""
+        stopping = False
         try:
-            # Split long messages if needed
-            if len(text) > max_length:
-                chunks = [
-                    text[i : i + max_length] for i in range(0, len(text), max_length)
+            while not stopping:
+                # Tidak ada wake-up saat idle (kecuali ada retry outbox yang
+                # dijadwalkan), langsung kirim begitu message masuk
+                try:
+                    item = await self._handoff.get(self._retry_timeout())
+                except Empty:
+                    await self._retry_due()
+                    continue
+                if item is _STOP:
+                    break
+
+                batch, stopping = await self._collect_batch(item)
+                await self._deliver(batch)
+                await self._retry_due()
+        finally:
+            self.session.close()
+
+    def _retry_timeout(self):
+        """Detik sampai retry outbox berikutnya (None = tunggu message baru)"""
+        if self._next_retry is None:
+            return None
+        return max(0.0, self._next_retry - time.time())
+
+    async def _retry_due(self):
+        """Kirim ulang message outbox yang backoff-nya sudah lewat"""
+        if self._next_retry is None or time.time() < self._next_retry:
+            return
+        while True:
+            rows = self.outbox.pending(
+                self.webhook_url, retries=True, limit=self.max_batch
+            )
+            if not rows:
+                break
+            await self._deliver(
+                [
+                    (message_id, text, priority, None)
+                    for message_id, text, priority in rows
                 ]
-                for chunk in chunks:
-                    self._send_single_message(chunk)
+            )
+        self._next_retry = self.outbox.next_retry(self.webhook_url)
+
+    async def _deliver(self, batch):
+        """
+        Kirim batch (id, text) lalu ack ke outbox, atau jadwalkan retry
+
+        Args:
+            batch (list): (outbox id atau None, text, priority, FrameTrace
+                atau None)
+        """
+        self._trace(batch, "queue")
+        sent = set()
+
+        def on_sent(indexes):
+            # Ack per request: chunk yang sudah diterima Discord tidak ikut
+            # dikirim ulang jika request berikutnya di batch ini gagal
+            items = [batch[index] for index in indexes if index not in sent]
+            sent.update(indexes)
+            if self.outbox is not None:
+                self.outbox.ack([message_id for message_id, _, _, _ in items])
+            self._trace(items, "send", finish=True)
+
+        try:
+            if self.edit_mode:
+                await self._send_rolling(batch, on_sent)
             else:
-                self._send_single_message(text)
+                await self._send_batch([text for _, text, _, _ in batch], on_sent)
+            return
+        except Exception as e:
+            error = e
 
+        rest = [item for index, item in enumerate(batch) if index not in sent]
+        ids = [message_id for message_id, _, _, _ in rest]
+        if not (isinstance(error, WebhookError) and error.permanent):
+            self._retry_later(ids, error)
+            return
+        if len(rest) > 1:
+            # Satu message invalid jangan membuang seluruh batch: kirim
+            # ulang yang belum terkirim satu per satu, hanya yang ditolak
+            # yang dibuang
+            print(f"⚠️  Discord rejected batch ({error}), resending one by one")
+            for item in rest:
+                await self._deliver([item])
+            return
+        print(f"❌ Discord rejected message ({error}), dropped")
+        if self.outbox is not None:
+            self.outbox.discard(ids)
+
+    @staticmethod
+    def _trace(batch, stage, finish=False):
+        """Mark stage latency untuk frame di batch (lihat LatencyTracer)"""
+        for _, _, _, trace in batch:
+            if trace is None:
+                continue
+            trace.mark(stage)
+            if finish:
+                trace.finish()
+
+    def _retry_later(self, ids, error):
+        """Tandai gagal di outbox (retry dengan backoff)"""
+        if self.outbox is None:
+            print(f"❌ Error sending to Discord: {error}")
+            return
+        self.outbox.fail(ids, str(error))
+        self._next_retry = self.outbox.next_retry(self.webhook_url)
+        wait = self._retry_timeout() or 0.0
+        print(
+            f"❌ Error sending to Discord: {error} "
+            f"({len(ids)} results kept in outbox, next retry in {wait:.0f}s)"
+        )
+
+    async def _collect_batch(self, first):
+        """
+        Kumpulkan result lain yang masuk dalam coalesce_window (atau yang
+        sudah menumpuk di queue) untuk dikirim bersama
+
+        Returns:
+            tuple: (batch, stopping)
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.coalesce_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = await self._handoff.get(remaining)
+                else:
+                    item = self._handoff.get_nowait()
+            except Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _send_batch(self, texts, on_sent=None):
+        """
+        Kirim beberapa result dengan request sesedikit mungkin
+
+        Args:
+            texts (list): Text result
+            on_sent (callable): Dipanggil dengan index (di texts) result yang
+                sudah terkirim penuh, setiap kali satu request berhasil
+        """
+        on_sent = on_sent or (lambda indexes: None)
+        if self.use_embeds:
+            await self._send_embeds(texts, on_sent)
+        else:
+            limit = MAX_CONTENT_LENGTH - CODE_FENCE_OVERHEAD
+            chunks = pack_lines(texts, limit, keys=range(len(texts)))
+            for (chunk, _), completed in zip(chunks, completed_keys(chunks)):
+                await self._send_single_message(chunk)
+                on_sent(completed)
+
+        self.results_sent += len(texts)
+        if len(texts) > 1:
+            print(f"✅ Sent to Discord ({len(texts)} results coalesced)")
+        else:
             print("✅ Sent to Discord")
-        except Exception as e:
-            print(f"❌ Error sending to Discord: {e}")
 
-    def _send_single_message(self, text):
+    async def _send_message(self, text):
+        """Internal method to send message via webhook"""
+        await self._send_batch([text])
+
+    async def _send_embeds(self, texts, on_sent):
+        """Kirim chunk sebagai embeds: max 10 per request, total 6000 char"""
+        limit = MAX_EMBED_DESCRIPTION - CODE_FENCE_OVERHEAD
+        chunks = pack_lines(texts, limit, keys=range(len(texts)))
+        embeds = []
+        completed = []
+        total = 0
+        for (chunk, _), done in zip(chunks, completed_keys(chunks)):
+            description = f"```\n{chunk}\n```"
+            if embeds and (
+                len(embeds) == MAX_EMBEDS or total + len(description) > MAX_EMBED_TOTAL
+            ):
+                await self._send_payload({"embeds": embeds, "username": "OCR Bot"})
+                on_sent(completed)
+                embeds = []
+                completed = []
+                total = 0
+            embeds.append({"description": description})
+            completed.extend(done)
+            total += len(description)
+        if embeds:
+            await self._send_payload({"embeds": embeds, "username": "OCR Bot"})
+            on_sent(completed)
+
+    async def _send_single_message(self, text):
         """Send a single message to Discord webhook"""
         payload = {"content": f"```\n{text}\n```", "username": "OCR Bot"}
+        await self._send_payload(payload)
 
-        response = requests.post(
-            self.webhook_url,
-            data=json.dumps(payload),
-            headers={"Content-Type": "application/json"},
+    def _webhook_url(self, path="", **params):
+        """webhook_url + path, query yang sudah ada (misal thread_id) dipertahankan"""
+        base, _, query = self.webhook_url.partition("?")
+        query = [query] if query else []
+        query.extend(f"{key}={value}" for key, value in params.items())
+        return base + path + ("?" + "&".join(query) if query else "")
+
+    async def _send_rolling(self, batch, on_sent):
+        """
+        Edit mode: result penting dikirim sebagai message baru, sisanya
+        ditambahkan ke message live (satu PATCH per batch, jadi update yang
+        masuk selama request sebelumnya berjalan otomatis digabung)
+
+        Args:
+            batch (list): Item queue (lihat _deliver)
+            on_sent (callable): Dipanggil dengan index (di batch) result yang
+                sudah terkirim, setiap kali satu request berhasil
+        """
+        important = [
+            index
+            for index, (_, _, priority, _) in enumerate(batch)
+            if priority > self.edit_max_priority
+        ]
+        routine = [
+            index
+            for index, (_, _, priority, _) in enumerate(batch)
+            if priority <= self.edit_max_priority
+        ]
+
+        if important:
+            await self._send_batch(
+                [batch[index][1] for index in important],
+                lambda done: on_sent([important[i] for i in done]),
+            )
+            # Message live sudah tidak di paling bawah channel
+            self._live_id = None
+            self._live_text = ""
+        if routine:
+            await self._update_live(
+                [batch[index][1] for index in routine],
+                lambda done: on_sent([routine[i] for i in done]),
+            )
+            self.results_sent += len(routine)
+
+    async def _update_live(self, texts, on_sent):
+        """Tambahkan text ke message live, message baru jika melebihi limit"""
+        limit = MAX_CONTENT_LENGTH - CODE_FENCE_OVERHEAD
+        live_text = self._live_text
+        dirty = False
+        # Result yang sudah masuk live_text tapi belum di-PATCH
+        pending = []
+
+        chunks = pack_lines(texts, limit, keys=range(len(texts)))
+        for (chunk, _), done in zip(chunks, completed_keys(chunks)):
+            if self._live_id is not None and len(live_text) + 1 + len(chunk) <= limit:
+                live_text = f"{live_text}\n{chunk}"
+                dirty = True
+                pending.extend(done)
+                continue
+
+            if dirty:
+                await self._edit_live(live_text)
+                on_sent(pending)
+                pending = []
+                dirty = False
+            await self._post_live(chunk)
+            on_sent(done)
+            live_text = chunk
+
+        if dirty:
+            await self._edit_live(live_text)
+            on_sent(pending)
+
+    async def _post_live(self, text):
+        """POST message baru (?wait=true supaya dapat message id) -> live"""
+        response = await self._send_payload(
+            {"content": f"```\n{text}\n```", "username": "OCR Bot"},
+            url=self._webhook_url(wait="true"),
+        )
+        self._live_id = response.json()["id"]
+        self._live_text = text
+        print("✅ Sent to Discord (live message)")
+
+    async def _edit_live(self, text):
+        """PATCH message live dengan isi terbaru"""
+        try:
+            await self._send_payload(
+                {"content": f"```\n{text}\n```"},
+                method="PATCH",
+                url=self._webhook_url(f"/messages/{self._live_id}"),
+            )
+        except WebhookError as e:
+            if e.status_code != 404:
+                raise
+            # Message live dihapus (misal oleh moderator): kirim ulang
+            self._live_id = None
+            await self._post_live(text)
+            return
+        self._live_text = text
+        self.edits_sent += 1
+        print("✏️  Updated live Discord message")
+
+    async def _send_payload(self, payload, method="POST", url=None):
+        """
+        Kirim satu payload (retry jika kena 429)
+
+        HTTP request (blocking) berjalan di thread pool engine, menunggu
+        rate limit dan retry tidak menahan event loop.
+
+        Args:
+            payload (dict): Body JSON
+            method (str): "POST" (execute) atau "PATCH" (edit message)
+            url (str): Default webhook_url
+
+        Returns:
+            requests.Response: Response terakhir (2xx)
+        """
+        data = json.dumps(payload)
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                return await self.engine.run_blocking(self._request, data, method, url)
+            except RateLimited as e:
+                self.rate_limited_count += 1
+                if attempt == self.max_retries:
+                    raise
+                print(f"⏳ Discord rate limited, retry in {e.retry_after:.2f}s")
+                self.rate_limiter.backoff(e.retry_after)
+
+    def _request(self, data, method="POST", url=None):
+        """Satu HTTP request ke webhook"""
+        response = self.session.request(
+            method,
+            url or self.webhook_url,
+            data=data,
             timeout=10,
         )
+        self.rate_limiter.update(response.headers)
+        self.requests_sent += 1
+
+        if response.status_code == 429:
+            raise self._rate_limited(response)
+        if not 200 <= response.status_code < 300:
+            raise WebhookError(response.status_code)
+        return response
 
-        if response.status_code not in [200, 204]:
-            raise Exception(f"Webhook returned status {response.status_code}")
+    @staticmethod
+    def _rate_limited(response):
+        """RateLimited dari body JSON (retry_after) atau header Retry-After"""
+        retry_after = None
+        is_global = False
+        try:
+            body = response.json()
+            retry_after = float(body.get("retry_after"))
+            is_global = bool(body.get("global", False))
+        except (ValueError, TypeError, AttributeError):
+            pass
+        if retry_after is None:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+        return RateLimited(retry_after, is_global)
+
+    def _on_queue_drop(self, item):
+        """Message dibuang karena queue penuh: hapus juga dari outbox"""
+        message_id = item[0]
+        if self.outbox is not None:
+            self.outbox.discard([message_id])
+        print("⚠️  Discord queue full, message dropped")
 
-    def send_ocr_result(self, text):
+    def send_ocr_result(self, text, priority=None, trace=None):
         """
         Queue OCR text to be sent to Discord
         This is a synchronous method that can be called from any thread
 
         Args:
             text (str): The OCR text to send
+            priority (int): Priority keyword yang match (lebih tinggi dikirim
+                lebih dulu), None = DEFAULT_PRIORITY
+            trace (FrameTrace): Latency trace frame asal text (optional)
         """
-        if self.is_ready:
-            self.message_queue.put(text)
-        else:
+        if priority is None:
+            priority = DEFAULT_PRIORITY
+
+        if not self.is_ready:
             print("⏳ Discord not ready, message not sent")
+            return
 
-    def test_connection(self):
+        # Catat di outbox dulu supaya tidak hilang jika app ditutup/crash
+        message_id = None
+        if self.outbox is not None:
+            message_id = self.outbox.add(self.webhook_url, text, priority)
+            if message_id is None:
+                print("⚠️  Discord outbox full, message dropped")
+                return
+        self._handoff.put((message_id, text, priority, trace), priority)
+
+    def stop(self):
+        """Stop terima message baru, processor berhenti setelah queue habis"""
+        if not self.is_ready:
+            return
+        self.is_ready = False
+        # Priority terendah: dikirim setelah semua message di queue
+        self._handoff.put(_STOP, float("-inf"), force=True)
+
+    def close(self, timeout=10.0):
+        """
+        Kirim semua message yang masih di queue lalu stop processor task
+        (jangan dipanggil dari event loop engine)
+
+        Args:
+            timeout (float): Maksimal detik menunggu queue habis
+        """
+        self.stop()
+        try:
+            self._task.result(timeout)
+        except concurrent.futures.TimeoutError:
+            print("⚠️  Discord queue not fully drained before shutdown")
+        except Exception as e:
+            print(f"❌ Error in message queue: {e}")
+
+    async def test_connection(self):
         """Test webhook connection"""
         try:
-            self._send_single_message("🤖 OCR Bot connected!")
+            await self._send_single_message("🤖 OCR Bot connected!")
             return True
         except Exception as e:
             print(f"❌ Webhook test failed: {e}")
             return False
 
 
+class Route:
+    """Rule routing: keyword / event type -> satu atau lebih webhook"""
+
+    def __init__(self, name, webhooks, keywords=(), event_types=()):
+        """
+        Args:
+            name (str): Nama route (untuk log)
+            webhooks (list): Webhook URL tujuan
+            keywords (list): Keyword (case-insensitive, substring seperti
+                FilterRules)
+            event_types (list): Event type dari EventExtractor
+                (misal "rare_catch", "spotted")
+        """
+        self.name = name
+        self.webhooks = list(webhooks)
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self.event_types = set(event_types)
+        self.keyword_re = (
+            re.compile("|".join(map(re.escape, self.keywords)))
+            if self.keywords
+            else None
+        )
+
+    @classmethod
+    def from_dict(cls, data, index=0):
+        """
+        Build route dari config, contoh:
+            {"name": "rare", "webhooks": ["https://..."],
+             "keywords": ["Divine Secret"], "event_types": ["rare_catch"]}
+
+        "webhook" (satu URL) juga diterima selain "webhooks".
+        """
+        webhooks = data.get("webhooks") or []
+        if isinstance(webhooks, str):
+            webhooks = [webhooks]
+        if data.get("webhook"):
+            webhooks = [data["webhook"]] + list(webhooks)
+        if not webhooks:
+            raise ValueError(f"Route {data.get('name', index)} has no webhook")
+        return cls(
+            data.get("name", f"route{index}"),
+            webhooks,
+            data.get("keywords", []),
+            data.get("event_types", []),
+        )
+
+    def matches(self, line_lower, event_type=None):
+        """True jika baris berisi keyword route atau event type-nya cocok"""
+        if event_type is not None and event_type in self.event_types:
+            return True
+        return self.keyword_re is not None and bool(self.keyword_re.search(line_lower))
+
+
+class DiscordRouter:
+    """
+    Fan-out ke beberapa webhook
+
+    Setiap webhook URL punya DiscordWebhook sendiri (queue, processor task,
+    rate limiter) di event loop yang sama, jadi channel yang lambat atau kena
+    429 tidak menahan channel lain. Routing per baris: baris yang tidak match route manapun
+    dikirim ke webhook default.
+    """
+
+    def __init__(
+        self, default_url=None, routes=(), priority_for=None, **webhook_options
+    ):
+        """
+        Args:
+            default_url (str): Webhook untuk baris yang tidak match route
+                (None = baris tersebut tidak dikirim)
+            routes (list): Route
+            priority_for (callable): text lowercase -> priority (misal
+                FilterRules.keyword_priority), dihitung ulang per webhook dari
+                baris yang dikirim ke sana. None = priority frame dipakai
+                untuk semua webhook
+            **webhook_options: Diteruskan ke setiap DiscordWebhook (outbox,
+                queue_size, overflow, ...)
+        """
+        self.default_url = default_url
+        self.routes = list(routes)
+        self.priority_for = priority_for
+        self.webhooks = {}
+
+        urls = [default_url] if default_url else []
+        for route in self.routes:
+            urls.extend(route.webhooks)
+        for url in urls:
+            if url not in self.webhooks:
+                self.webhooks[url] = DiscordWebhook(url, **webhook_options)
+
+        if self.routes:
+            print(
+                f"✅ Discord routing: {len(self.routes)} routes, "
+                f"{len(self.webhooks)} webhooks"
+            )
+
+    def destinations(self, line, event_type=None):
+        """Webhook URL tujuan untuk satu baris"""
+        line_lower = line.lower()
+        urls = []
+        for route in self.routes:
+            if route.matches(line_lower, event_type):
+                urls.extend(url for url in route.webhooks if url not in urls)
+        if not urls and self.default_url:
+            urls.append(self.default_url)
+        return urls
+
+    def send_ocr_result(self, text, priority=None, events=(), trace=None):
+        """
+        Route setiap baris lalu queue ke webhook tujuan (baris untuk webhook
+        yang sama tetap digabung jadi satu message)
+
+        Args:
+            text (str): Text OCR (bisa multi-line)
+            priority (int): Priority keyword seluruh text (dipakai jika
+                priority_for None)
+            events (list): OCREvent dari EventExtractor (event.text = baris)
+            trace (FrameTrace): Latency trace frame asal text (optional)
+        """
+        event_types = {event.text: event.event_type for event in events}
+        lines_by_url = {}
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            for url in self.destinations(stripped, event_types.get(stripped)):
+                lines_by_url.setdefault(url, []).append(line)
+
+        for url, lines in lines_by_url.items():
+            message = "\n".join(lines)
+            # Baris rutin yang satu frame dengan event penting tidak ikut
+            # naik priority di webhook lain
+            if self.priority_for is not None:
+                priority = self.priority_for(message.lower())
+            self.webhooks[url].send_ocr_result(message, priority, trace)
+
+    async def test_connection(self):
+        """Test semua webhook bersamaan, True jika semuanya berhasil"""
+        results = await asyncio.gather(
+            *(webhook.test_connection() for webhook in self.webhooks.values())
+        )
+        return all(results)
+
+    def close(self, timeout=10.0):
+        """Stop semua webhook bersamaan lalu tunggu queue masing-masing habis"""
+        for webhook in self.webhooks.values():
+            webhook.stop()
+        deadline = time.monotonic() + timeout
+        for webhook in self.webhooks.values():
+            webhook.close(max(0.0, deadline - time.monotonic()))
+
+    def status(self):
+        """Ringkasan per webhook untuk log"""
+        lines = []
+        for url, webhook in self.webhooks.items():
+            # Jangan tampilkan token webhook di log
+            name = url.rsplit("/", 2)[-2] if url.count("/") > 2 else url
+            lines.append(
+                f"🔀 {name}: {webhook.results_sent} sent, "
+                f"{webhook.message_queue.status()}"
+            )
+        return "\n".join(lines)
+
+
 # Untuk backward compatibility dengan discord_bot.py
 class DiscordOCRBot:
     """Wrapper class for compatibility"""
 
-    def __init__(self, webhook_url_or_token, channel_id=None):
+    def __init__(
+        self,
+        webhook_url_or_token,
+        channel_id=None,
+        outbox_size=10000,
+        drop_policy=DROP_OLDEST,
+        queue_size=1000,
+        overflow=OVERFLOW_DROP_LOWEST,
+        routes=None,
+        edit_mode=False,
+        edit_max_priority=0,
+        priority_for=None,
+    ):
         """
         Initialize Discord integration
 
         Args:
             webhook_url_or_token: Either webhook URL or bot token (for compatibility)
             channel_id: Ignored if webhook_url is provided
+            outbox_size (int): Maksimal message belum terkirim di outbox
+            drop_policy (str): "oldest" atau "newest" saat outbox penuh
+            queue_size (int): Maksimal message menunggu di queue
+            overflow (str): "drop_lowest", "drop_oldest" atau "block"
+            routes (list): Route config (dict) untuk fan-out ke webhook lain,
+                baris yang tidak match dikirim ke webhook_url_or_token
+            edit_mode (bool): Rolling message untuk result tidak penting
+            edit_max_priority (int): Priority maksimal untuk rolling message
+            priority_for (callable): text lowercase -> priority, untuk
+                priority per webhook saat baris di-route (lihat DiscordRouter)
         """
+        self.outbox = None
+        self.router = None
+
         # Detect if it's webhook URL or bot token
         if webhook_url_or_token.startswith("https://discord.com/api/webhooks/"):
+            try:
+                self.outbox = Outbox(
+                    OUTBOX_FILE, max_messages=outbox_size, drop_policy=drop_policy
+                )
+            except sqlite3.Error as e:
+                print(f"⚠️  Discord outbox disabled: {e}")
+
             # It's a webhook URL - use lightweight method
-            self.webhook = DiscordWebhook(webhook_url_or_token)
+            parsed_routes = []
+            for index, route in enumerate(routes or []):
+                try:
+                    parsed_routes.append(Route.from_dict(route, index))
+                except (ValueError, TypeError, AttributeError) as e:
+                    print(f"⚠️  Skipping invalid Discord route: {e}")
+
+            self.router = DiscordRouter(
+                webhook_url_or_token,
+                parsed_routes,
+                priority_for=priority_for,
+                outbox=self.outbox,
+                queue_size=queue_size,
+                overflow=overflow,
+                edit_mode=edit_mode,
+                edit_max_priority=edit_max_priority,
+            )
+            self.webhook = self.router.webhooks[webhook_url_or_token]
             self.is_ready = True
             self.use_webhook = True
             print("✅ Using lightweight webhook method (no discord.py needed)")
@@ -130,22 +969,33 @@ class DiscordOCRBot:
         """Compatibility method - webhooks don't need to start"""
         if self.use_webhook:
             # Test connection
-            if self.webhook.test_connection():
+            if await self.router.test_connection():
                 print("✅ Webhook connection successful")
             else:
                 print("❌ Webhook connection failed")
         pass
 
-    def send_ocr_result(self, text):
-        """Send OCR result to Discord"""
-        if self.use_webhook and self.webhook:
-            self.webhook.send_ocr_result(text)
+    def send_ocr_result(self, text, priority=None, events=(), trace=None):
+        """Send OCR result to Discord (di-route per baris jika ada routes)"""
+        if self.use_webhook and self.router:
+            self.router.send_ocr_result(text, priority, events, trace)
         else:
             print("❌ Discord not properly initialized")
 
+    def close(self, timeout=10.0):
+        """Drain queue dan tutup koneksi webhook"""
+        if self.router:
+            self.router.close(timeout)
+            print(self.router.status())
+        if self.outbox is not None:
+            print(self.outbox.status())
+            self.outbox.close()
+            self.outbox = None
+
     async def stop_bot(self):
         """Compatibility method"""
-        pass
+        # close() menunggu task di event loop ini, jadi jalankan di executor
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
 
 
 if __name__ == "__main__":
@@ -162,7 +1012,7 @@ if __name__ == "__main__":
     # Test message
     webhook.send_ocr_result("Test OCR result from lightweight webhook!")
 
-    # Keep alive for a moment
-    time.sleep(2)
+    # Kirim sisa queue lalu tutup
+    webhook.close()
 
     print("\nWebhook test complete!")
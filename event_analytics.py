@@ -0,0 +1,354 @@
+"""
+Event Analytics
+Statistik streaming per keyword (Megalodon, Kraken, Aurora Borealis, ...)
+dari output OCRFilter: berapa kali muncul, kapan terakhir, dan distribusi
+jarak antar kemunculan (inter-arrival) tanpa scan ulang log.
+
+- Mean/variance pakai Welford (running, numerically stable)
+- Quantile pakai log-bucket sketch (relative error ~alpha, memory konstan)
+- State disimpan periodik ke event_stats.json
+
+Usage (CLI):
+    python event_analytics.py
+    python event_analytics.py --keyword megalodon
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+# File state default (di folder yang sama dengan app)
+STATS_FILE = "event_stats.json"
+
+
+class QuantileSketch:
+    """
+    Quantile sketch dengan bucket logaritmik (mirip DDSketch)
+
+    Nilai x masuk bucket ceil(log_gamma(x)), jadi quantile yang dikembalikan
+    punya relative error maksimal alpha. Jumlah bucket dibatasi max_buckets;
+    jika penuh, bucket terkecil digabung (quantile atas tetap akurat).
+    """
+
+    def __init__(self, alpha=0.05, max_buckets=200, min_value=0.1):
+        """
+        Args:
+            alpha (float): Relative accuracy (0.05 = 5%)
+            max_buckets (int): Batas jumlah bucket (memory konstan)
+            min_value (float): Nilai lebih kecil masuk zero bucket
+        """
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """Tambah satu nilai"""
+        self.count += 1
+        if value < self.min_value:
+            self.zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+        if len(self.buckets) > self.max_buckets:
+            # Gabung dua bucket terkecil
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
+
+    def quantile(self, q):
+        """
+        Estimasi quantile q (0..1)
+
+        Returns:
+            float or None: None jika sketch masih kosong
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Titik tengah bucket (gamma^(i-1), gamma^i]
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha,
+            "max_buckets": self.max_buckets,
+            "min_value": self.min_value,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "buckets": {str(index): n for index, n in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["alpha"], data["max_buckets"], data["min_value"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.buckets = {int(index): n for index, n in data["buckets"].items()}
+        return sketch
+
+
+class KeywordStats:
+    """Aggregate incremental untuk satu keyword"""
+
+    def __init__(self):
+        self.count = 0
+        self.first_seen = None
+        self.last_seen = None
+
+        # Welford untuk inter-arrival (detik)
+        self.gap_count = 0
+        self.gap_mean = 0.0
+        self._gap_m2 = 0.0
+        self.gap_min = None
+        self.gap_max = None
+        self.gaps = QuantileSketch()
+
+    def update(self, timestamp):
+        """Catat satu kemunculan"""
+        self.count += 1
+        if self.first_seen is None:
+            self.first_seen = timestamp
+
+        if self.last_seen is not None:
+            gap = max(0.0, timestamp - self.last_seen)
+            self.gap_count += 1
+            delta = gap - self.gap_mean
+            self.gap_mean += delta / self.gap_count
+            self._gap_m2 += delta * (gap - self.gap_mean)
+            self.gap_min = gap if self.gap_min is None else min(self.gap_min, gap)
+            self.gap_max = gap if self.gap_max is None else max(self.gap_max, gap)
+            self.gaps.add(gap)
+
+        self.last_seen = max(timestamp, self.last_seen or timestamp)
+
+    @property
+    def gap_variance(self):
+        """Sample variance inter-arrival (None jika < 2 gap)"""
+        if self.gap_count < 2:
+            return None
+        return self._gap_m2 / (self.gap_count - 1)
+
+    @property
+    def gap_stddev(self):
+        variance = self.gap_variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def summary(self):
+        """Dict ringkas untuk CLI/GUI"""
+        return {
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "gap_mean": self.gap_mean if self.gap_count else None,
+            "gap_stddev": self.gap_stddev,
+            "gap_min": self.gap_min,
+            "gap_max": self.gap_max,
+            "gap_p50": self.gaps.quantile(0.5),
+            "gap_p90": self.gaps.quantile(0.9),
+            "gap_p99": self.gaps.quantile(0.99),
+        }
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "gap_count": self.gap_count,
+            "gap_mean": self.gap_mean,
+            "gap_m2": self._gap_m2,
+            "gap_min": self.gap_min,
+            "gap_max": self.gap_max,
+            "gaps": self.gaps.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.first_seen = data["first_seen"]
+        stats.last_seen = data["last_seen"]
+        stats.gap_count = data["gap_count"]
+        stats.gap_mean = data["gap_mean"]
+        stats._gap_m2 = data["gap_m2"]
+        stats.gap_min = data["gap_min"]
+        stats.gap_max = data["gap_max"]
+        stats.gaps = QuantileSketch.from_dict(data["gaps"])
+        return stats
+
+
+class EventAnalytics:
+    """Statistik per keyword, di-update dari stream message yang lolos filter"""
+
+    def __init__(self, path=STATS_FILE, save_interval=60.0):
+        """
+        Args:
+            path (str): File JSON untuk persist state (None = memory only)
+            save_interval (float): Minimal detik antar save otomatis
+        """
+        self.path = path
+        self.save_interval = save_interval
+        self.stats = {}
+
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+        self._dirty = False
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def record(self, keyword, timestamp=None):
+        """
+        Catat satu message yang match keyword
+
+        Args:
+            keyword (str): Keyword (lowercase, dari FilterRules.best_keyword)
+            timestamp (float): Epoch seconds, default sekarang
+        """
+        if not keyword:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            stats = self.stats.get(keyword)
+            if stats is None:
+                stats = self.stats[keyword] = KeywordStats()
+            stats.update(timestamp)
+            self._dirty = True
+
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def get(self, keyword):
+        """Summary untuk satu keyword (None jika belum pernah muncul)"""
+        with self._lock:
+            stats = self.stats.get(keyword.lower())
+            return stats.summary() if stats else None
+
+    def snapshot(self):
+        """Summary semua keyword: {keyword: dict}"""
+        with self._lock:
+            return {keyword: stats.summary() for keyword, stats in self.stats.items()}
+
+    def load(self):
+        """Load state dari file (state lama dipertahankan jika file invalid)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stats = {
+                keyword: KeywordStats.from_dict(item)
+                for keyword, item in data.get("keywords", {}).items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Error loading event stats {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self.stats = stats
+        print(f"✅ Event stats loaded: {len(stats)} keywords")
+        return True
+
+    def save(self):
+        """Tulis state ke file (atomic: tmp file lalu rename)"""
+        with self._lock:
+            self._last_save = time.monotonic()
+            if not self.path or not self._dirty:
+                return
+            data = {
+                "saved_at": time.time(),
+                "keywords": {
+                    keyword: stats.to_dict() for keyword, stats in self.stats.items()
+                },
+            }
+            self._dirty = False
+
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Error saving event stats: {e}")
+
+    def close(self):
+        """Save terakhir"""
+        self.save()
+
+    def report(self, keywords=None):
+        """Tabel ringkas (untuk terminal / GUI)"""
+        return format_report(self.snapshot(), keywords)
+
+
+def format_duration(seconds):
+    """Detik -> '1h 23m' / '4m 05s' / '12.0s'"""
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def format_report(snapshot, keywords=None):
+    """Format snapshot EventAnalytics menjadi tabel text"""
+    rows = sorted(snapshot.items(), key=lambda item: item[1]["count"], reverse=True)
+    if keywords:
+        wanted = {keyword.lower() for keyword in keywords}
+        rows = [row for row in rows if row[0] in wanted]
+
+    if not rows:
+        return "📊 No event stats yet"
+
+    lines = [
+        "📊 Event stats",
+        f"{'keyword':<20} {'count':>6} {'last seen':>19} "
+        f"{'mean gap':>9} {'p50':>9} {'p90':>9}",
+    ]
+    for keyword, summary in rows:
+        last_seen = datetime.fromtimestamp(summary["last_seen"]).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        lines.append(
+            f"{keyword:<20} {summary['count']:>6} {last_seen:>19} "
+            f"{format_duration(summary['gap_mean']):>9} "
+            f"{format_duration(summary['gap_p50']):>9} "
+            f"{format_duration(summary['gap_p90']):>9}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show per-keyword event stats")
+    parser.add_argument("--file", default=STATS_FILE, help="Stats JSON file")
+    parser.add_argument("--keyword", action="append", help="Only these keywords")
+    args = parser.parse_args()
+
+    analytics = EventAnalytics(args.file)
+    print(analytics.report(args.keyword))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+OCR Event Extractor
+Ubah text hasil OCRFilter menjadi record event terstruktur
+(event type, player, item, location, rarity, timestamp)
+
+Semua event pattern di-compile menjadi satu regex, jadi setiap baris hanya
+di-scan sekali. Downstream (Discord, file, analytics) bisa pakai field yang
+sudah di-parse tanpa regex ulang.
+"""
+
+import re
+import time
+from collections import namedtuple
+
+# Record event hasil extraction. Field yang tidak ada di pattern = None.
+OCREvent = namedtuple(
+    "OCREvent",
+    ["event_type", "player", "item", "location", "rarity", "timestamp", "text"],
+)
+
+# Field yang boleh muncul sebagai named group di EVENT_PATTERNS
+EVENT_FIELDS = ("player", "item", "location", "rarity")
+
+# Tabel event: (event_type, regex). Urutan = prioritas jika beberapa pattern
+# match di posisi yang sama. Case-insensitive.
+EVENT_PATTERNS = [
+    # "Shiro used a Sundial Totem to speed up the celestial cycle."
+    ("totem", r"(?P<player>\w+) used an? (?P<item>[\w' ]+? Totem)\b"),
+    # "Divine Secret 1/1000 Aetherfin!"
+    (
+        "rare_catch",
+        r"(?P<rarity>(?:Divine |Mythic(?:al)? |Exotic )?Secret|Mythic(?:al)?|"
+        r"Legendary|Exotic|Limited) 1/[\d,.]+[kKmM]? (?P<item>[\w']+(?: [\w']+)*)",
+    ),
+    # "A Megalodon has been spotted past Ancient Isle!"
+    (
+        "spotted",
+        r"\bAn? (?P<item>[\w' ]+?) (?:has been|was) spotted"
+        r"(?: (?:past|near|at|in|around) (?P<location>[\w' ]+?))?(?=[.!]|$)",
+    ),
+    # "The Cursed Isle has emerged from the fog!"
+    (
+        "emerged",
+        r"\bThe (?P<location>[\w' ]+?) (?:has )?emerged\b",
+    ),
+    # "The Kraken has vanished into the depths..."
+    (
+        "vanished",
+        r"\bThe (?P<item>[\w' ]+?) (?:has )?vanished\b",
+    ),
+    # "Awakened Omnithal manifests near Forsaken Shores"
+    (
+        "manifests",
+        r"\b(?P<item>[\w' ]+?) manifests"
+        r"(?: (?:near|at|in|around) (?P<location>[\w' ]+?))?(?=[.!]|$)",
+    ),
+    # "Aurora Borealis! Luck is drastically increased"
+    ("aurora", r"\bAurora Borealis\b"),
+    # "Shiro caught a Narwhal"
+    ("catch", r"(?P<player>\w+) caught an? (?P<item>[\w' ]+?)(?=[.!,]|$)"),
+    # "Shiro joined the server"
+    ("join", r"(?P<player>\w+) joined\b"),
+]
+
+
+class EventExtractor:
+    """Extract structured events dari text OCR yang sudah di-filter"""
+
+    def __init__(self, patterns=None):
+        """
+        Args:
+            patterns (list): (event_type, regex) pairs, default EVENT_PATTERNS.
+                Named group yang dikenali: player, item, location, rarity.
+        """
+        self.patterns = list(patterns or EVENT_PATTERNS)
+        self._compile()
+
+    def _compile(self):
+        """Compile semua pattern menjadi satu alternation"""
+        parts = []
+        self._event_types = {}
+        for index, (event_type, pattern) in enumerate(self.patterns):
+            # Rename named groups supaya unik per event: player -> e3_player
+            prefixed = re.sub(r"\(\?P<(\w+)>", rf"(?P<e{index}_\1>", pattern)
+            parts.append(f"(?P<e{index}>{prefixed})")
+            self._event_types[f"e{index}"] = (
+                event_type,
+                tuple(
+                    (field, f"e{index}_{field}")
+                    for field in EVENT_FIELDS
+                    if f"(?P<{field}>" in pattern
+                ),
+            )
+
+        self._event_re = re.compile("|".join(parts), re.IGNORECASE)
+
+    def extract_line(self, line, timestamp=None):
+        """
+        Extract event dari satu baris
+
+        Args:
+            line (str): Satu baris text (sudah di-clean)
+            timestamp (float): Epoch seconds, default sekarang
+
+        Returns:
+            OCREvent or None: None jika tidak ada pattern yang match
+        """
+        match = self._event_re.search(line)
+        if match is None:
+            return None
+
+        # lastgroup = group pembungkus (e0, e1, ...) yang match
+        event_type, groups = self._event_types[match.lastgroup]
+        fields = dict.fromkeys(EVENT_FIELDS)
+        for field, group in groups:
+            value = match.group(group)
+            if value:
+                fields[field] = value.strip()
+
+        return OCREvent(
+            event_type=event_type,
+            timestamp=time.time() if timestamp is None else timestamp,
+            text=line,
+            **fields,
+        )
+
+    def extract(self, text, timestamp=None):
+        """
+        Extract semua event dari text (bisa multi-line, misal mode 'lines')
+
+        Returns:
+            list: OCREvent per baris yang match, urutan sama dengan text
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        events = []
+        for line in text.split("\n"):
+            event = self.extract_line(line.strip(), timestamp)
+            if event:
+                events.append(event)
+        return events
+
+
+# Example usage
+if __name__ == "__main__":
+    extractor = EventExtractor()
+
+    test_texts = [
+        "Shiro used a Sundial Totem to speed up the celestial cycle.",
+        "Divine Secret 1/1000 Aetherfin",
+        "A Megalodon has been spotted past Ancient Isle",
+        "The Cursed Isle has emerged from the fog",
+        "The Kraken has vanished into the depths",
+        "Aurora Borealis! Luck is drastically increased",
+        "Player123 joined the server",
+        "lol anyone want to trade rods?",
+    ]
+
+    print("Testing Event Extractor:")
+    print("=" * 60)
+
+    for text in test_texts:
+        event = extractor.extract_line(text)
+        print(f"Input:  {text}")
+        if event:
+            fields = {
+                field: getattr(event, field)
+                for field in EVENT_FIELDS
+                if getattr(event, field)
+            }
+            print(f"Event:  {event.event_type} {fields}")
+        else:
+            print("Event:  -")
+        print()
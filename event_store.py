@@ -0,0 +1,343 @@
+"""
+OCR Event Store
+Simpan message yang lolos filter (dan event hasil extraction) ke SQLite,
+supaya history bisa di-query cepat tanpa grep ocr_output.txt
+
+- WAL mode: query dari thread/process lain tidak memblokir writer
+- Insert di-batch dalam satu transaction oleh background thread
+- Index pada waktu, keyword, event type dan item
+- Export ke JSONL
+
+Usage (CLI):
+    python event_store.py query --item Megalodon --days 7
+    python event_store.py query --keyword kraken --limit 20
+    python event_store.py export events.jsonl --days 30
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Database default (di folder yang sama dengan app)
+EVENT_DB_FILE = "ocr_events.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    text TEXT NOT NULL,
+    keyword TEXT,
+    priority INTEGER
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL REFERENCES messages(id),
+    ts REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    player TEXT COLLATE NOCASE,
+    item TEXT COLLATE NOCASE,
+    location TEXT COLLATE NOCASE,
+    rarity TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages(ts);
+CREATE INDEX IF NOT EXISTS idx_messages_keyword_ts ON messages(keyword, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events(event_type, ts);
+CREATE INDEX IF NOT EXISTS idx_events_item_ts ON events(item, ts);
+"""
+
+# Sentinel untuk stop writer thread
+_STOP = object()
+
+
+def connect(path):
+    """Open SQLite connection dengan setting WAL"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class EventStore:
+    """SQLite event store dengan batched background writes"""
+
+    def __init__(self, path=EVENT_DB_FILE, batch_size=200, flush_interval=1.0):
+        """
+        Args:
+            path (str): File database SQLite
+            batch_size (int): Maksimal message per transaction
+            flush_interval (float): Maksimal detik message menunggu di queue
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.messages_written = 0
+
+        # Buat schema di thread ini supaya error langsung kelihatan
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.commit()
+        conn.close()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, text, events=(), keyword=None, priority=None, timestamp=None):
+        """
+        Queue satu accepted message (non-blocking)
+
+        Args:
+            text (str): Filtered text
+            events (list): OCREvent dari EventExtractor (optional)
+            keyword (str): Keyword yang match (lowercase)
+            priority (int): Priority keyword
+            timestamp (float): Epoch seconds, default sekarang
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self._queue.put((timestamp, text, keyword, priority, list(events)))
+
+    def close(self, timeout=5.0):
+        """Tulis semua message yang tersisa lalu stop writer thread"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer loop: kumpulkan batch lalu commit dalam satu transaction"""
+        conn = connect(self.path)
+        stopping = False
+
+        while not stopping:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+
+            # Kumpulkan sampai batch penuh atau flush_interval habis
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+            else:
+                stopping = True
+
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Error writing event store: {e}")
+
+        conn.close()
+
+    def _write_batch(self, conn, batch):
+        """Insert satu batch message + events"""
+        with conn:
+            for timestamp, text, keyword, priority, events in batch:
+                cursor = conn.execute(
+                    "INSERT INTO messages (ts, text, keyword, priority) "
+                    "VALUES (?, ?, ?, ?)",
+                    (timestamp, text, keyword, priority),
+                )
+                if events:
+                    conn.executemany(
+                        "INSERT INTO events (message_id, ts, event_type, player, "
+                        "item, location, rarity) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                cursor.lastrowid,
+                                event.timestamp,
+                                event.event_type,
+                                event.player,
+                                event.item,
+                                event.location,
+                                event.rarity,
+                            )
+                            for event in events
+                        ],
+                    )
+        self.messages_written += len(batch)
+
+    def query(
+        self,
+        keyword=None,
+        event_type=None,
+        item=None,
+        since=None,
+        until=None,
+        limit=None,
+    ):
+        """
+        Query history (pakai koneksi read-only terpisah, aman dari thread mana pun)
+
+        Args:
+            keyword (str): Keyword yang match (case-insensitive)
+            event_type (str): Event type (spotted, totem, rare_catch, ...)
+            item (str): Item/creature (case-insensitive)
+            since (float): Epoch seconds (inclusive)
+            until (float): Epoch seconds (exclusive)
+            limit (int): Maksimal jumlah row
+
+        Returns:
+            list: dict per row, terbaru dulu
+        """
+        return query(
+            self.path,
+            keyword=keyword,
+            event_type=event_type,
+            item=item,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+
+
+def query(
+    path=EVENT_DB_FILE,
+    keyword=None,
+    event_type=None,
+    item=None,
+    since=None,
+    until=None,
+    limit=None,
+):
+    """Query event store di path, lihat EventStore.query"""
+    conditions = []
+    params = []
+
+    # Filter event -> mulai dari tabel events (index type/item + ts),
+    # filter waktu juga pakai events.ts supaya tetap satu range scan
+    if event_type or item:
+        sql = (
+            "SELECT m.id, e.ts, m.text, m.keyword, m.priority, e.event_type, "
+            "e.player, e.item, e.location, e.rarity "
+            "FROM events e JOIN messages m ON m.id = e.message_id"
+        )
+        time_column = "e.ts"
+        if event_type:
+            conditions.append("e.event_type = ?")
+            params.append(event_type)
+        if item:
+            conditions.append("e.item = ?")
+            params.append(item)
+    else:
+        sql = "SELECT m.id, m.ts, m.text, m.keyword, m.priority FROM messages m"
+        time_column = "m.ts"
+
+    if keyword:
+        conditions.append("m.keyword = ?")
+        params.append(keyword.lower())
+    if since is not None:
+        conditions.append(f"{time_column} >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append(f"{time_column} < ?")
+        params.append(until)
+
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {time_column} DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    conn = connect(path)
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def export_jsonl(path, output, since=None, until=None):
+    """
+    Export messages + events ke JSONL (satu message per baris)
+
+    Returns:
+        int: Jumlah message yang di-export
+    """
+    conn = connect(path)
+    conditions = []
+    params = []
+    if since is not None:
+        conditions.append("ts >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("ts < ?")
+        params.append(until)
+    where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+
+    count = 0
+    try:
+        with open(output, "w", encoding="utf-8") as f:
+            for message in conn.execute(
+                f"SELECT * FROM messages{where} ORDER BY ts", params
+            ):
+                record = dict(message)
+                record["events"] = [
+                    dict(event)
+                    for event in conn.execute(
+                        "SELECT event_type, player, item, location, rarity "
+                        "FROM events WHERE message_id = ? ORDER BY id",
+                        (message["id"],),
+                    )
+                ]
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        conn.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query OCR event history")
+    parser.add_argument("--db", default=EVENT_DB_FILE, help="SQLite database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = sub.add_parser("query", help="Search messages/events")
+    query_parser.add_argument("--keyword")
+    query_parser.add_argument("--event-type")
+    query_parser.add_argument("--item")
+    query_parser.add_argument("--days", type=float, help="Only last N days")
+    query_parser.add_argument("--limit", type=int, default=50)
+
+    export_parser = sub.add_parser("export", help="Export to JSONL")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--days", type=float, help="Only last N days")
+
+    args = parser.parse_args()
+    since = time.time() - args.days * 86400 if args.days else None
+
+    if args.command == "export":
+        count = export_jsonl(args.db, args.output, since=since)
+        print(f"✅ Exported {count} messages to {args.output}")
+        return
+
+    start = time.perf_counter()
+    rows = query(
+        args.db,
+        keyword=args.keyword,
+        event_type=args.event_type,
+        item=args.item,
+        since=since,
+        limit=args.limit,
+    )
+    elapsed = time.perf_counter() - start
+
+    for row in rows:
+        timestamp = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{timestamp}] {row['text']}")
+    print(f"\n{len(rows)} results in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
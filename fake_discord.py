@@ -0,0 +1,365 @@
+"""
+Fake Discord API Server
+Server HTTP lokal pengganti Discord untuk test dan load test DiscordWebhook
+tanpa webhook / token asli.
+
+Endpoint (sama dengan Discord API):
+- GET   /api/webhooks/{id}/{token}                        -> info webhook
+- POST  /api/webhooks/{id}/{token}[?wait=true]            -> execute webhook
+- PATCH /api/webhooks/{id}/{token}/messages/{message_id}  -> edit message
+
+Perilaku yang bisa diatur:
+- latency + jitter per request
+- error_rate: sebagian request dibalas error_status (default 500)
+- rate limit per webhook (X-RateLimit-* header, 429 + retry_after seperti
+  Discord), plus rate_limit_chance untuk 429 acak (shared/global bucket)
+- payload divalidasi seperti Discord (content 2000 char, max 10 embeds)
+
+Semua request dicatat (server.requests) dan message yang tersimpan ada di
+server.messages, jadi test bisa cek apa yang benar-benar "sampai" ke Discord.
+
+Usage:
+    server = FakeDiscordServer(latency=0.05, error_rate=0.1).start()
+    webhook = DiscordWebhook(server.webhook_url())
+    ...
+    server.stop()
+
+    python fake_discord.py --port 8080 --latency 0.1  # server standalone
+"""
+
+import argparse
+import http.server
+import json
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import parse_qs, urlparse
+
+# Limit Discord untuk payload webhook
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+
+# Default rate limit Discord per webhook: 5 request per 2 detik
+DEFAULT_RATE_LIMIT = 5
+DEFAULT_RATE_PERIOD = 2.0
+
+WEBHOOK_PATH = re.compile(r"^/api/webhooks/(\d+)/([^/]+)(?:/messages/(\w+))?/?$")
+
+# Satu request yang diterima server
+RecordedRequest = namedtuple(
+    "RecordedRequest",
+    "method path query body status received answered",
+)
+
+
+class FakeDiscordHandler(http.server.BaseHTTPRequestHandler):
+    """Handler webhook execute / edit, state ada di FakeDiscordServer"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        server = self.server
+        received = time.monotonic()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+
+        server.simulate_latency()
+        status, reply, headers = server.dispatch(method, url.path, query, body)
+        # Dicatat sebelum reply: client yang sudah dapat response pasti
+        # sudah ada di server.requests
+        server.record(
+            RecordedRequest(
+                method, url.path, query, body, status, received, time.monotonic()
+            )
+        )
+        self._reply(status, reply, headers)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeDiscordServer(http.server.ThreadingHTTPServer):
+    """Stand-in Discord API di 127.0.0.1 (port acak jika port=0)"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=500,
+        rate_limit=DEFAULT_RATE_LIMIT,
+        rate_period=DEFAULT_RATE_PERIOD,
+        rate_limit_chance=0.0,
+        retry_after=1.0,
+        seed=None,
+    ):
+        """
+        Args:
+            port (int): Port lokal, 0 = port bebas
+            latency (float): Delay dasar per request (detik)
+            jitter (float): Delay tambahan acak 0..jitter (detik)
+            error_rate (float): Peluang request dibalas error_status (0-1)
+            error_status (int): Status untuk error acak (misal 500, 503)
+            rate_limit (int): Request per rate_period per webhook, 0 = tanpa
+                rate limit
+            rate_period (float): Window rate limit (detik)
+            rate_limit_chance (float): Peluang 429 acak di luar bucket (0-1)
+            retry_after (float): retry_after untuk 429 acak (detik)
+            seed (int): Seed random supaya error/429 acak bisa diulang
+        """
+        super().__init__(("127.0.0.1", port), FakeDiscordHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.rate_limit_chance = rate_limit_chance
+        self.retry_after = retry_after
+
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        """Hapus semua request, message dan state rate limit"""
+        with self.lock:
+            self.requests = []
+            self.messages = {}
+            self.next_id = 0
+            # webhook id -> (reset time, jumlah request di window)
+            self._buckets = {}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def webhook_url(self, webhook_id=1, token="token"):
+        """URL webhook yang dilayani server ini"""
+        return f"{self.base_url}/api/webhooks/{webhook_id}/{token}"
+
+    def start(self):
+        """Serve di background thread, return self"""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="fake-discord", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop server dan tutup socket"""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def delete_message(self, message_id):
+        """Hapus message (simulasi moderator hapus message di Discord)"""
+        with self.lock:
+            return self.messages.pop(str(message_id), None) is not None
+
+    def record(self, request):
+        with self.lock:
+            self.requests.append(request)
+
+    def simulate_latency(self):
+        delay = self.latency
+        if self.jitter:
+            with self.lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def dispatch(self, method, path, query, body):
+        """
+        Proses satu request
+
+        Returns:
+            tuple: (status, body JSON atau None, header tambahan)
+        """
+        match = WEBHOOK_PATH.match(path)
+        if match is None:
+            return 404, {"message": "404: Not Found", "code": 0}, {}
+        webhook_id, token, message_id = match.groups()
+
+        if method == "GET" and message_id is None:
+            return (
+                200,
+                {"id": webhook_id, "type": 1, "token": token, "name": "OCR Bot"},
+                {},
+            )
+        if (method == "POST") != (message_id is None) or method == "GET":
+            return 405, {"message": "405: Method Not Allowed", "code": 0}, {}
+
+        with self.lock:
+            headers, retry_after = self._take_rate_limit(webhook_id)
+            if retry_after is not None:
+                return self._rate_limited(retry_after, headers)
+            if self._random.random() < self.rate_limit_chance:
+                return self._rate_limited(self.retry_after, headers, is_global=True)
+            if self._random.random() < self.error_rate:
+                return self.error_status, {"message": "Internal Server Error"}, headers
+
+            error = self._validate(body, edit=method == "PATCH")
+            if error is not None:
+                return 400, error, headers
+
+            if method == "POST":
+                self.next_id += 1
+                message_id = str(self.next_id)
+                message = {"id": message_id, "webhook_id": webhook_id}
+                message["content"] = body.get("content", "")
+                message["embeds"] = body.get("embeds", [])
+                self.messages[message_id] = message
+            elif message_id not in self.messages:
+                return 404, {"message": "Unknown Message", "code": 10008}, headers
+            else:
+                # Edit hanya mengganti field yang dikirim
+                message = self.messages[message_id]
+                message.update(
+                    (key, body[key]) for key in ("content", "embeds") if key in body
+                )
+            message = dict(message)
+
+        if method == "POST" and query.get("wait") != ["true"]:
+            return 204, None, headers
+        return 200, message, headers
+
+    def _take_rate_limit(self, webhook_id):
+        """
+        Hitung request di window webhook
+
+        Returns:
+            tuple: (X-RateLimit-* header, retry_after jika melebihi limit
+                atau None)
+        """
+        if not self.rate_limit:
+            return {}, None
+        now = time.monotonic()
+        reset, count = self._buckets.get(webhook_id, (0.0, 0))
+        if now >= reset:
+            reset, count = now + self.rate_period, 0
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Reset-After": f"{reset - now:.3f}",
+            "X-RateLimit-Bucket": f"webhook-{webhook_id}",
+        }
+        if count >= self.rate_limit:
+            # Request yang kena 429 tidak dihitung di window
+            headers["X-RateLimit-Remaining"] = "0"
+            return headers, reset - now
+        count += 1
+        self._buckets[webhook_id] = (reset, count)
+        headers["X-RateLimit-Remaining"] = str(self.rate_limit - count)
+        return headers, None
+
+    @staticmethod
+    def _rate_limited(retry_after, headers, is_global=False):
+        headers = dict(headers, **{"Retry-After": str(max(1, round(retry_after)))})
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        body = {
+            "message": "You are being rate limited.",
+            "retry_after": round(retry_after, 3),
+            "global": is_global,
+        }
+        return 429, body, headers
+
+    @staticmethod
+    def _validate(body, edit=False):
+        """Error body Discord (400) jika payload tidak valid, None jika ok"""
+        if not isinstance(body, dict):
+            return {"message": "400: Bad Request", "code": 50109}
+        content = body.get("content") or ""
+        embeds = body.get("embeds") or []
+        if not edit and not content and not embeds:
+            return {"message": "Cannot send an empty message", "code": 50006}
+        if len(content) > MAX_CONTENT_LENGTH:
+            return {"message": "Invalid Form Body", "code": 50035}
+        if len(embeds) > MAX_EMBEDS:
+            return {"message": "Invalid Form Body", "code": 50035}
+        return None
+
+    def delivered(self):
+        """Request yang berhasil (2xx) dengan payload, urut waktu selesai"""
+        with self.lock:
+            requests = list(self.requests)
+        return sorted(
+            (r for r in requests if 200 <= r.status < 300 and r.method != "GET"),
+            key=lambda r: r.answered,
+        )
+
+    def status_counts(self):
+        """Jumlah response per status code"""
+        counts = {}
+        with self.lock:
+            for request in self.requests:
+                counts[request.status] = counts.get(request.status, 0) + 1
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Discord webhook server")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+    parser.add_argument("--rate-period", type=float, default=DEFAULT_RATE_PERIOD)
+    args = parser.parse_args()
+
+    server = FakeDiscordServer(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_period=args.rate_period,
+    )
+    print(f"🧪 Fake Discord listening, webhook URL: {server.webhook_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 Responses: {server.status_counts()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Filter Rules
+Keyword, noise patterns dan min length untuk OCRFilter, dibaca dari file JSON
+dan di-compile sekali menjadi object immutable. RulesWatcher me-reload file
+saat berubah dan menukar reference rules secara atomic (tanpa lock), jadi
+capture thread tidak pernah block atau melihat rules setengah ter-update.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+# File rules default (di folder yang sama dengan app)
+RULES_FILE = "filter_rules.json"
+
+# Priority default untuk keyword yang tidak menyebutkan priority
+DEFAULT_PRIORITY = 1
+
+# Rules bawaan, dipakai jika file rules tidak ada atau tidak valid
+DEFAULT_RULES = {
+    "min_length": 10,
+    "keywords": [
+        # Game events
+        "event",
+        "spotted",
+        "manifests",
+        "emerged",
+        "vanished",
+        "begun",
+        "ended",
+        {"keyword": "Aurora Borealis", "priority": 3},
+        {"keyword": "Megalodon", "priority": 4},
+        {"keyword": "Cursed Isle", "priority": 3},
+        {"keyword": "Divine Secret", "priority": 5},
+        "Sunken",
+        "Coral",
+        {"keyword": "Omnithal", "priority": 4},
+        {"keyword": "Awakened Omnithal", "priority": 5},
+        {"keyword": "Kraken", "priority": 4},
+        {"keyword": "Narwhal", "priority": 3},
+        "Statue",
+        "fish",
+        "Forsaken",
+        # Actions
+        {"keyword": "used", "priority": 0},
+        {"keyword": "joined", "priority": 0},
+        {"keyword": "caught", "priority": 0},
+        "Totem",
+    ],
+    "noise_patterns": [
+        r"^[^\w\s]+$",  # Hanya simbol
+        r"^\s*[.]\s*$",  # Hanya dots
+        r"^[a-zA-Z]{1,2}$",  # Single/double char
+        r"^\d+$",  # Hanya angka
+        r"^[@#$%^&*()]+$",  # Hanya special chars
+    ],
+}
+
+
+class FilterRules:
+    """
+    Compiled, immutable filter rules
+
+    Jangan diubah setelah dibuat - untuk mengganti rules, buat object baru
+    (from_dict / from_file / with_keywords) lalu assign ke OCRFilter.rules.
+    """
+
+    __slots__ = (
+        "keywords",
+        "priorities",
+        "noise_patterns",
+        "min_length",
+        "keyword_re",
+        "noise_re",
+        "compile_time",
+    )
+
+    def __init__(self, keywords, noise_patterns, min_length, priorities=None):
+        """
+        Args:
+            keywords (iterable): Important keywords (case-insensitive)
+            noise_patterns (iterable): Regex, text yang match = noise
+            min_length (int): Minimum length untuk dianggap valid
+            priorities (dict): keyword -> priority (default DEFAULT_PRIORITY)
+        """
+        start = time.perf_counter()
+        priorities = priorities or {}
+
+        self.keywords = tuple(keywords)
+        self.noise_patterns = tuple(noise_patterns)
+        self.min_length = int(min_length)
+
+        # Priority per lowercase keyword (ambil yang tertinggi jika dobel)
+        lowered = {}
+        for keyword in self.keywords:
+            priority = priorities.get(keyword, DEFAULT_PRIORITY)
+            key = keyword.lower()
+            lowered[key] = max(priority, lowered.get(key, priority))
+        self.priorities = lowered
+
+        # Semua noise patterns jadi satu alternation
+        self.noise_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.noise_patterns) or r"(?!)"
+        )
+
+        # Keyword lowercase, terpanjang dulu supaya match paling spesifik
+        ordered = sorted(lowered, key=len, reverse=True)
+        if ordered:
+            self.keyword_re = re.compile("|".join(map(re.escape, ordered)))
+        else:
+            self.keyword_re = None
+
+        self.compile_time = time.perf_counter() - start
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build rules dari dict (format sama dengan filter_rules.json)
+
+        Keyword boleh berupa string atau {"keyword": ..., "priority": ...}.
+        Field yang tidak ada diambil dari DEFAULT_RULES.
+        """
+        keywords = []
+        priorities = {}
+        for entry in data.get("keywords", DEFAULT_RULES["keywords"]):
+            if isinstance(entry, dict):
+                keyword = entry["keyword"]
+                priorities[keyword] = int(entry.get("priority", DEFAULT_PRIORITY))
+            else:
+                keyword = entry
+            keywords.append(keyword)
+
+        return cls(
+            keywords,
+            data.get("noise_patterns", DEFAULT_RULES["noise_patterns"]),
+            data.get("min_length", DEFAULT_RULES["min_length"]),
+            priorities,
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """Load dan compile rules dari file JSON"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def default(cls):
+        """Rules bawaan"""
+        return cls.from_dict(DEFAULT_RULES)
+
+    def with_keywords(self, keywords):
+        """Copy rules dengan keyword list baru (priority lama dipertahankan)"""
+        priorities = {
+            keyword: self.priorities.get(keyword.lower(), DEFAULT_PRIORITY)
+            for keyword in keywords
+        }
+        return FilterRules(keywords, self.noise_patterns, self.min_length, priorities)
+
+    def with_min_length(self, min_length):
+        """Copy rules dengan min_length baru"""
+        return FilterRules(
+            self.keywords, self.noise_patterns, min_length, self._priority_map()
+        )
+
+    def with_noise_patterns(self, noise_patterns):
+        """Copy rules dengan noise patterns baru"""
+        return FilterRules(
+            self.keywords, noise_patterns, self.min_length, self._priority_map()
+        )
+
+    def _priority_map(self):
+        """keyword (case asli) -> priority"""
+        return {keyword: self.priorities[keyword.lower()] for keyword in self.keywords}
+
+    def best_keyword(self, text_lower):
+        """
+        Keyword dengan priority tertinggi yang ada di text
+
+        Args:
+            text_lower (str): Text yang sudah di-lowercase
+
+        Returns:
+            tuple or None: (keyword lowercase, priority), None jika tidak ada
+        """
+        if self.keyword_re is None:
+            return None
+
+        best = None
+        for match in self.keyword_re.finditer(text_lower):
+            keyword = match.group()
+            priority = self.priorities[keyword]
+            if best is None or priority > best[1]:
+                best = (keyword, priority)
+        return best
+
+    def keyword_priority(self, text_lower):
+        """
+        Priority tertinggi dari keyword yang ada di text
+
+        Returns:
+            int or None: Priority, None jika tidak ada keyword yang match
+        """
+        best = self.best_keyword(text_lower)
+        return best[1] if best else None
+
+    def summary(self):
+        """Ringkasan singkat untuk log"""
+        return (
+            f"{len(self.priorities)} keywords, "
+            f"{len(self.noise_patterns)} noise patterns, "
+            f"min length {self.min_length}"
+        )
+
+
+def _read_rules_file(path):
+    """Isi file rules (dict), None jika gagal dibaca"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Cannot update filter rules {path}: {e}")
+        return None
+    if not isinstance(data, dict):
+        print(f"⚠️  Cannot update filter rules {path}: not a JSON object")
+        return None
+    return data
+
+
+def _write_rules_file(path, data):
+    """Tulis file rules (atomic: tmp file lalu rename)"""
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️  Cannot update filter rules {path}: {e}")
+        return False
+    return True
+
+
+def edit_keywords(path, add=None, remove=None):
+    """
+    Tambah / hapus satu keyword langsung di file rules (atomic write)
+
+    Keyword lain (termasuk priority-nya) dan field lain tidak berubah.
+
+    Args:
+        path (str): Path file rules
+        add (str): Keyword baru (priority default)
+        remove (str): Keyword yang dihapus (case-insensitive)
+
+    Returns:
+        bool: True jika file berhasil ditulis
+    """
+    data = _read_rules_file(path)
+    if data is None:
+        return False
+    keywords = list(data.get("keywords", DEFAULT_RULES["keywords"]))
+
+    if remove:
+        keywords = [
+            entry
+            for entry in keywords
+            if (entry["keyword"] if isinstance(entry, dict) else entry).lower()
+            != remove.lower()
+        ]
+    if add:
+        keywords.append(add)
+    data["keywords"] = keywords
+    return _write_rules_file(path, data)
+
+
+def edit_rules(path, **fields):
+    """
+    Ganti field rules (misal min_length, noise_patterns) langsung di file
+    rules (atomic write), field lain tidak berubah
+
+    Args:
+        path (str): Path file rules
+        **fields: Field filter_rules.json -> nilai baru
+
+    Returns:
+        bool: True jika file berhasil ditulis
+    """
+    data = _read_rules_file(path)
+    if data is None:
+        return False
+    data.update(fields)
+    return _write_rules_file(path, data)
+
+
+class RulesWatcher:
+    """
+    Hot reload filter rules saat file berubah
+
+    Polling mtime di background thread. Rules baru di-load dan di-compile di
+    thread ini, lalu di-swap dengan satu assignment ke target.rules - capture
+    thread tidak pernah menunggu reload.
+    """
+
+    def __init__(self, target, path=RULES_FILE, interval=2.0):
+        """
+        Args:
+            target: Object dengan attribute `rules` (misal OCRFilter)
+            path (str): Path file rules
+            interval (float): Detik antar pengecekan file
+        """
+        self.target = target
+        self.path = path
+        self.interval = interval
+        self.reload_count = 0
+        self.last_reload_time = None
+        self._last_mtime = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def load(self):
+        """
+        Load rules dari file (jika ada) dan swap ke target
+
+        Returns:
+            bool: True jika rules baru terpasang
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+
+        start = time.perf_counter()
+        try:
+            rules = FilterRules.from_file(self.path)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            # Rules lama tetap dipakai
+            print(f"⚠️  Invalid filter rules in {self.path}: {e}")
+            self._last_mtime = mtime
+            return False
+
+        # Atomic swap - reader selalu melihat rules lama atau baru, utuh
+        self.target.rules = rules
+        self._last_mtime = mtime
+        self.reload_count += 1
+        self.last_reload_time = time.perf_counter() - start
+
+        print(
+            f"🔄 Filter rules loaded from {self.path} in "
+            f"{self.last_reload_time * 1000:.1f} ms ({rules.summary()})"
+        )
+        return True
+
+    def start(self):
+        """Load rules sekarang lalu mulai watch di background"""
+        self.load()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watcher thread"""
+        self._stop_event.set()
+
+    def _watch(self):
+        """Background loop: reload jika mtime berubah"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                continue
+            if mtime != self._last_mtime:
+                self.load()
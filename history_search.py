@@ -0,0 +1,557 @@
+"""
+History Search
+Cari keyword di ocr_output.txt (bisa berbulan-bulan / multi-GB) tanpa grep
+
+- Inverted index (token -> byte offset baris) disimpan di SQLite
+- Incremental: hanya bagian file setelah offset terakhir yang di-index
+- Time range pakai checkpoint waktu yang sparse (offset naik seiring waktu)
+- Hasil dibaca langsung dari log lewat mmap + seek ke offset
+- Segmen rotated (BackgroundFileWriter) ikut di-index, .gz dibaca streaming
+  lewat gzip (offset = offset di data yang sudah di-decompress)
+- Index per segmen disimpan dengan nama segmen (tanpa ".gz"): saat file
+  live di-rotate, index-nya pindah ke segmen baru, tidak di-index ulang
+
+Usage:
+    python history_search.py index ocr_output.txt
+    python history_search.py search megalodon --days 7
+    python history_search.py search "cursed isle" --since 2026-01-01 --until 2026-02-01
+"""
+
+import argparse
+import glob
+import gzip
+import mmap
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+# Index default (di folder yang sama dengan log)
+INDEX_FILE = "history_index.db"
+LOG_FILE = "ocr_output.txt"
+
+# Simpan checkpoint waktu setiap N baris
+CHECKPOINT_EVERY = 256
+
+# Format baris dari OCRFilter.save_output: "[2026-01-31 12:00:00] text"
+LINE_RE = re.compile(rb"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] ?")
+TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+# Jumlah byte awal file untuk deteksi file diganti/di-rotate
+HEAD_BYTES = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    indexed_offset INTEGER NOT NULL DEFAULT 0,
+    head BLOB,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    file_size INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    id INTEGER PRIMARY KEY,
+    token TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (token_id, file_id, offset)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (file_id, offset)
+) WITHOUT ROWID;
+"""
+
+
+def tokenize(text):
+    """Token unik (lowercase, alnum, min 2 char)"""
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+def open_log(path):
+    """Buka log / segmen untuk dibaca (binary), .gz lewat gzip"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def segment_key(path):
+    """Key index untuk file: absolute path tanpa ".gz" (sama sebelum/sesudah gzip)"""
+    path = os.path.abspath(path)
+    return path[: -len(".gz")] if path.endswith(".gz") else path
+
+
+def log_segments(log_path):
+    """
+    Segmen rotated dari log (lama ke baru, lihat BackgroundFileWriter.rotate)
+    lalu file live itu sendiri
+
+    Jika segmen .txt dan .txt.gz ada bersamaan (gzip sedang berjalan), yang
+    .txt yang dipakai.
+    """
+    root, ext = os.path.splitext(log_path)
+    plain = glob.glob(f"{glob.escape(root)}.*{ext}")
+    compressed = [
+        path
+        for path in glob.glob(f"{glob.escape(root)}.*{ext}.gz")
+        if path[: -len(".gz")] not in plain
+    ]
+    segments = sorted(plain + compressed, key=os.path.getmtime)
+    if os.path.exists(log_path):
+        segments.append(log_path)
+    return segments
+
+
+def live_path_for(segment):
+    """
+    File live untuk segmen rotated ("ocr_output.20260101-120000.txt.gz" ->
+    "ocr_output.txt"), None jika bukan nama segmen
+    """
+    if segment.endswith(".gz"):
+        segment = segment[: -len(".gz")]
+    directory, name = os.path.split(segment)
+    root, ext = os.path.splitext(name)
+    base, dot, _ = root.rpartition(".")
+    if not dot or not base:
+        return None
+    return os.path.join(directory, base + ext)
+
+
+def parse_timestamp(line):
+    """
+    Timestamp epoch dari satu baris log (bytes)
+
+    Returns:
+        float or None: None jika baris tidak punya timestamp
+    """
+    match = LINE_RE.match(line)
+    if not match:
+        return None
+    return datetime.fromisoformat(match.group(1).decode()).timestamp()
+
+
+class HistoryIndex:
+    """Inverted index incremental untuk satu atau lebih file log"""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(files)")]
+        if "file_size" not in columns:
+            # Index dari versi sebelum segmen .gz di-index
+            self.conn.execute(
+                "ALTER TABLE files ADD COLUMN file_size INTEGER NOT NULL DEFAULT 0"
+            )
+            self.conn.commit()
+
+        # token -> id (postings simpan integer, jauh lebih kecil dari text)
+        self._token_ids = dict(
+            (token, token_id)
+            for token_id, token in self.conn.execute("SELECT id, token FROM tokens")
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def _file_row(self, log_path):
+        """
+        (id, indexed_offset, head, line_count, file_size) untuk log, buat
+        jika belum ada
+        """
+        key = segment_key(log_path)
+        row = self.conn.execute(
+            "SELECT id, indexed_offset, head, line_count, file_size FROM files "
+            "WHERE path = ?",
+            (key,),
+        ).fetchone()
+        if row:
+            return row
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO files (path) VALUES (?)", (key,))
+        return cursor.lastrowid, 0, None, 0, 0
+
+    def _adopt_rotated(self, log_path):
+        """
+        File live di-rotate: cari segmen rotated baru (belum punya index)
+        yang index-nya bisa diambil dari file live
+
+        Returns:
+            bool: True jika index file live pindah ke segmen
+        """
+        for segment in reversed(log_segments(log_path)[:-1]):
+            if self.conn.execute(
+                "SELECT 1 FROM files WHERE path = ?", (segment_key(segment),)
+            ).fetchone():
+                continue
+            if self._adopt_live(segment):
+                self.update(segment)
+                return True
+        return False
+
+    def _adopt_live(self, segment):
+        """
+        Segmen baru yang awalnya sama dengan file live yang sudah di-index:
+        pindahkan index file live ke segmen (sisa baris di-index berikutnya)
+
+        Returns:
+            bool: True jika index dipindah
+        """
+        live = live_path_for(segment)
+        if live is None:
+            return False
+        row = self.conn.execute(
+            "SELECT id, head FROM files WHERE path = ?", (segment_key(live),)
+        ).fetchone()
+        if not row or not row[1]:
+            return False
+        try:
+            with open_log(segment) as f:
+                if not f.read(HEAD_BYTES).startswith(row[1]):
+                    return False
+        except (OSError, EOFError):
+            return False
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE files SET path = ? WHERE id = ?", (segment_key(segment), row[0])
+            )
+        print(f"📦 {live} rotated to {segment}, index kept")
+        return True
+
+    def prune_missing(self):
+        """Hapus index segmen yang sudah dihapus (backup_count writer)"""
+        rows = self.conn.execute("SELECT id, path FROM files").fetchall()
+        for file_id, path in rows:
+            if os.path.exists(path) or os.path.exists(path + ".gz"):
+                continue
+            self._reset_file(file_id)
+            with self.conn:
+                self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _reset_file(self, file_id):
+        """Hapus index lama untuk file (file di-truncate / diganti)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+            self.conn.execute("DELETE FROM checkpoints WHERE file_id = ?", (file_id,))
+            self.conn.execute(
+                "UPDATE files SET indexed_offset = 0, head = NULL, line_count = 0, "
+                "file_size = 0 WHERE id = ?",
+                (file_id,),
+            )
+
+    def update(self, log_path, batch_lines=50000):
+        """
+        Index bagian log yang belum ter-index
+
+        Args:
+            log_path (str): File log atau segmen rotated (boleh .gz)
+            batch_lines (int): Commit setiap N baris
+
+        Returns:
+            int: Jumlah baris baru yang di-index
+        """
+        key = segment_key(log_path)
+        if not self.conn.execute(
+            "SELECT 1 FROM files WHERE path = ?", (key,)
+        ).fetchone():
+            # Segmen baru hasil rotate: pakai index file live jika sama
+            self._adopt_live(log_path)
+
+        file_id, offset, head, line_count, file_size = self._file_row(log_path)
+        size = os.path.getsize(log_path)
+        compressed = log_path.endswith(".gz")
+
+        # Segmen .gz tidak berubah lagi setelah di-rotate
+        if compressed and size == file_size:
+            return 0
+
+        with open_log(log_path) as f:
+            current_head = f.read(HEAD_BYTES)
+
+            # File lebih kecil atau awal file berubah: di-rotate (index pindah
+            # ke segmen) atau diganti (index ulang dari 0)
+            changed = head and not current_head.startswith(head)
+            if changed or (not compressed and size < offset):
+                if not compressed and head and self._adopt_rotated(log_path):
+                    return self.update(log_path, batch_lines)
+                print(f"🔄 {log_path} changed, re-indexing")
+                self._reset_file(file_id)
+                offset, line_count = 0, 0
+
+            if not compressed and offset >= size:
+                return 0
+
+            # gzip: seek = decompress sampai offset (hanya sekali per segmen)
+            f.seek(offset)
+            postings = []
+            checkpoints = []
+            new_lines = 0
+
+            for line in f:
+                # Baris terakhir belum lengkap -> tunggu run berikutnya
+                if not line.endswith(b"\n"):
+                    break
+
+                if line_count % CHECKPOINT_EVERY == 0:
+                    timestamp = parse_timestamp(line)
+                    if timestamp is not None:
+                        checkpoints.append((file_id, offset, timestamp))
+
+                text = line.decode("utf-8", "replace")
+                match = LINE_RE.match(line)
+                if match:
+                    text = text[match.end() :]
+                postings.extend(
+                    (self._token_id(token), file_id, offset) for token in tokenize(text)
+                )
+
+                offset += len(line)
+                line_count += 1
+                new_lines += 1
+
+                if new_lines % batch_lines == 0:
+                    self._commit(file_id, postings, checkpoints, offset, line_count)
+                    postings, checkpoints = [], []
+
+            self._commit(file_id, postings, checkpoints, offset, line_count)
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE files SET head = ?, file_size = ? WHERE id = ?",
+                (current_head[:HEAD_BYTES], size, file_id),
+            )
+        return new_lines
+
+    def _token_id(self, token):
+        """Id untuk token, insert ke tabel tokens jika baru"""
+        try:
+            return self._token_ids[token]
+        except KeyError:
+            cursor = self.conn.execute(
+                "INSERT INTO tokens (token) VALUES (?)", (token,)
+            )
+            self._token_ids[token] = cursor.lastrowid
+            return cursor.lastrowid
+
+    def _commit(self, file_id, postings, checkpoints, offset, line_count):
+        """Tulis satu batch postings + posisi terakhir dalam satu transaction"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO postings VALUES (?, ?, ?)", postings
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO checkpoints VALUES (?, ?, ?)", checkpoints
+            )
+            self.conn.execute(
+                "UPDATE files SET indexed_offset = ?, line_count = ? WHERE id = ?",
+                (offset, line_count, file_id),
+            )
+
+    def _offset_range(self, file_id, since, until):
+        """Byte range [start, end) yang mungkin berisi baris di time range"""
+        start, end = 0, None
+        if since is not None:
+            row = self.conn.execute(
+                "SELECT MAX(offset) FROM checkpoints WHERE file_id = ? AND ts < ?",
+                (file_id, since),
+            ).fetchone()
+            start = row[0] or 0
+        if until is not None:
+            row = self.conn.execute(
+                "SELECT MIN(offset) FROM checkpoints WHERE file_id = ? AND ts >= ?",
+                (file_id, until),
+            ).fetchone()
+            end = row[0]
+        return start, end
+
+    def search(self, log_path, query, since=None, until=None, limit=None):
+        """
+        Cari baris yang mengandung semua token di query (AND)
+
+        Args:
+            log_path (str): File log / segmen (harus sudah di-index)
+            query (str): Keyword/frase
+            since (float): Epoch seconds (inclusive)
+            until (float): Epoch seconds (exclusive)
+            limit (int): Maksimal hasil (terbaru dulu)
+
+        Returns:
+            list: (timestamp, line text) urut dari terbaru
+        """
+        file_id, indexed_offset, _, _, _ = self._file_row(log_path)
+        start, end = self._offset_range(file_id, since, until)
+        if end is None:
+            end = indexed_offset
+
+        tokens = tokenize(query)
+        if tokens:
+            token_ids = [self._token_ids.get(token) for token in tokens]
+            if None in token_ids:
+                return []
+            offsets = self._matching_offsets(file_id, token_ids, start, end)
+        else:
+            offsets = None
+
+        if log_path.endswith(".gz"):
+            # Segmen rotated (<= max_bytes writer) di-decompress sekali ke
+            # memory, bytes punya find/rfind/slice yang sama dengan mmap
+            with gzip.open(log_path, "rb") as f:
+                return self._read_results(
+                    f.read(), offsets, start, end, since, until, limit
+                )
+
+        with open(log_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._read_results(mm, offsets, start, end, since, until, limit)
+
+    def _read_results(self, data, offsets, start, end, since, until, limit):
+        """Baca baris di offsets (None = semua baris di range) dari data log"""
+        if offsets is None:
+            offsets = self._line_offsets_reversed(data, start, end)
+
+        results = []
+        for offset in offsets:
+            newline = data.find(b"\n", offset)
+            line = data[offset : newline if newline >= 0 else len(data)]
+
+            timestamp = parse_timestamp(line)
+            if since is not None and (timestamp is None or timestamp < since):
+                continue
+            if until is not None and (timestamp is None or timestamp >= until):
+                continue
+
+            results.append((timestamp, line.decode("utf-8", "replace")))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def _matching_offsets(self, file_id, token_ids, start, end):
+        """
+        Generator offset baris (terbaru dulu) yang berisi semua token
+
+        Postings token paling jarang di-stream dari belakang, token lain
+        dicek per offset lewat primary key lookup, jadi hasil pertama
+        langsung keluar tanpa load seluruh postings token yang umum.
+        """
+        counts = sorted(
+            (
+                self.conn.execute(
+                    "SELECT COUNT(*) FROM postings WHERE token_id = ? "
+                    "AND file_id = ? AND offset >= ? AND offset < ?",
+                    (token_id, file_id, start, end),
+                ).fetchone()[0],
+                token_id,
+            )
+            for token_id in token_ids
+        )
+        rarest = counts[0][1]
+        others = [token_id for _, token_id in counts[1:]]
+
+        rows = self.conn.execute(
+            "SELECT offset FROM postings WHERE token_id = ? AND file_id = ? "
+            "AND offset >= ? AND offset < ? ORDER BY offset DESC",
+            (rarest, file_id, start, end),
+        )
+        for (offset,) in rows:
+            if all(
+                self.conn.execute(
+                    "SELECT 1 FROM postings WHERE token_id = ? AND file_id = ? "
+                    "AND offset = ?",
+                    (token_id, file_id, offset),
+                ).fetchone()
+                for token_id in others
+            ):
+                yield offset
+
+    @staticmethod
+    def _line_offsets_reversed(mm, start, end):
+        """Generator offset awal baris di [start, end), dari belakang"""
+        position = end - 1
+        while position > start:
+            newline = mm.rfind(b"\n", start, position)
+            yield newline + 1 if newline >= 0 else start
+            if newline < 0:
+                return
+            position = newline
+        if position == start and end > start:
+            yield start
+
+
+def parse_date(value):
+    """'2026-01-31' atau '2026-01-31 12:00:00' -> epoch seconds"""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search OCR output history")
+    parser.add_argument("--index", default=INDEX_FILE, help="Index database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = sub.add_parser("index", help="(Re)index log files")
+    index_parser.add_argument(
+        "logs", nargs="*", help="Default: ocr_output.txt + rotated segments"
+    )
+
+    search_parser = sub.add_parser("search", help="Search indexed logs")
+    search_parser.add_argument("query", nargs="*", help="Keywords (AND)")
+    search_parser.add_argument("--log", action="append", dest="logs")
+    search_parser.add_argument("--days", type=float, help="Only last N days")
+    search_parser.add_argument("--since", type=parse_date)
+    search_parser.add_argument("--until", type=parse_date)
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument(
+        "--no-update", action="store_true", help="Skip incremental index update"
+    )
+
+    args = parser.parse_args()
+    index = HistoryIndex(args.index)
+
+    try:
+        index.prune_missing()
+        if args.command == "index":
+            # File live dulu: jika baru di-rotate, index-nya pindah ke segmen
+            # sebelum segmen itu di-index dari awal
+            for log in reversed(args.logs or log_segments(LOG_FILE)):
+                start = time.perf_counter()
+                count = index.update(log)
+                elapsed = time.perf_counter() - start
+                print(f"✅ {log}: {count} new lines indexed in {elapsed:.2f} s")
+            return
+
+        logs = args.logs or log_segments(LOG_FILE)
+        since = args.since
+        if args.days:
+            since = time.time() - args.days * 86400
+
+        start = time.perf_counter()
+        if not args.no_update:
+            for log in reversed(logs):
+                index.update(log)
+        results = []
+        for log in logs:
+            results.extend(
+                index.search(log, " ".join(args.query), since, args.until, args.limit)
+            )
+        elapsed = time.perf_counter() - start
+
+        results.sort(key=lambda result: result[0] or 0, reverse=True)
+        for _, line in results[: args.limit]:
+            print(line)
+        print(f"\n{min(len(results), args.limit)} results in {elapsed * 1000:.1f} ms")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Latency Tracer
+Ukur latency end-to-end dari screen capture sampai Discord membalas 2xx,
+dipecah per stage, supaya kelihatan di mana waktu habis saat load tinggi.
+
+Setiap frame dapat FrameTrace (frame id + waktu capture) yang ikut dibawa
+dari OCR loop sampai ke DiscordWebhook. Setiap stage memanggil
+trace.mark(stage): durasi = waktu sejak mark sebelumnya.
+
+Stage:
+- capture:   ImageGrab.grab
+- ocr:       template / background / localize / tesseract
+- stabilize: TextStabilizer (atau change detection)
+- filter:    lexicon corrector + OCRFilter + event extraction
+- queue:     menunggu di queue webhook + coalesce window
+- send:      HTTP request sampai 2xx (termasuk menunggu rate limit)
+- total:     capture sampai 2xx (hanya frame yang terkirim ke Discord)
+
+Frame yang dikirim ke beberapa webhook (routing) dihitung sekali: stage
+queue/send dicatat dari destination pertama. Message yang di-retry dari
+outbox tidak di-trace.
+
+Quantile pakai QuantileSketch (event_analytics), memory konstan.
+
+Usage (CLI):
+    python latency_tracer.py  # tampilkan latency_report.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from event_analytics import QuantileSketch
+
+# File report default (di folder yang sama dengan app)
+LATENCY_FILE = "latency_report.json"
+
+STAGES = ("capture", "ocr", "stabilize", "filter", "queue", "send", "total")
+
+# Percentile di report
+PERCENTILES = (50, 95, 99)
+
+
+class FrameTrace:
+    """Timestamp satu frame dari capture sampai Discord"""
+
+    __slots__ = ("tracer", "frame_id", "captured_at", "started", "last", "stages")
+
+    def __init__(self, tracer, frame_id):
+        self.tracer = tracer
+        self.frame_id = frame_id
+        self.captured_at = time.time()
+        self.started = time.perf_counter()
+        self.last = self.started
+        # stage -> detik
+        self.stages = {}
+
+    def mark(self, stage):
+        """Stage selesai: catat durasi sejak mark sebelumnya"""
+        self.tracer.mark(self, stage)
+
+    def finish(self):
+        """Discord sudah ack: catat total latency frame ini"""
+        self.tracer.mark(self, "total", since_start=True)
+
+
+class LatencyTracer:
+    """Aggregate latency per stage (thread-safe: OCR loop + delivery engine)"""
+
+    def __init__(self, path=LATENCY_FILE, keep_recent=100):
+        """
+        Args:
+            path (str): File JSON untuk dump report
+            keep_recent (int): Jumlah frame terakhir yang disimpan detailnya
+                (untuk daftar frame paling lambat)
+        """
+        self.path = path
+        self.frames = 0
+        self.sketches = {
+            stage: QuantileSketch(alpha=0.01, max_buckets=500, min_value=0.01)
+            for stage in STAGES
+        }
+        self.max_ms = dict.fromkeys(STAGES, 0.0)
+        self.recent = deque(maxlen=keep_recent)
+
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def new_frame(self):
+        """FrameTrace baru, dipanggil tepat sebelum capture"""
+        with self._lock:
+            self.frames += 1
+        return FrameTrace(self, next(self._ids))
+
+    def mark(self, trace, stage, since_start=False):
+        """
+        Catat durasi stage untuk trace (stage yang sama hanya sekali)
+
+        Args:
+            trace (FrameTrace): Frame
+            stage (str): Nama stage (lihat STAGES)
+            since_start (bool): Durasi dari capture, bukan dari mark terakhir
+        """
+        now = time.perf_counter()
+        with self._lock:
+            if stage in trace.stages:
+                return
+            seconds = now - (trace.started if since_start else trace.last)
+            trace.last = now
+            trace.stages[stage] = seconds
+
+            ms = seconds * 1000
+            self.sketches[stage].add(ms)
+            self.max_ms[stage] = max(self.max_ms[stage], ms)
+            if stage == "total":
+                self.recent.append(trace)
+
+    def snapshot(self):
+        """Percentile per stage (ms): {stage: {count, p50, p95, p99, max}}"""
+        with self._lock:
+            snapshot = {}
+            for stage in STAGES:
+                sketch = self.sketches[stage]
+                summary = {"count": sketch.count}
+                for pct in PERCENTILES:
+                    value = sketch.quantile(pct / 100)
+                    if value is not None:
+                        # Titik tengah bucket bisa sedikit di atas max asli
+                        value = round(min(value, self.max_ms[stage]), 2)
+                    summary[f"p{pct}"] = value
+                summary["max"] = round(self.max_ms[stage], 2) if sketch.count else None
+                snapshot[stage] = summary
+            return snapshot
+
+    def slowest(self, n=10):
+        """Detail frame terkirim paling lambat dari keep_recent terakhir"""
+        with self._lock:
+            traces = sorted(self.recent, key=lambda t: t.stages["total"], reverse=True)
+            return [
+                {
+                    "frame_id": trace.frame_id,
+                    "captured_at": trace.captured_at,
+                    "stages_ms": {
+                        stage: round(seconds * 1000, 2)
+                        for stage, seconds in trace.stages.items()
+                    },
+                }
+                for trace in traces[:n]
+            ]
+
+    def to_dict(self):
+        return {
+            "generated_at": time.time(),
+            "frames": self.frames,
+            "stages_ms": self.snapshot(),
+            "slowest": self.slowest(),
+        }
+
+    def dump(self, path=None):
+        """
+        Tulis report JSON (atomic: tmp file lalu rename)
+
+        Returns:
+            str or None: Path file, None jika gagal
+        """
+        path = path or self.path
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Error saving latency report: {e}")
+            return None
+        return path
+
+    def close(self):
+        """Dump terakhir (hanya jika ada frame yang di-trace)"""
+        if self.frames:
+            self.dump()
+
+    def report(self):
+        """Tabel ringkas (untuk terminal / GUI)"""
+        return format_report(self.snapshot(), self.frames)
+
+
+def format_ms(value):
+    """ms -> '12.3' / '1.25s', '-' jika belum ada data"""
+    if value is None:
+        return "-"
+    if value >= 1000:
+        return f"{value / 1000:.2f}s"
+    return f"{value:.1f}"
+
+
+def format_report(snapshot, frames=None):
+    """Format snapshot LatencyTracer menjadi tabel text"""
+    if not any(summary["count"] for summary in snapshot.values()):
+        return "⏱ No latency data yet"
+
+    title = "⏱ Latency per stage (ms)"
+    if frames is not None:
+        title += f", {frames} frames"
+    lines = [
+        title,
+        f"{'stage':<10} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}",
+    ]
+    for stage in STAGES:
+        summary = snapshot.get(stage)
+        if not summary:
+            continue
+        lines.append(
+            f"{stage:<10} {summary['count']:>7} "
+            f"{format_ms(summary['p50']):>8} {format_ms(summary['p95']):>8} "
+            f"{format_ms(summary['p99']):>8} {format_ms(summary['max']):>8}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show latency report")
+    parser.add_argument("--file", default=LATENCY_FILE, help="Latency JSON file")
+    args = parser.parse_args()
+
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read {args.file}: {e}")
+        return
+
+    generated = datetime.fromtimestamp(data["generated_at"])
+    print(f"Generated: {generated:%Y-%m-%d %H:%M:%S}")
+    print(format_report(data["stages_ms"], data.get("frames")))
+
+    if data.get("slowest"):
+        print("\n🐢 Slowest recent frames")
+        for frame in data["slowest"]:
+            stages = ", ".join(
+                f"{stage} {format_ms(ms)}"
+                for stage, ms in frame["stages_ms"].items()
+                if stage != "total"
+            )
+            total = format_ms(frame["stages_ms"]["total"])
+            print(f"#{frame['frame_id']:<6} total {total:>8}  ({stages})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Lexicon Corrector
+Koreksi typo OCR ("Megalocdon" -> "Megalodon", "Aetherfn" -> "Aetherfin")
+dengan mencocokkan token ke lexicon game sebelum filter & event extraction
+
+Kandidat dicari lewat index delete-variants yang di-precompute (symmetric
+delete), jadi token yang sudah benar cukup satu hash lookup, dan token yang
+salah hanya butuh beberapa lookup tanpa scan seluruh lexicon.
+
+Koreksi sengaja konservatif (salah snap = keyword palsu yang lolos filter):
+- hanya token >= 7 huruf, edit distance maksimal 1
+- kata Inggris umum (COMMON_WORDS) tidak pernah dikoreksi
+- bentuk jamak / inflection kata lexicon ("Totems", "emerges") dibiarkan
+- casing token asli dipertahankan
+"""
+
+import os
+import re
+from collections import Counter
+from itertools import combinations
+
+# Word list tambahan (satu kata per baris, "#" = komentar)
+LEXICON_FILE = "game_lexicon.txt"
+
+# Token yang dicek: huruf saja (angka & simbol dibiarkan)
+TOKEN_RE = re.compile(r"[A-Za-z]+")
+
+# Kata Inggris umum yang mirip kata lexicon / keyword: tidak dikoreksi
+COMMON_WORDS = frozenset("""
+    about above across action actually address after again against almost
+    already although always another anyone anything around because become
+    before begin beginning behind being believe between beyond captain
+    capture caught certain chance change channel chapter collect coming
+    command company complete contact content control correct could country
+    course create current default different discord during emerge emerges
+    enough entered event events every everyone example explore fishing
+    follow forward friend friends further general getting giving golden
+    ground happen happened having history however important including
+    instead island islands itself joined joiner joining killed leaving
+    letter little message minute minutes moment morning nothing number
+    others outside people perhaps person player players playing
+    possible present problem question quickly rather really reason reward
+    rewards second seconds server servers session several should shoulder
+    simple something special started starting station status statues
+    stopped spotter spotters strange street sudden summer system through
+    together tonight totally trading trouble unknown waiting weather
+    whatever whether without working worried
+    """.split())
+
+# Suffix inflection (jamak / tense), terpanjang dulu
+INFLECTION_SUFFIXES = ("ing", "ers", "ies", "ed", "er", "es", "s", "d")
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Levenshtein distance dengan early exit
+
+    Returns:
+        int: Distance, atau max_distance + 1 jika melebihi batas
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class LexiconCorrector:
+    """Snap token OCR ke kata terdekat di lexicon game"""
+
+    def __init__(
+        self, words=(), min_token_length=7, max_distance=1, common_words=COMMON_WORDS
+    ):
+        """
+        Args:
+            words (iterable): Kata lexicon
+            min_token_length (int): Token lebih pendek tidak dikoreksi
+                (kata pendek terlalu mudah salah snap ke kata lain)
+            max_distance (int): Edit distance maksimal token -> kata lexicon
+            common_words (iterable): Kata (lowercase) yang tidak pernah
+                dikoreksi
+        """
+        self.min_token_length = min_token_length
+        self.max_distance = max_distance
+        self.common_words = frozenset(common_words)
+
+        # lowercase -> bentuk canonical
+        self.lexicon = {}
+        # delete-variant -> set of lowercase lexicon words
+        self._deletes = {}
+
+        # Cache hasil lookup token yang tidak dikenal (lowercase -> kata/None)
+        self._lookup_cache = {}
+        self.cache_size = 10000
+
+        # Statistik per session
+        self.corrections = Counter()
+        self.tokens_checked = 0
+
+        self.add_words(words)
+
+    @classmethod
+    def from_keywords(cls, keywords, wordlist_file=LEXICON_FILE, **kwargs):
+        """
+        Build lexicon dari important keywords + word list file (jika ada)
+
+        Keyword multi-kata ("Aurora Borealis") dipecah per kata.
+        """
+        corrector = cls(**kwargs)
+        for keyword in keywords:
+            corrector.add_words(TOKEN_RE.findall(keyword))
+        if wordlist_file and os.path.exists(wordlist_file):
+            corrector.load_wordlist(wordlist_file)
+        return corrector
+
+    @staticmethod
+    def stem(word):
+        """Buang suffix inflection ("totems" -> "totem", "isles" -> "isl")"""
+        for suffix in INFLECTION_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[: -len(suffix)]
+                break
+        # "isle" dan "isl(es)" jadi stem yang sama
+        return word.rstrip("e")
+
+    @staticmethod
+    def match_case(token, word):
+        """Tulis word dengan casing token asli (UPPER, lower, Capitalized)"""
+        if token.isupper() and len(token) > 1:
+            return word.upper()
+        if token.islower():
+            return word.lower()
+        if token[0].isupper():
+            return word[0].upper() + word[1:]
+        return word
+
+    def add_words(self, words):
+        """Tambah kata ke lexicon dan update index kandidat"""
+        for word in words:
+            lower = word.lower()
+            if lower in self.lexicon:
+                continue
+            self.lexicon[lower] = word
+            self._lookup_cache.clear()
+            for variant in self._delete_variants(lower, self.max_distance):
+                self._deletes.setdefault(variant, set()).add(lower)
+
+    def load_wordlist(self, path):
+        """Load word list file (satu kata per baris)"""
+        words = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        words.extend(TOKEN_RE.findall(line))
+        except OSError as e:
+            print(f"⚠️  Error loading lexicon {path}: {e}")
+            return
+
+        self.add_words(words)
+        print(f"✅ Lexicon loaded: {len(self.lexicon)} words")
+
+    @staticmethod
+    def _delete_variants(word, max_distance):
+        """Semua string hasil menghapus 0..max_distance karakter dari word"""
+        variants = {word}
+        for count in range(1, min(max_distance, len(word) - 1) + 1):
+            for positions in combinations(range(len(word)), count):
+                variants.add(
+                    "".join(c for i, c in enumerate(word) if i not in positions)
+                )
+        return variants
+
+    def lookup(self, token):
+        """
+        Cari kata lexicon terdekat untuk token
+
+        Returns:
+            str or None: Bentuk canonical, None jika tidak ada kandidat
+                (atau token hanya inflection dari kandidat)
+        """
+        lower = token.lower()
+        max_distance = self.max_distance
+
+        candidates = set()
+        for variant in self._delete_variants(lower, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        best = None
+        best_distance = max_distance + 1
+        for candidate in sorted(candidates):
+            distance = edit_distance(lower, candidate, max_distance)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+
+        if best is None:
+            return None
+        # Jamak / tense lain dari kata lexicon bukan typo ("joiner", "Isles")
+        if self.stem(lower) == self.stem(best):
+            return None
+        return self.lexicon[best]
+
+    def _replace_token(self, match):
+        """re.sub callback: koreksi satu token"""
+        token = match.group()
+        self.tokens_checked += 1
+
+        # Fast path: kata sudah dikenal / terlalu pendek / kata umum
+        lower = token.lower()
+        if (
+            len(token) < self.min_token_length
+            or lower in self.lexicon
+            or lower in self.common_words
+        ):
+            return token
+
+        # Token tidak dikenal yang sama (nama player, kata biasa) sering
+        # muncul berulang, jadi hasil lookup di-cache
+        try:
+            corrected = self._lookup_cache[lower]
+        except KeyError:
+            if len(self._lookup_cache) >= self.cache_size:
+                self._lookup_cache.clear()
+            corrected = self._lookup_cache[lower] = self.lookup(token)
+
+        if corrected is None:
+            return token
+
+        corrected = self.match_case(token, corrected)
+        self.corrections[(token, corrected)] += 1
+        return corrected
+
+    def correct(self, text):
+        """
+        Koreksi semua token di text yang tidak ada di lexicon
+
+        Args:
+            text (str): Raw OCR text (boleh multi-line)
+
+        Returns:
+            str: Text dengan token yang sudah dikoreksi
+        """
+        if not self.lexicon:
+            return text
+        return TOKEN_RE.sub(self._replace_token, text)
+
+    def report(self, top=10):
+        """Ringkasan koreksi session ini (untuk tuning lexicon)"""
+        total = sum(self.corrections.values())
+        lines = [
+            f"📖 Lexicon corrections: {total} "
+            f"({len(self.corrections)} unique, {self.tokens_checked} tokens checked)"
+        ]
+        for (token, corrected), count in self.corrections.most_common(top):
+            lines.append(f"   {token} → {corrected} ×{count}")
+        return "\n".join(lines)
+
+    def reset_stats(self):
+        """Reset statistik session"""
+        self.corrections.clear()
+        self.tokens_checked = 0
+
+
+# Example usage
+if __name__ == "__main__":
+    from filter_rules import FilterRules
+
+    corrector = LexiconCorrector.from_keywords(FilterRules.default().keywords)
+    corrector.add_words(["Aetherfin", "Ancient", "Sundial"])
+
+    test_texts = [
+        "A Megalocdon has been spotted past Ancient Isle!",
+        "Divine Secret 1/1000 Aetherfn!",
+        "The Cursed Isle emerges, Totems and Isles appear",
+        "Shiro used a Sundial Totem to speed up the celestial cycle.",
+    ]
+
+    for text in test_texts:
+        print(f"Input:  {text}")
+        print(f"Output: {corrector.correct(text)}")
+        print()
+
+    print(corrector.report())
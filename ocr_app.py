@@ -4,7 +4,6 @@ Captures a customizable screen area and performs OCR in real-time.
 Works on Windows!
 """
 
-import asyncio
 import json
 import os
 import sys
@@ -26,6 +25,7 @@ CONFIG_FILE = "ocr_config.json"
 # Import Discord bot (akan gagal secara graceful jika discord.py belum terinstall)
 try:
     # from discord_bot import DiscordOCRBot     # Bot Version
+    from delivery_engine import get_engine
     from discord_webhook import DiscordOCRBot  # Webhook Version
 
     DISCORD_AVAILABLE = True
@@ -485,20 +485,20 @@ class OCRApp:
         # Create Discord bot dari discord_bot.py
         self.discord_bot = DiscordOCRBot(token, channel_id)
 
-        # Start bot in background thread
-        def start_bot_thread():
-            try:
-                asyncio.run(self.discord_bot.start_bot())
-            except Exception as e:
-                print(f"❌ Error starting Discord bot: {e}")
-                self.root.after(
-                    0,
-                    lambda: self.discord_status.config(
-                        text="Discord: Connection Failed", foreground="red"
-                    ),
-                )
+        # Start bot di event loop DeliveryEngine (shared dengan pengiriman,
+        # tidak perlu thread + asyncio.run sendiri)
+        def on_bot_done(future):
+            if future.cancelled() or future.exception() is None:
+                return
+            print(f"❌ Error starting Discord bot: {future.exception()}")
+            self.root.after(
+                0,
+                lambda: self.discord_status.config(
+                    text="Discord: Connection Failed", foreground="red"
+                ),
+            )
 
-        threading.Thread(target=start_bot_thread, daemon=True).start()
+        get_engine().submit(self.discord_bot.start_bot()).add_done_callback(on_bot_done)
 
         # Wait a bit and check status
         self.root.after(3000, self.check_discord_status)
@@ -577,10 +577,7 @@ class OCRApp:
         # Stop Discord bot if running
         if self.discord_bot:
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(self.discord_bot.stop_bot())
-                loop.close()
+                get_engine().submit(self.discord_bot.stop_bot()).result(10)
             except Exception as e:
                 print(f"⚠️ Error stopping Discord bot: {e}")
 
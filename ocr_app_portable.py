@@ -4,7 +4,6 @@ Captures a customizable screen area and performs OCR in real-time.
 Works on Windows - No Tesseract installation required!
 """
 
-import asyncio
 import json
 import os
 import sys
@@ -14,10 +13,11 @@ import tkinter as tk
 from tkinter import ttk
 
 import pytesseract
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
 
 # Import OCR Filter
 try:
+    from filter_rules import DEFAULT_PRIORITY
     from ocr_filter import OCRFilter
 
     FILTER_AVAILABLE = True
@@ -26,6 +26,114 @@ except ImportError:
     print("ℹ️  ocr_filter.py not found, filtering disabled")
 
 
+# Import Lexicon Corrector
+try:
+    from lexicon_corrector import LexiconCorrector
+
+    CORRECTOR_AVAILABLE = True
+except ImportError:
+    CORRECTOR_AVAILABLE = False
+    print("ℹ️  lexicon_corrector.py not found, OCR correction disabled")
+
+
+# Import Event Extractor
+try:
+    from event_extractor import EventExtractor
+
+    EXTRACTOR_AVAILABLE = True
+except ImportError:
+    EXTRACTOR_AVAILABLE = False
+    print("ℹ️  event_extractor.py not found, event extraction disabled")
+
+
+# Import Event Store (SQLite history)
+try:
+    from event_store import EventStore
+
+    EVENT_STORE_AVAILABLE = True
+except ImportError:
+    EVENT_STORE_AVAILABLE = False
+    print("ℹ️  event_store.py not found, event history disabled")
+
+
+# Import Event Analytics (statistik per keyword)
+try:
+    from event_analytics import EventAnalytics
+
+    ANALYTICS_AVAILABLE = True
+except ImportError:
+    ANALYTICS_AVAILABLE = False
+    print("ℹ️  event_analytics.py not found, event stats disabled")
+
+
+# Import Capture Scheduler (predictive capture interval)
+try:
+    from capture_scheduler import SCHEDULE_PREDICTIVE, CaptureScheduler
+
+    SCHEDULER_AVAILABLE = True
+except ImportError:
+    SCHEDULER_AVAILABLE = False
+    SCHEDULE_PREDICTIVE = "predictive"
+    print("ℹ️  capture_scheduler.py not found, predictive schedule disabled")
+
+
+# Import CPU Governor (CPU budget untuk capture + OCR)
+try:
+    from cpu_governor import CPUGovernor
+
+    GOVERNOR_AVAILABLE = True
+except ImportError:
+    GOVERNOR_AVAILABLE = False
+    print("ℹ️  cpu_governor.py not found, CPU budget disabled")
+
+
+# Import Text Stabilizer (majority vote antar frame)
+try:
+    from text_stabilizer import TextStabilizer
+
+    STABILIZER_AVAILABLE = True
+except ImportError:
+    STABILIZER_AVAILABLE = False
+    print("ℹ️  text_stabilizer.py not found, using simple change detection")
+
+
+# Import Background Suppressor (butuh numpy)
+try:
+    from background_suppressor import NUMPY_AVAILABLE as BACKGROUND_AVAILABLE
+    from background_suppressor import BackgroundSuppressor
+except ImportError:
+    BACKGROUND_AVAILABLE = False
+    print("ℹ️  background_suppressor.py not found, background suppression disabled")
+
+
+# Import Text Localizer (crop ke area text sebelum OCR, butuh numpy)
+try:
+    from text_localizer import NUMPY_AVAILABLE as LOCALIZER_AVAILABLE
+    from text_localizer import TextLocalizer
+except ImportError:
+    LOCALIZER_AVAILABLE = False
+    print("ℹ️  text_localizer.py not found, text localization disabled")
+
+
+# Import Banner Templates (banner dikenal tanpa tesseract, butuh numpy)
+try:
+    from banner_templates import NUMPY_AVAILABLE as TEMPLATES_AVAILABLE
+    from banner_templates import BannerTemplates, mask_boxes
+except ImportError:
+    TEMPLATES_AVAILABLE = False
+    print("ℹ️  banner_templates.py not found, banner fast path disabled")
+
+
+# Import Latency Tracer (latency per stage dari capture sampai Discord)
+try:
+    from latency_tracer import LatencyTracer
+
+    LATENCY_AVAILABLE = True
+except ImportError:
+    LATENCY_AVAILABLE = False
+    print("ℹ️  latency_tracer.py not found, latency tracing disabled")
+
+
 # Auto-detect Tesseract path (portable or installed)
 def get_tesseract_path():
     """Auto-detect Tesseract executable path"""
@@ -64,8 +172,12 @@ pytesseract.pytesseract.tesseract_cmd = get_tesseract_path()
 # Config file untuk menyimpan Discord settings
 CONFIG_FILE = "ocr_config.json"
 
+# Detik menunggu frame terakhir selesai diproses saat app ditutup
+CAPTURE_JOIN_TIMEOUT = 10.0
+
 # Import Discord bot (webhook-based, lightweight)
 try:
+    from delivery_engine import get_engine
     from discord_webhook import DiscordOCRBot
 
     DISCORD_AVAILABLE = True
@@ -81,6 +193,46 @@ class OCRConfig:
         self.capture_interval = 1.0  # seconds between captures
         self.tesseract_config = "--psm 6"  # Page segmentation mode
 
+        # Capture schedule: "fixed" (capture_interval) atau "predictive"
+        # (cepat saat event kemungkinan muncul, lambat di luar itu)
+        self.schedule_mode = "fixed"
+        self.min_interval = 0.5
+        self.max_interval = 3.0
+
+        # Scale screenshot sebelum OCR (diatur CPUGovernor)
+        self.scale = 1.0
+
+        # CPU budget (fraksi satu core, misal 0.15), None = tanpa batas
+        self.cpu_budget = None
+        self.cpu_window = 10.0
+
+        # Stabilization: baris dikirim setelah terbaca di stabilize_frames
+        # dari stabilize_window frame terakhir (1 = tanpa stabilization)
+        self.stabilize_frames = 2
+        self.stabilize_window = 3
+
+        # Background suppression sebelum OCR: None (off), "median" atau "min"
+        self.background_mode = None
+        self.background_depth = 3
+
+        # Crop ke area text sebelum OCR (skip OCR jika tidak ada text)
+        self.localize = False
+
+        # Outbox Discord: maksimal message belum terkirim, drop policy
+        # saat penuh ("oldest" atau "newest")
+        self.outbox_size = 10000
+        self.outbox_drop_policy = "oldest"
+
+        # Queue Discord (in-memory, priority dari keyword): ukuran maksimal
+        # dan overflow policy ("drop_lowest", "drop_oldest" atau "block")
+        self.queue_size = 1000
+        self.queue_overflow = "drop_lowest"
+
+        # Rolling message: result dengan priority <= edit_max_priority
+        # meng-edit satu message live, bukan kirim message baru
+        self.edit_mode = False
+        self.edit_max_priority = 0
+
 
 class CaptureArea:
     """Manages the screen capture area coordinates"""
@@ -109,12 +261,90 @@ class OCREngine:
     def __init__(self, config):
         self.config = config
         self.last_text = ""
+        self.stabilizer = None
+        self.background = None
+        self.localizer = None
+
+        # Template banner (banner_templates.npz di-load saat frame pertama)
+        self.templates = BannerTemplates() if TEMPLATES_AVAILABLE else None
+        # Cek apakah masih ada text di luar banner (terpisah dari localizer
+        # supaya stats localizer tidak ikut terhitung)
+        self.banner_check = (
+            TextLocalizer() if self.templates and LOCALIZER_AVAILABLE else None
+        )
+
+        self.reset_stabilizer()
+        self.reset_background()
+        self.reset_localizer()
+
+    def reset_stabilizer(self):
+        """(Re)create stabilizer sesuai config"""
+        if STABILIZER_AVAILABLE and self.config.stabilize_frames > 1:
+            self.stabilizer = TextStabilizer(
+                self.config.stabilize_frames, self.config.stabilize_window
+            )
+        else:
+            self.stabilizer = None
 
-    def capture_and_read(self, capture_area):
+    def reset_background(self):
+        """(Re)create background suppressor sesuai config"""
+        if self.config.background_mode and BACKGROUND_AVAILABLE:
+            self.background = BackgroundSuppressor(
+                self.config.background_depth, self.config.background_mode
+            )
+        else:
+            self.background = None
+
+    def reset_localizer(self):
+        """(Re)create text localizer sesuai config"""
+        if self.config.localize and LOCALIZER_AVAILABLE:
+            self.localizer = TextLocalizer()
+        else:
+            self.localizer = None
+
+    def capture_and_read(self, capture_area, trace=None):
         """Captures screen area and performs OCR"""
         try:
             # Capture the screen area
             screenshot = ImageGrab.grab(bbox=capture_area.get_bbox())
+            if trace:
+                trace.mark("capture")
+
+            # Fast path: banner yang sudah dikenal tidak perlu tesseract
+            # (dicek sebelum scale karena template dibuat di scale 1.0).
+            # Baris chat lain di luar banner tetap di-OCR: banner di-mask,
+            # tesseract hanya di-skip jika tidak ada text lain.
+            banners = []
+            text_top = None
+            if self.templates:
+                banners = self.templates.match_boxes(screenshot)
+            if banners:
+                screenshot = mask_boxes(screenshot, [box for _, box in banners])
+                if self.banner_check:
+                    text_box = self.banner_check.locate_image(screenshot)
+                    if text_box is None:
+                        return "\n".join(text for text, _ in banners)
+                    text_top = text_box[1]
+
+            # Gambar lebih kecil = tesseract lebih cepat (CPU budget)
+            if self.config.scale < 1.0:
+                screenshot = screenshot.resize(
+                    (
+                        max(1, int(screenshot.width * self.config.scale)),
+                        max(1, int(screenshot.height * self.config.scale)),
+                    ),
+                    Image.BILINEAR,
+                )
+
+            # Hilangkan tekstur scene game yang bergerak di belakang text
+            if self.background:
+                screenshot = self.background.apply_image(screenshot)
+
+            # Crop ke area text; tidak ada text = tidak perlu OCR
+            if self.localizer:
+                screenshot = self.localizer.crop(screenshot)
+                if screenshot is None:
+                    return self.merge_banners(banners, "", text_top)
 
             # Perform OCR
             text = pytesseract.image_to_string(
@@ -124,16 +354,56 @@ class OCREngine:
             # Clean up the text
             text = text.strip()
 
-            return text
+            return self.merge_banners(banners, text, text_top)
         except Exception as e:
             return f"Error: {str(e)}"
 
+    @staticmethod
+    def merge_banners(banners, text, text_top=None):
+        """
+        Gabungkan text banner (template) dengan hasil OCR sisa frame
+
+        Args:
+            banners (list): (text, box) dari BannerTemplates.match_boxes
+            text (str): Hasil OCR area di luar banner
+            text_top (int): Posisi atas text di luar banner (None = tidak
+                diketahui, banner ditaruh di depan)
+
+        Returns:
+            str: Baris urut dari atas ke bawah
+        """
+        if not banners:
+            return text
+        above, below = [], []
+        for banner, box in banners:
+            if text_top is None or box[1] <= text_top:
+                above.append(banner)
+            else:
+                below.append(banner)
+        return "\n".join(line for line in above + [text] + below if line)
+
     def has_text_changed(self, new_text):
         """Check if text has changed since last capture"""
         changed = new_text != self.last_text
         self.last_text = new_text
         return changed
 
+    def new_stable_text(self, new_text):
+        """
+        Text yang perlu diproses dari frame ini
+
+        Returns:
+            str: Baris yang baru stabil (atau seluruh text jika berubah
+                saat stabilization off), "" jika tidak ada yang baru
+        """
+        if self.stabilizer:
+            return self.stabilizer.update(new_text)
+        # Frame kosong (misal localizer sesaat tidak menemukan text) tidak
+        # me-reset last_text, supaya text yang sama tidak dikirim ulang
+        if not new_text:
+            return ""
+        return new_text if self.has_text_changed(new_text) else ""
+
 
 class OverlayWindow:
     """Visual overlay to show capture area"""
@@ -184,7 +454,7 @@ class OCRApp:
         self.root.title("OCR App - PORTABLE")
 
         # Sesuaikan tinggi window berdasarkan ketersediaan Discord
-        height = "590" if DISCORD_AVAILABLE else "400"
+        height = "610" if DISCORD_AVAILABLE else "420"
         self.root.geometry(f"410x{height}")
 
         # Initialize components
@@ -197,17 +467,55 @@ class OCRApp:
         self.discord_bot = None
         self.discord_enabled = False
 
+        # Routing keyword/event type -> webhook lain (config "routes")
+        self.discord_routes = []
+
         # Initialize OCR Filter
         if FILTER_AVAILABLE:
             self.ocr_filter = OCRFilter()
+            self.ocr_filter.load_rules()  # filter_rules.json, hot reload
             self.ocr_filter.enable_file_output("ocr_output.txt")
             print("✅ OCR Filter initialized")
         else:
             self.ocr_filter = None
 
+        # Koreksi typo OCR pakai lexicon game (seed dari filter keywords)
+        if CORRECTOR_AVAILABLE and self.ocr_filter:
+            self.corrector = LexiconCorrector.from_keywords(
+                self.ocr_filter.important_keywords
+            )
+        else:
+            self.corrector = None
+
+        # Structured events dari filtered output
+        self.event_extractor = EventExtractor() if EXTRACTOR_AVAILABLE else None
+
+        # History accepted messages + events (ocr_events.db)
+        self.event_store = None
+        if EVENT_STORE_AVAILABLE:
+            try:
+                self.event_store = EventStore()
+            except Exception as e:
+                print(f"⚠️  Event store disabled: {e}")
+
+        # Statistik spawn interval per keyword (event_stats.json)
+        self.event_analytics = EventAnalytics() if ANALYTICS_AVAILABLE else None
+
+        # Latency per stage, capture -> Discord ack (latency_report.json)
+        self.latency_tracer = LatencyTracer() if LATENCY_AVAILABLE else None
+
+        # Predictive scheduling (dibuat di start_ocr sesuai config)
+        self.scheduler = None
+
+        # CPU budget governor (dibuat di start_ocr jika cpu_budget di-set)
+        self.governor = None
+
         # State variables
         self.is_running = False
         self.capture_thread = None
+        # Di-set oleh stop_ocr supaya capture thread tidak tidur sampai
+        # interval berikutnya selesai
+        self.stop_event = threading.Event()
 
         # Build GUI
         self.build_gui()
@@ -232,6 +540,10 @@ class OCRApp:
                         self.channel_id_var.set(config["channel_id"])
                         print("✅ Channel ID loaded")
 
+                    if config.get("routes"):
+                        self.discord_routes = config["routes"]
+                        print(f"✅ Discord routes loaded: {len(self.discord_routes)}")
+
                 # Load capture area settings
                 if "capture_area" in config:
                     area = config["capture_area"]
@@ -249,13 +561,106 @@ class OCRApp:
                         self.capture_area.height = area["height"]
                     print("✅ Capture area settings loaded")
 
+                # Load capture schedule settings
+                if "capture_schedule" in config:
+                    schedule = config["capture_schedule"]
+                    self.config.schedule_mode = schedule.get(
+                        "mode", self.config.schedule_mode
+                    )
+                    self.config.min_interval = schedule.get(
+                        "min_interval", self.config.min_interval
+                    )
+                    self.config.max_interval = schedule.get(
+                        "max_interval", self.config.max_interval
+                    )
+                    print(f"✅ Capture schedule: {self.config.schedule_mode}")
+
+                # Load CPU budget
+                if "cpu_budget" in config:
+                    budget = config["cpu_budget"]
+                    self.config.cpu_budget = budget.get("budget")
+                    self.config.cpu_window = budget.get(
+                        "window", self.config.cpu_window
+                    )
+                    print(f"✅ CPU budget: {self.config.cpu_budget}")
+
+                # Load stabilization settings
+                if "stabilize" in config:
+                    stabilize = config["stabilize"]
+                    self.config.stabilize_frames = stabilize.get(
+                        "frames", self.config.stabilize_frames
+                    )
+                    self.config.stabilize_window = stabilize.get(
+                        "window", self.config.stabilize_window
+                    )
+                    self.ocr_engine.reset_stabilizer()
+
+                # Load background suppression settings
+                if "background" in config:
+                    background = config["background"]
+                    self.config.background_mode = background.get("mode")
+                    self.config.background_depth = background.get(
+                        "depth", self.config.background_depth
+                    )
+                    self.ocr_engine.reset_background()
+                    print(f"✅ Background suppression: {self.config.background_mode}")
+
+                # Load text localization setting
+                if "localize" in config:
+                    self.config.localize = bool(config["localize"])
+                    self.ocr_engine.reset_localizer()
+
+                # Load Discord outbox settings
+                if "outbox" in config:
+                    outbox = config["outbox"]
+                    self.config.outbox_size = outbox.get(
+                        "max_messages", self.config.outbox_size
+                    )
+                    self.config.outbox_drop_policy = outbox.get(
+                        "drop_policy", self.config.outbox_drop_policy
+                    )
+                    print(
+                        f"✅ Discord outbox: {self.config.outbox_size} messages, "
+                        f"drop {self.config.outbox_drop_policy}"
+                    )
+
+                # Load Discord queue settings
+                if "discord_queue" in config:
+                    queue = config["discord_queue"]
+                    self.config.queue_size = queue.get(
+                        "max_size", self.config.queue_size
+                    )
+                    self.config.queue_overflow = queue.get(
+                        "overflow", self.config.queue_overflow
+                    )
+                    print(
+                        f"✅ Discord queue: {self.config.queue_size} messages, "
+                        f"{self.config.queue_overflow}"
+                    )
+
+                # Load rolling message settings
+                if "rolling_message" in config:
+                    rolling = config["rolling_message"]
+                    self.config.edit_mode = bool(rolling.get("enabled", True))
+                    self.config.edit_max_priority = rolling.get(
+                        "max_priority", self.config.edit_max_priority
+                    )
+                    print(
+                        f"✅ Rolling message: {self.config.edit_mode} "
+                        f"(priority <= {self.config.edit_max_priority})"
+                    )
+
         except Exception as e:
             print(f"⚠️  Error loading config: {e}")
 
     def save_config(self):
         """Save all settings to config file"""
         try:
+            # Pertahankan setting lain (misal capture_schedule)
             config = {}
+            if os.path.exists(CONFIG_FILE):
+                with open(CONFIG_FILE, "r") as f:
+                    config = json.load(f)
 
             # Save Discord settings if available
             if DISCORD_AVAILABLE:
@@ -491,12 +896,23 @@ class OCRApp:
         )
         self.overlay_button.pack(side="left", padx=2, fill="x", expand=True)
 
+        if ANALYTICS_AVAILABLE or LATENCY_AVAILABLE:
+            ttk.Button(button_frame, text="📊 Stats", command=self.show_stats).pack(
+                side="left", padx=2, fill="x", expand=True
+            )
+
         # Status label
         self.status_label = ttk.Label(
             self.root, text="● Idle", font=("Arial", 10, "bold"), foreground="#666"
         )
         self.status_label.pack(pady=(5, 1))
 
+        # CPU governor status (hanya terisi jika cpu_budget aktif)
+        self.governor_label = ttk.Label(
+            self.root, text="", font=("Arial", 8), foreground="gray"
+        )
+        self.governor_label.pack()
+
         # Info label
         info_text = "OCR output → Terminal" + (
             " & Discord" if DISCORD_AVAILABLE else ""
@@ -515,6 +931,8 @@ class OCRApp:
             self.height_var.get(),
         )
         self.overlay.update_position()
+        if self.ocr_engine.background:
+            self.ocr_engine.background.reset()
         print(f"✅ Capture area updated: {self.capture_area.get_bbox()}")
 
         # Auto-save
@@ -529,6 +947,34 @@ class OCRApp:
             self.overlay.show()
             self.overlay_button.config(text="👁 Hide Overlay")
 
+    def show_stats(self):
+        """Tampilkan statistik event per keyword + latency di window terpisah"""
+        reports = []
+        if self.event_analytics:
+            reports.append(self.event_analytics.report())
+        if self.latency_tracer:
+            reports.append(self.latency_tracer.report())
+        if not reports:
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Event Stats")
+        text = tk.Text(window, width=90, height=30, font=("Courier", 9))
+        text.pack(padx=10, pady=10, fill="both", expand=True)
+        text.insert("1.0", "\n\n".join(reports))
+        text.config(state="disabled")
+
+        if self.latency_tracer:
+            ttk.Button(
+                window, text="💾 Export Latency JSON", command=self.export_latency
+            ).pack(pady=(0, 10))
+
+    def export_latency(self):
+        """Dump latency report ke latency_report.json"""
+        path = self.latency_tracer.dump()
+        if path:
+            print(f"✅ Latency report saved: {path}")
+
     def connect_discord(self):
         """Connect to Discord"""
         if not DISCORD_AVAILABLE:
@@ -563,7 +1009,17 @@ class OCRApp:
         # Create Discord bot
         try:
             if is_webhook:
-                self.discord_bot = DiscordOCRBot(credential)
+                self.discord_bot = DiscordOCRBot(
+                    credential,
+                    outbox_size=self.config.outbox_size,
+                    drop_policy=self.config.outbox_drop_policy,
+                    queue_size=self.config.queue_size,
+                    overflow=self.config.queue_overflow,
+                    routes=self.discord_routes,
+                    edit_mode=self.config.edit_mode,
+                    edit_max_priority=self.config.edit_max_priority,
+                    priority_for=self.keyword_priority,
+                )
             else:
                 channel_id = int(channel_id_str)
                 self.discord_bot = DiscordOCRBot(credential, channel_id)
@@ -578,20 +1034,20 @@ class OCRApp:
             self.discord_status.config(text="● Connection Failed", foreground="red")
             return
 
-        # Start bot in background thread
-        def start_bot_thread():
-            try:
-                asyncio.run(self.discord_bot.start_bot())
-            except Exception as e:
-                print(f"❌ Error starting Discord: {e}")
-                self.root.after(
-                    0,
-                    lambda: self.discord_status.config(
-                        text="● Connection Failed", foreground="red"
-                    ),
-                )
+        # Start bot di event loop DeliveryEngine (shared dengan pengiriman,
+        # tidak perlu thread + asyncio.run sendiri)
+        def on_bot_done(future):
+            if future.cancelled() or future.exception() is None:
+                return
+            print(f"❌ Error starting Discord: {future.exception()}")
+            self.root.after(
+                0,
+                lambda: self.discord_status.config(
+                    text="● Connection Failed", foreground="red"
+                ),
+            )
 
-        threading.Thread(target=start_bot_thread, daemon=True).start()
+        get_engine().submit(self.discord_bot.start_bot()).add_done_callback(on_bot_done)
 
         # Check status
         self.root.after(2000, self.check_discord_status)
@@ -616,7 +1072,17 @@ class OCRApp:
             self.stop_button.config(state="normal")
             self.status_label.config(text="● Running", foreground="green")
 
+            self.scheduler = self.create_scheduler()
+            self.governor = None
+            self.config.scale = 1.0
+            if GOVERNOR_AVAILABLE and self.config.cpu_budget:
+                self.governor = CPUGovernor(
+                    budget=self.config.cpu_budget, window=self.config.cpu_window
+                )
+                self.update_governor_status()
+
             # Start capture thread
+            self.stop_event.clear()
             self.capture_thread = threading.Thread(target=self.ocr_loop, daemon=True)
             self.capture_thread.start()
 
@@ -630,25 +1096,106 @@ class OCRApp:
         """Stops the OCR capture loop"""
         if self.is_running:
             self.is_running = False
+            self.stop_event.set()
             self.start_button.config(state="normal")
             self.stop_button.config(state="disabled")
             self.status_label.config(text="● Stopped", foreground="orange")
 
             print("\n" + "=" * 50)
             print("OCR Stopped")
+            if self.scheduler:
+                print(self.scheduler.status())
+            if self.governor:
+                print(f"⚙️  {self.governor.status()}")
+            if self.ocr_engine.stabilizer:
+                print(self.ocr_engine.stabilizer.status())
+            if self.ocr_engine.background:
+                print(self.ocr_engine.background.status())
+            if self.ocr_engine.localizer:
+                print(self.ocr_engine.localizer.status())
+            if self.ocr_engine.templates and len(self.ocr_engine.templates):
+                print(self.ocr_engine.templates.status())
+            if self.corrector:
+                print(self.corrector.report())
             print("=" * 50 + "\n")
 
+    def create_scheduler(self):
+        """CaptureScheduler jika mode predictive aktif, selain itu None"""
+        if (
+            self.config.schedule_mode != SCHEDULE_PREDICTIVE
+            or not SCHEDULER_AVAILABLE
+            or not self.event_analytics
+        ):
+            return None
+
+        # Hanya keyword event (priority > 0), bukan chat biasa (joined, used...)
+        keywords = None
+        if self.ocr_filter:
+            keywords = [
+                keyword
+                for keyword, priority in self.ocr_filter.rules.priorities.items()
+                if priority > 0
+            ]
+
+        return CaptureScheduler(
+            self.event_analytics,
+            base_interval=self.config.capture_interval,
+            min_interval=self.config.min_interval,
+            max_interval=self.config.max_interval,
+            keywords=keywords,
+        )
+
+    def next_capture_interval(self):
+        """Interval sebelum capture berikutnya (fixed/predictive + CPU budget)"""
+        if self.scheduler:
+            interval = self.scheduler.next_interval()
+        else:
+            interval = self.config.capture_interval
+
+        if self.governor:
+            self.governor.sample()
+            self.config.scale = self.governor.scale
+            interval = self.governor.apply_interval(interval)
+        return interval
+
+    def keyword_priority(self, text_lower):
+        """Priority keyword di text (rules terbaru, None jika filter off)"""
+        if not self.ocr_filter:
+            return None
+        return self.ocr_filter.rules.keyword_priority(text_lower)
+
+    def update_governor_status(self):
+        """Refresh status CPU governor di GUI (main thread)"""
+        if not self.is_running or not self.governor:
+            self.governor_label.config(text="")
+            return
+        self.governor_label.config(text=f"⚙️ {self.governor.status()}")
+        self.root.after(1000, self.update_governor_status)
+
     def ocr_loop(self):
         """Main OCR loop running in separate thread"""
         while self.is_running:
-            # Capture and read text
-            text = self.ocr_engine.capture_and_read(self.capture_area)
+            # Frame id + waktu capture, dibawa sampai Discord ack
+            trace = self.latency_tracer.new_frame() if self.latency_tracer else None
 
-            # Only process if text has changed
-            if text and self.ocr_engine.has_text_changed(text):
+            # Capture and read text
+            text = self.ocr_engine.capture_and_read(self.capture_area, trace)
+            if trace:
+                trace.mark("ocr")
+
+            # Only process lines that are new and stable across frames
+            # (frame kosong tetap dihitung supaya window stabilizer jalan)
+            text = self.ocr_engine.new_stable_text(text)
+            if trace:
+                trace.mark("stabilize")
+            if text:
                 print("\n--- OCR Output (Raw) ---")
                 print(text)
 
+                # Snap typo OCR ke lexicon sebelum keyword matching
+                if self.corrector:
+                    text = self.corrector.correct(text)
+
                 # Apply filter if available
                 if self.ocr_filter:
                     should_send, filtered_text, reason = self.ocr_filter.filter(
@@ -662,13 +1209,47 @@ class OCRApp:
                         print(filtered_text)
                         print("----------------------\n")
 
+                        # Extract structured events (player, item, ...)
+                        events = []
+                        if self.event_extractor:
+                            events = self.event_extractor.extract(filtered_text)
+                            for event in events:
+                                print(f"📌 Event: {event.event_type}")
+
+                        best = self.ocr_filter.rules.best_keyword(filtered_text.lower())
+                        keyword, priority = best or (None, None)
+                        if trace:
+                            trace.mark("filter")
+
+                        # Update statistik per keyword
+                        if self.event_analytics:
+                            self.event_analytics.record(keyword)
+                        # Hanya event keyword yang membuat capture lebih cepat,
+                        # baris rutin (priority 0 / default) tidak
+                        if (
+                            self.scheduler
+                            and priority is not None
+                            and priority > DEFAULT_PRIORITY
+                        ):
+                            self.scheduler.mark_accepted()
+
+                        # Simpan ke history (background, batched)
+                        if self.event_store:
+                            self.event_store.add(
+                                filtered_text, events, keyword, priority
+                            )
+
                         # Send to Discord if enabled
                         if self.discord_enabled and self.discord_bot:
                             try:
-                                self.discord_bot.send_ocr_result(filtered_text)
+                                self.discord_bot.send_ocr_result(
+                                    filtered_text, priority, events, trace
+                                )
                             except Exception as e:
                                 print(f"❌ Error sending to Discord: {e}")
                     else:
+                        if trace:
+                            trace.mark("filter")
                         print(f"❌ {reason}")
                         print("----------------------\n")
                 else:
@@ -678,12 +1259,12 @@ class OCRApp:
                     # Send to Discord if enabled
                     if self.discord_enabled and self.discord_bot:
                         try:
-                            self.discord_bot.send_ocr_result(text)
+                            self.discord_bot.send_ocr_result(text, trace=trace)
                         except Exception as e:
                             print(f"❌ Error sending to Discord: {e}")
 
             # Wait before next capture
-            time.sleep(self.config.capture_interval)
+            self.stop_event.wait(self.next_capture_interval())
 
     def on_closing(self):
         """Cleanup when closing the application"""
@@ -695,10 +1276,34 @@ class OCRApp:
         # Hide overlay
         self.overlay.hide()
 
-        # Discord cleanup (webhook doesn't need async cleanup)
+        # Tunggu frame yang masih di tesseract / filter selesai sebelum sink
+        # (file output, history, outbox) ditutup
+        if self.capture_thread and self.capture_thread.is_alive():
+            self.capture_thread.join(timeout=CAPTURE_JOIN_TIMEOUT)
+            if self.capture_thread.is_alive():
+                print("⚠️  OCR thread still running, closing anyway")
+
+        # Flush ocr_output.txt dan stop filter background threads
+        if self.ocr_filter:
+            self.ocr_filter.close()
+
+        # Flush event history
+        if self.event_store:
+            self.event_store.close()
+
+        # Save statistik terakhir
+        if self.event_analytics:
+            self.event_analytics.close()
+
+        # Discord cleanup: kirim message yang masih di queue dulu
         if self.discord_bot:
+            self.discord_bot.close()
             print("🔴 Discord disconnected")
 
+        # Dump latency report (setelah Discord selesai, ack terakhir ikut)
+        if self.latency_tracer:
+            self.latency_tracer.close()
+
         # Destroy window
         self.root.destroy()
         print("✅ Application closed")
@@ -4,121 +4,271 @@ Filter dan clean OCR output sebelum dikirim ke Discord
 Menghilangkan noise, duplicate, dan text yang tidak penting
 """
 
+import os
 import re
+from collections import deque
 from datetime import datetime
+from itertools import islice
+
+from filter_rules import (
+    RULES_FILE,
+    FilterRules,
+    RulesWatcher,
+    edit_keywords,
+    edit_rules,
+)
+from output_writer import BackgroundFileWriter
+
+# NumPy opsional, hanya dipakai untuk batch filtering (filter_many)
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Pre-compiled patterns untuk clean_text
+MULTI_DOTS_RE = re.compile(r"\.{3,}")
+MULTI_DASHES_RE = re.compile(r"-{3,}")
+
+# Karakter yang di-strip dari awal/akhir text
+STRIP_CHARS = ".,;:!?-_*+=@#$%^&()[]{}|\\/"
+
+# Special char = bukan alnum dan bukan whitespace (sama dengan
+# `not c.isalnum() and not c.isspace()`, underscore termasuk special)
+SPECIAL_CHAR_RE = re.compile(r"[^\w\s]|_")
+
+if NUMPY_AVAILABLE:
+    # Lookup table special char: index 0-127 = ASCII, index 128 = non-ASCII
+    # (non-ASCII dihitung ulang per baris dengan SPECIAL_CHAR_RE)
+    SPECIAL_CHAR_LUT = np.array(
+        [not chr(c).isalnum() and not chr(c).isspace() for c in range(128)] + [False],
+        dtype=np.uint8,
+    )
+
+# Hasil filter yang sering muncul (dipakai ulang oleh filter_many)
+NOISE_RESULT = (False, "", "Filtered: Noise")
+DUPLICATE_RESULT = (False, "", "Filtered: Duplicate")
+NO_KEYWORD_RESULT = (False, "", "Filtered: No important keywords")
+
+
+class NormalizedText:
+    """
+    Text yang sudah dinormalisasi, dihitung sekali lalu dipakai semua stage
+
+    Lowercase dan jumlah special char dihitung lazy, jadi stage yang
+    short-circuit lebih awal (misal text terlalu pendek) tidak membayar
+    biaya normalisasi yang tidak dipakai.
+    """
+
+    __slots__ = ("text", "length", "_lower", "_special_count")
+
+    def __init__(self, text):
+        self.text = text
+        self.length = len(text)
+        self._lower = None
+        self._special_count = None
+
+    @property
+    def lower(self):
+        """Lowercased text (cached)"""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def special_count(self):
+        """Jumlah karakter non-alnum non-whitespace (cached)"""
+        if self._special_count is None:
+            self._special_count = len(SPECIAL_CHAR_RE.findall(self.text))
+        return self._special_count
 
 
 class OCRFilter:
     """Filter OCR output untuk menghilangkan noise dan duplicate"""
 
-    def __init__(self):
+    def __init__(self, rules=None):
+        """
+        Args:
+            rules (FilterRules): Compiled rules, default FilterRules.default().
+                Keyword, noise patterns dan min length sekarang ada di
+                filter_rules.json (lihat filter_rules.py).
+        """
         # Track text yang sudah dikirim untuk avoid duplicate
         self.sent_messages = []
         self.max_history = 50  # Keep last 50 messages
 
-        # Keyword yang ingin di-capture (customize sesuai kebutuhan)
-        self.important_keywords = [
-            # Game events
-            "event",
-            "spotted",
-            "manifests",
-            "emerged",
-            "vanished",
-            "begun",
-            "ended",
-            "Aurora Borealis",
-            "Megalodon",
-            "Cursed Isle",
-            "Divine Secret",
-            "Sunken",
-            "Coral",
-            "Omnithal",
-            "Awakened Omnithal",
-            "Kraken",
-            "Narwhal",
-            "Statue",
-            "fish",
-            "Forsaken"
-            # Actions
-            "used",
-            "joined",
-            "caught",
-            "Totem",
-        ]
-
-        # Pattern untuk filter noise
-        self.noise_patterns = [
-            r"^[^\w\s]+$",  # Hanya simbol
-            r"^\s*[.]\s*$",  # Hanya dots
-            r"^[a-zA-Z]{1,2}$",  # Single/double char
-            r"^\d+$",  # Hanya angka
-            r"^[@#$%^&*()]+$",  # Hanya special chars
-        ]
-
-        # Minimum length untuk dianggap valid
-        self.min_length = 10
-
-        # Save to file options
+        # Compiled rules - hanya di-swap (satu assignment), tidak pernah diubah
+        self.rules = rules or FilterRules.default()
+        self.rules_watcher = None
+
+        # Lowercased copy dari 10 history terakhir untuk duplicate check
+        self._recent_lower = deque(maxlen=10)
+
+        # Save to file options (ditulis oleh BackgroundFileWriter)
         self.save_to_file = False
         self.output_file = "ocr_output.txt"
+        self.output_writer = None
+        self.writer_options = {}  # flush/fsync/rotation, lihat output_writer
 
-    def is_noise(self, text):
-        """Check if text is noise/garbage"""
-        # Empty or too short
-        if not text or len(text.strip()) < self.min_length:
+    @property
+    def important_keywords(self):
+        """
+        Keyword yang ingin di-capture (tuple, read-only: pakai
+        add_keyword / remove_keyword)
+        """
+        return self.rules.keywords
+
+    @property
+    def noise_patterns(self):
+        """
+        Pattern untuk filter noise (tuple, read-only: assign list baru,
+        ikut ditulis ke file rules seperti add_keyword)
+        """
+        return self.rules.noise_patterns
+
+    @noise_patterns.setter
+    def noise_patterns(self, patterns):
+        # Compile dulu: regex invalid gagal di sini, sebelum file ditulis
+        rules = self.rules.with_noise_patterns(patterns)
+        if not self._edit_rules_file(
+            edit_rules, noise_patterns=list(rules.noise_patterns)
+        ):
+            self.rules = rules
+
+    @property
+    def min_length(self):
+        """Minimum length untuk dianggap valid"""
+        return self.rules.min_length
+
+    @min_length.setter
+    def min_length(self, value):
+        rules = self.rules.with_min_length(value)
+        if not self._edit_rules_file(edit_rules, min_length=rules.min_length):
+            self.rules = rules
+
+    def load_rules(self, path=RULES_FILE, watch=True, interval=2.0):
+        """
+        Load rules dari file JSON, optionally hot reload saat file berubah
+
+        Args:
+            path (str): Path file rules
+            watch (bool): Start background watcher untuk hot reload
+            interval (float): Detik antar pengecekan file
+
+        Returns:
+            RulesWatcher: Watcher (reload_count, last_reload_time)
+        """
+        self.stop_watching_rules()
+        self.rules_watcher = RulesWatcher(self, path, interval)
+        if watch:
+            self.rules_watcher.start()
+        else:
+            self.rules_watcher.load()
+        return self.rules_watcher
+
+    def stop_watching_rules(self):
+        """Stop hot reload watcher jika ada"""
+        if self.rules_watcher:
+            self.rules_watcher.stop()
+
+    def normalize(self, text):
+        """Clean text sekali dan bungkus dalam NormalizedText"""
+        return NormalizedText(self.clean_text(text))
+
+    def _is_noise(self, norm, rules):
+        """Noise stage untuk NormalizedText (text sudah di-strip)"""
+        if norm.length < rules.min_length:
             return True
 
-        # Check noise patterns
-        for pattern in self.noise_patterns:
-            if re.match(pattern, text.strip()):
-                return True
+        if rules.noise_re.match(norm.text):
+            return True
 
-        # Too many special characters
-        special_char_ratio = sum(
-            not c.isalnum() and not c.isspace() for c in text
-        ) / len(text)
-        if special_char_ratio > 0.5:  # More than 50% special chars
+        # More than 50% special chars
+        return norm.special_count / norm.length > 0.5
+
+    def _is_duplicate(self, norm):
+        """Duplicate stage untuk NormalizedText"""
+        return self._is_duplicate_lower(norm.lower)
+
+    def _is_duplicate_lower(self, text_lower):
+        """Duplicate check untuk text yang sudah di-lowercase"""
+        # Exact match
+        if text_lower in self._recent_lower:
             return True
 
+        # Similar match: one contains the other
+        if len(text_lower) <= 20:
+            return False
+
+        for sent_lower in self._recent_lower:
+            if len(sent_lower) > 20 and (
+                text_lower in sent_lower or sent_lower in text_lower
+            ):
+                return True
+
         return False
 
-    def is_duplicate(self, text, threshold=0.8):
-        """Check if text is duplicate (similar to recent messages)"""
-        text_clean = text.strip().lower()
+    def _has_important_keyword(self, norm, rules):
+        """Keyword stage untuk NormalizedText"""
+        if rules.keyword_re is None:
+            return False
+        return rules.keyword_re.search(norm.lower) is not None
 
-        for sent_msg in self.sent_messages[-10:]:  # Check last 10 messages
-            sent_clean = sent_msg.strip().lower()
+    def is_noise(self, text):
+        """Check if text is noise/garbage"""
+        # Empty or too short
+        if not text:
+            return True
 
-            # Exact match
-            if text_clean == sent_clean:
-                return True
+        rules = self.rules
+        stripped = text.strip()
+        if len(stripped) < rules.min_length or rules.noise_re.match(stripped):
+            return True
 
-            # Similar match (simple similarity check)
-            if len(text_clean) > 20 and len(sent_clean) > 20:
-                # Check if one contains the other
-                if text_clean in sent_clean or sent_clean in text_clean:
-                    return True
+        # Too many special characters
+        return NormalizedText(text).special_count / len(text) > 0.5
 
-        return False
+    def is_duplicate(self, text, threshold=0.8):
+        """Check if text is duplicate (similar to recent messages)"""
+        return self._is_duplicate(NormalizedText(text.strip()))
 
     def has_important_keyword(self, text):
         """Check if text contains important keywords"""
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in self.important_keywords)
+        return self._has_important_keyword(NormalizedText(text), self.rules)
+
+    def keyword_priority(self, text):
+        """
+        Priority tertinggi dari keyword yang ada di text
+
+        Returns:
+            int or None: Priority, None jika tidak ada keyword
+        """
+        return self.rules.keyword_priority(text.lower())
 
     def clean_text(self, text):
         """Clean OCR text"""
-        # Remove excessive whitespace
-        text = re.sub(r"\s+", " ", text)
-
-        # Remove leading/trailing special chars
-        text = text.strip(".,;:!?-_*+=@#$%^&()[]{}|\\/")
+        # Remove excessive whitespace (split/join jauh lebih cepat dari regex)
+        cleaned = " ".join(text.split())
+
+        # Remove leading/trailing special chars. Whitespace di ujung text asli
+        # menghalangi strip di sisi itu, jadi sisi tersebut dibiarkan.
+        leading_space = text[:1].isspace()
+        trailing_space = text[-1:].isspace()
+        if not leading_space and not trailing_space:
+            cleaned = cleaned.strip(STRIP_CHARS)
+        elif not leading_space:
+            cleaned = cleaned.lstrip(STRIP_CHARS)
+        elif not trailing_space:
+            cleaned = cleaned.rstrip(STRIP_CHARS)
 
         # Remove multiple dots/dashes
-        text = re.sub(r"\.{3,}", "...", text)
-        text = re.sub(r"-{3,}", "---", text)
+        if "..." in cleaned:
+            cleaned = MULTI_DOTS_RE.sub("...", cleaned)
+        if "---" in cleaned:
+            cleaned = MULTI_DASHES_RE.sub("---", cleaned)
 
-        return text.strip()
+        return cleaned.strip()
 
     def extract_important_lines(self, text):
         """Extract only important lines from multi-line text"""
@@ -140,19 +290,20 @@ class OCRFilter:
 
     def should_send(self, text):
         """Determine if text should be sent to Discord"""
-        # Clean first
-        text = self.clean_text(text)
+        return self._should_send(self.normalize(text), self.rules)
 
+    def _should_send(self, norm, rules):
+        """Run smart pipeline stages on NormalizedText, stop at first reject"""
         # Check noise
-        if self.is_noise(text):
+        if self._is_noise(norm, rules):
             return False, "Filtered: Noise"
 
         # Check duplicate
-        if self.is_duplicate(text):
+        if self._is_duplicate(norm):
             return False, "Filtered: Duplicate"
 
         # Check if has important content
-        if not self.has_important_keyword(text):
+        if not self._has_important_keyword(norm, rules):
             return False, "Filtered: No important keywords"
 
         return True, "Passed"
@@ -199,18 +350,136 @@ class OCRFilter:
                     return True, result, "Mode: Lines"
             return False, "", "No important lines"
 
-        # Mode: Smart (default)
-        should_send, reason = self.should_send(text)
+        # Mode: Smart (default) - clean sekali, dipakai semua stage
+        norm = self.normalize(text)
+        should_send, reason = self._should_send(norm, self.rules)
         if should_send:
-            cleaned = self.clean_text(text)
-            self._add_to_history(cleaned)
-            return True, cleaned, reason
+            self._add_to_history(norm.text)
+            return True, norm.text, reason
 
         return False, "", reason
 
+    def filter_many(self, texts, mode="smart", chunk_size=10000):
+        """
+        Filter banyak OCR text sekaligus (replay session / back-fill dari log)
+
+        Hasil identik dengan memanggil filter() satu per satu, tapi untuk
+        mode 'smart' cleaning, noise scoring dan keyword matching dikerjakan
+        per chunk secara bulk (regex atas satu string gabungan + NumPy).
+
+        Args:
+            texts (iterable): Raw OCR outputs (list, generator, file, ...)
+            mode (str): Filter mode, lihat filter()
+            chunk_size (int): Jumlah text yang diproses per batch
+
+        Returns:
+            list: (should_send, filtered_text, reason) per text, urutan sama
+        """
+        return list(self.iter_filter(texts, mode=mode, chunk_size=chunk_size))
+
+    def iter_filter(self, texts, mode="smart", chunk_size=10000):
+        """
+        Streaming version of filter_many()
+
+        Yields:
+            tuple: (should_send, filtered_text, reason) per text, urutan sama
+        """
+        iterator = iter(texts)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self._filter_batch(chunk, mode)
+
+    def _filter_batch(self, texts, mode):
+        """Filter satu chunk, fallback ke per-line loop jika tidak bisa bulk"""
+        if mode != "smart" or not NUMPY_AVAILABLE:
+            return [self.filter(text, mode=mode) for text in texts]
+
+        # Snapshot rules untuk seluruh chunk (hot reload tidak mengganggu)
+        rules = self.rules
+
+        # Clean/noise/keyword hanya bergantung pada text, jadi cukup dihitung
+        # sekali per text unik (replay biasanya berisi banyak baris berulang)
+        unique_index = {}
+        for text in texts:
+            unique_index.setdefault(text, len(unique_index))
+
+        clean_text = self.clean_text
+        cleaned = [clean_text(text) for text in unique_index]
+        cleaned_lower = [text.lower() for text in cleaned]
+
+        noise = self._batch_noise_mask(cleaned, rules)
+        if rules.keyword_re is None:
+            has_keyword = [False] * len(cleaned)
+        else:
+            has_keyword = list(map(rules.keyword_re.search, cleaned_lower))
+
+        # Dedupe harus sequential per baris karena bergantung pada history
+        results = []
+        append = results.append
+        is_duplicate = self._is_duplicate_lower
+        for i in map(unique_index.__getitem__, texts):
+            if noise[i]:
+                append(NOISE_RESULT)
+            elif is_duplicate(cleaned_lower[i]):
+                append(DUPLICATE_RESULT)
+            elif not has_keyword[i]:
+                append(NO_KEYWORD_RESULT)
+            else:
+                self._add_to_history(cleaned[i])
+                append((True, cleaned[i], "Passed"))
+
+        return results
+
+    def _batch_noise_mask(self, cleaned, rules):
+        """
+        Hitung noise features (length, special-char ratio) untuk semua baris
+        sekaligus dengan NumPy, lalu noise patterns hanya untuk yang lolos
+        """
+        # Encode sebagai UTF-32 supaya satu code point = satu elemen array.
+        # "\n" tidak mungkin muncul di text hasil clean_text, jadi aman
+        # dipakai sebagai separator (dan bukan special char).
+        codes = np.frombuffer(
+            "\n".join(cleaned).encode("utf-32-le", "surrogatepass"), np.uint32
+        )
+        lengths = np.fromiter(map(len, cleaned), np.int64, len(cleaned))
+        starts = np.zeros(len(cleaned), np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+
+        # Jumlah per baris via reduceat; elemen 0 ekstra di akhir supaya
+        # baris kosong terakhir tetap punya segmen yang valid
+        special = np.append(SPECIAL_CHAR_LUT[np.minimum(codes, 128)], 0)
+        non_ascii = np.append(codes >= 128, False)
+        special_counts = np.add.reduceat(special.astype(np.int32), starts)
+        has_non_ascii = np.logical_or.reduceat(non_ascii, starts)
+
+        # reduceat mengembalikan elemen pertama untuk segmen kosong
+        special_counts[lengths == 0] = 0
+        has_non_ascii[lengths == 0] = False
+
+        # Baris dengan karakter non-ASCII dihitung ulang secara exact
+        for i in np.flatnonzero(has_non_ascii).tolist():
+            special_counts[i] = len(SPECIAL_CHAR_RE.findall(cleaned[i]))
+
+        noise = (lengths == 0) | (lengths < rules.min_length)
+        noise |= special_counts > 0.5 * lengths
+
+        # Noise patterns hanya dijalankan untuk baris yang lolos feature check
+        survivors = np.flatnonzero(~noise).tolist()
+        noise_match = rules.noise_re.match
+        matched = map(noise_match, [cleaned[i] for i in survivors])
+        noise = noise.tolist()
+        for i, match in zip(survivors, matched):
+            if match:
+                noise[i] = True
+
+        return noise
+
     def _add_to_history(self, text):
         """Add text to sent history"""
         self.sent_messages.append(text)
+        self._recent_lower.append(text.strip().lower())
 
         # Keep only recent messages
         if len(self.sent_messages) > self.max_history:
@@ -221,43 +490,105 @@ class OCRFilter:
             self.save_output(text)
 
     def save_output(self, text, filename=None):
-        """Save OCR output to file"""
-        if filename:
+        """
+        Save OCR output to file
+
+        Hanya append ke buffer BackgroundFileWriter; file I/O, rotasi dan
+        fsync terjadi di writer thread.
+        """
+        if filename and filename != self.output_file:
+            self._close_writer()
             self.output_file = filename
 
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.output_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {text}\n")
-        except Exception as e:
-            print(f"⚠️  Error saving to file: {e}")
+        if self.output_writer is None:
+            self.output_writer = BackgroundFileWriter(
+                self.output_file, **self.writer_options
+            )
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.output_writer.write(f"[{timestamp}] {text}")
+
+    def enable_file_output(self, filename="ocr_output.txt", **writer_options):
+        """
+        Enable saving output to file
 
-    def enable_file_output(self, filename="ocr_output.txt"):
-        """Enable saving output to file"""
+        Args:
+            filename (str): Output file
+            **writer_options: Option BackgroundFileWriter (flush_interval,
+                fsync_policy, max_bytes, rotate_interval, backup_count, ...)
+        """
+        if filename != self.output_file or writer_options:
+            self._close_writer()
         self.save_to_file = True
         self.output_file = filename
+        if writer_options:
+            self.writer_options = writer_options
         print(f"✅ File output enabled: {filename}")
 
     def disable_file_output(self):
         """Disable saving output to file"""
         self.save_to_file = False
+        self._close_writer()
         print("❌ File output disabled")
 
+    def _close_writer(self):
+        """Flush dan tutup writer yang sedang aktif"""
+        if self.output_writer:
+            self.output_writer.close()
+            self.output_writer = None
+
+    def close(self):
+        """Flush output file dan stop background threads (panggil saat exit)"""
+        self.stop_watching_rules()
+        self._close_writer()
+
     def add_keyword(self, keyword):
-        """Add custom important keyword"""
-        if keyword not in self.important_keywords:
-            self.important_keywords.append(keyword)
-            print(f"✅ Added keyword: {keyword}")
+        """
+        Add custom important keyword
+
+        Jika rules di-load dari file (load_rules), keyword ditulis ke
+        filter_rules.json supaya tidak hilang saat hot reload.
+        """
+        if keyword.lower() in self.rules.priorities:
+            return
+        if not self._edit_rules_file(add=keyword):
+            self.rules = self.rules.with_keywords(self.rules.keywords + (keyword,))
+        print(f"✅ Added keyword: {keyword}")
 
     def remove_keyword(self, keyword):
-        """Remove keyword"""
-        if keyword in self.important_keywords:
-            self.important_keywords.remove(keyword)
-            print(f"❌ Removed keyword: {keyword}")
+        """Remove keyword (case-insensitive, ikut dihapus dari file rules)"""
+        key = keyword.lower()
+        if key not in self.rules.priorities:
+            return
+        if not self._edit_rules_file(remove=keyword):
+            self.rules = self.rules.with_keywords(
+                [k for k in self.rules.keywords if k.lower() != key]
+            )
+        print(f"❌ Removed keyword: {keyword}")
+
+    def _edit_rules_file(self, edit=edit_keywords, **changes):
+        """
+        Tulis perubahan rules ke file rules lalu reload
+
+        Args:
+            edit (callable): edit_keywords atau edit_rules (filter_rules)
+            **changes: Diteruskan ke edit
+
+        Returns:
+            bool: False jika rules tidak dari file (atau gagal tulis), caller
+                update rules in-memory saja
+        """
+        watcher = self.rules_watcher
+        if not watcher or not os.path.exists(watcher.path):
+            return False
+        if not edit(watcher.path, **changes):
+            return False
+        return watcher.load()
 
     def clear_history(self):
         """Clear sent message history"""
         self.sent_messages.clear()
+        self._recent_lower.clear()
         print("✅ History cleared")
 
 
@@ -297,3 +628,6 @@ if __name__ == "__main__":
 
     print("=" * 60)
     print(f"Messages in history: {len(ocr_filter.sent_messages)}")
+
+    # Flush file output
+    ocr_filter.close()
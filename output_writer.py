@@ -0,0 +1,232 @@
+"""
+Background Output Writer
+Tulis ocr_output.txt dari background thread: buffer di memory, flush
+periodik / saat buffer penuh, rotasi file berdasarkan ukuran atau waktu,
+dan segmen lama di-gzip supaya disk usage tetap terbatas.
+
+Capture thread hanya append ke buffer (tanpa file I/O).
+"""
+
+import glob
+import gzip
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+# fsync policy
+FSYNC_NEVER = "never"  # Serahkan ke OS (paling cepat)
+FSYNC_INTERVAL = "interval"  # fsync paling sering tiap fsync_interval detik
+FSYNC_ALWAYS = "always"  # fsync setiap flush
+
+
+class BackgroundFileWriter:
+    """Buffered, rotating file writer dengan worker thread sendiri"""
+
+    def __init__(
+        self,
+        path,
+        flush_interval=1.0,
+        flush_bytes=64 * 1024,
+        fsync_policy=FSYNC_INTERVAL,
+        fsync_interval=5.0,
+        max_bytes=10 * 1024 * 1024,
+        rotate_interval=None,
+        backup_count=10,
+        compress=True,
+        max_buffer_bytes=8 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path (str): File output (misal ocr_output.txt)
+            flush_interval (float): Maksimal detik data tinggal di buffer
+            flush_bytes (int): Flush lebih awal jika buffer sebesar ini
+            fsync_policy (str): "never", "interval", atau "always"
+            fsync_interval (float): Detik antar fsync untuk policy "interval"
+            max_bytes (int): Rotasi jika file melebihi ukuran ini (None = off)
+            rotate_interval (float): Rotasi tiap N detik (None = off)
+            backup_count (int): Jumlah segmen lama yang disimpan
+            compress (bool): Gzip segmen yang sudah di-rotate
+            max_buffer_bytes (int): Batas buffer jika disk macet; data
+                tertua di-drop (dihitung di dropped_lines)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.max_buffer_bytes = max_buffer_bytes
+
+        # Stats
+        self.lines_written = 0
+        self.dropped_lines = 0
+        self.rotations = 0
+
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._file = None
+        self._opened_at = None
+        self._last_fsync = time.monotonic()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        """
+        Queue satu baris (tanpa newline) untuk ditulis. Non-blocking I/O.
+
+        Returns:
+            bool: False jika writer sudah ditutup
+        """
+        data = line + "\n"
+        with self._condition:
+            if self._closed:
+                return False
+
+            self._buffer.append(data)
+            self._buffer_bytes += len(data)
+
+            # Disk macet: buang data tertua supaya memory tetap terbatas
+            while self._buffer_bytes > self.max_buffer_bytes and len(self._buffer) > 1:
+                self._buffer_bytes -= len(self._buffer.pop(0))
+                self.dropped_lines += 1
+
+            if self._buffer_bytes >= self.flush_bytes:
+                self._condition.notify()
+        return True
+
+    def flush(self, timeout=5.0):
+        """Minta worker flush sekarang dan tunggu sampai buffer kosong"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while self._buffer and time.monotonic() < deadline:
+                self._condition.wait(0.05)
+
+    def close(self, timeout=5.0):
+        """Flush semua data, fsync, dan stop worker thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Worker loop: tunggu data / timeout, lalu flush"""
+        while True:
+            with self._condition:
+                if not self._closed and self._buffer_bytes < self.flush_bytes:
+                    self._condition.wait(self.flush_interval)
+                chunk = self._buffer
+                self._buffer = []
+                self._buffer_bytes = 0
+                closed = self._closed
+                # Bangunkan flush() yang menunggu buffer kosong
+                self._condition.notify_all()
+
+            try:
+                if chunk:
+                    self._write_chunk(chunk)
+                self._maybe_rotate()
+            except OSError as e:
+                print(f"⚠️  Error saving to file: {e}")
+
+            if closed:
+                self._close_file(fsync=True)
+                return
+
+    def _open(self):
+        """Open file output (append)"""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._opened_at = time.time()
+
+    def _write_chunk(self, chunk):
+        """Tulis satu batch baris dan apply fsync policy"""
+        self._open()
+        self._file.writelines(chunk)
+        self._file.flush()
+        self.lines_written += len(chunk)
+
+        now = time.monotonic()
+        if self.fsync_policy == FSYNC_ALWAYS or (
+            self.fsync_policy == FSYNC_INTERVAL
+            and now - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def _close_file(self, fsync=False):
+        """Close file yang sedang dibuka"""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if fsync and self.fsync_policy != FSYNC_NEVER:
+                os.fsync(self._file.fileno())
+            self._file.close()
+        except OSError as e:
+            print(f"⚠️  Error closing output file: {e}")
+        self._file = None
+
+    def _maybe_rotate(self):
+        """Rotasi file jika melewati batas ukuran atau waktu"""
+        if self._file is None:
+            return
+
+        too_big = self.max_bytes and self._file.tell() >= self.max_bytes
+        too_old = (
+            self.rotate_interval
+            and time.time() - self._opened_at >= self.rotate_interval
+        )
+        if too_big or too_old:
+            self.rotate()
+
+    def rotate(self):
+        """
+        Rotate file sekarang: rename ke segmen bertimestamp, gzip,
+        lalu hapus segmen terlama di luar backup_count
+        """
+        self._close_file(fsync=True)
+        if not os.path.exists(self.path):
+            return
+
+        root, ext = os.path.splitext(self.path)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        segment = f"{root}.{stamp}{ext}"
+        counter = 1
+        while os.path.exists(segment) or os.path.exists(segment + ".gz"):
+            segment = f"{root}.{stamp}-{counter}{ext}"
+            counter += 1
+
+        os.replace(self.path, segment)
+        self.rotations += 1
+
+        if self.compress:
+            with open(segment, "rb") as src, gzip.open(segment + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+
+        self._prune_segments(root, ext)
+
+    def _prune_segments(self, root, ext):
+        """Hapus segmen rotated tertua (disk usage terbatas)"""
+        segments = sorted(
+            glob.glob(f"{glob.escape(root)}.*{ext}")
+            + glob.glob(f"{glob.escape(root)}.*{ext}.gz"),
+            key=os.path.getmtime,
+        )
+        for old in segments[: max(0, len(segments) - self.backup_count)]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                print(f"⚠️  Error removing old segment {old}: {e}")
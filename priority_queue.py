@@ -0,0 +1,176 @@
+"""
+Priority Message Queue
+Queue bounded antara capture thread dan Discord sender. Message dengan
+priority lebih tinggi (dari keyword yang match, lihat FilterRules) keluar
+lebih dulu; priority sama tetap FIFO.
+
+Saat penuh, overflow policy menentukan apa yang terjadi:
+- "drop_lowest": buang message dengan priority terendah (yang tertua jika
+  ada beberapa); message baru dibuang jika priority-nya paling rendah
+- "drop_oldest": buang message tertua, apapun priority-nya
+- "block": put() menunggu sampai ada tempat (backpressure ke capture thread)
+
+Interface get()/get_nowait() sama dengan queue.Queue (raise queue.Empty).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from queue import Empty
+
+# Overflow policy
+OVERFLOW_DROP_LOWEST = "drop_lowest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+
+OVERFLOW_POLICIES = (OVERFLOW_DROP_LOWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK)
+
+
+class PriorityMessageQueue:
+    """Bounded priority queue (thread-safe) dengan overflow policy"""
+
+    def __init__(self, max_size=1000, overflow=OVERFLOW_DROP_LOWEST, on_drop=None):
+        """
+        Args:
+            max_size (int): Maksimal item di queue
+            overflow (str): "drop_lowest", "drop_oldest" atau "block"
+            on_drop (callable): Dipanggil dengan item yang dibuang (misal
+                untuk hapus dari outbox), di luar lock
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.max_size = max_size
+        self.overflow = overflow
+        self.on_drop = on_drop
+
+        # Heap entry: (-priority, seq, item) -> priority tertinggi dulu, FIFO
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        # Stats
+        self.dropped = 0
+        self.dropped_by_priority = Counter()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    def qsize(self):
+        return len(self)
+
+    def _victim(self):
+        """Index entry yang dibuang saat penuh (O(n), queue bounded)"""
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            return min(range(len(self._heap)), key=lambda i: self._heap[i][1])
+        # Priority terendah = -priority terbesar, lalu seq terkecil
+        return min(
+            range(len(self._heap)),
+            key=lambda i: (-self._heap[i][0], self._heap[i][1]),
+        )
+
+    def put(self, item, priority=0, force=False, timeout=None):
+        """
+        Masukkan item
+
+        Args:
+            item: Item apa saja
+            priority (int): Lebih tinggi = keluar lebih dulu
+            force (bool): Abaikan max_size (untuk sentinel stop)
+            timeout (float): Maksimal detik menunggu (policy "block")
+
+        Returns:
+            bool: False jika item baru yang dibuang / timeout
+        """
+        accepted = True
+        dropped = []
+        with self._lock:
+            if not force and len(self._heap) >= self.max_size:
+                if self.overflow == OVERFLOW_BLOCK:
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while len(self._heap) >= self.max_size:
+                        remaining = None
+                        if deadline is not None:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                return False
+                        self._not_full.wait(remaining)
+                else:
+                    index = self._victim()
+                    lowest = -self._heap[index][0]
+                    if self.overflow == OVERFLOW_DROP_LOWEST and priority <= lowest:
+                        # Item baru yang paling tidak penting
+                        accepted = False
+                        dropped.append((item, priority))
+                    else:
+                        entry = self._heap[index]
+                        self._heap[index] = self._heap[-1]
+                        self._heap.pop()
+                        heapq.heapify(self._heap)
+                        dropped.append((entry[2], -entry[0]))
+
+            for _, dropped_priority in dropped:
+                self.dropped += 1
+                self.dropped_by_priority[dropped_priority] += 1
+
+            if accepted:
+                heapq.heappush(self._heap, (-priority, next(self._seq), item))
+                self._not_empty.notify()
+
+        # Callback di luar lock supaya on_drop boleh I/O (outbox)
+        for dropped_item, _ in dropped:
+            self._call_on_drop(dropped_item)
+        return accepted
+
+    def _call_on_drop(self, item):
+        if self.on_drop is None:
+            return
+        try:
+            self.on_drop(item)
+        except Exception as e:
+            print(f"⚠️  Error in queue drop handler: {e}")
+
+    def get(self, block=True, timeout=None):
+        """
+        Ambil item dengan priority tertinggi
+
+        Raises:
+            queue.Empty: Tidak ada item (non-blocking atau timeout)
+        """
+        with self._lock:
+            if not block:
+                if not self._heap:
+                    raise Empty
+            elif timeout is None:
+                while not self._heap:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._heap:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+
+            item = heapq.heappop(self._heap)[2]
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def status(self):
+        """Ringkasan untuk log"""
+        dropped = ", ".join(
+            f"p{priority}: {count}"
+            for priority, count in sorted(self.dropped_by_priority.items())
+        )
+        return (
+            f"📥 Queue: {len(self)}/{self.max_size} ({self.overflow}), "
+            f"{self.dropped} dropped" + (f" ({dropped})" if dropped else "")
+        )
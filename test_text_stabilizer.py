@@ -0,0 +1,69 @@
+"""
+Test TextStabilizer: variasi bacaan OCR antar frame digabung, tapi baris
+berbeda yang mirip di frame yang sama tetap dianggap baris sendiri.
+
+Usage:
+    python test_text_stabilizer.py
+"""
+
+import sys
+
+from text_stabilizer import TextStabilizer
+
+
+def test_ocr_variants_are_merged():
+    stabilizer = TextStabilizer(min_frames=2, window=3)
+    assert stabilizer.update("Shiro caught a Megalodon") == ""
+    assert stabilizer.update("Shiro caught a Megalocdon") == "Shiro caught a Megalodon"
+    assert stabilizer.update("Shiro caught a Megalodon") == ""
+
+
+def test_similar_lines_in_same_frame_stay_separate():
+    stabilizer = TextStabilizer(min_frames=2, window=3)
+    frame = (
+        "Shiro caught a Narwhal\n"
+        "Kuro caught a Narwhal\n"
+        "Player12 joined the server\n"
+        "Player13 joined the server"
+    )
+    assert stabilizer.update(frame) == ""
+    stable = stabilizer.update(frame)
+    assert stable == frame, stable
+
+
+def test_variant_matches_its_own_line():
+    stabilizer = TextStabilizer(min_frames=2, window=3)
+    stabilizer.update("Player12 joined the server\nPlayer13 joined the server")
+    stable = stabilizer.update("Player12 joined the server\nPlayer13 joined the serv3r")
+    assert stable == "Player12 joined the server\nPlayer13 joined the server", stable
+
+
+def test_repeated_line_is_emitted_once():
+    stabilizer = TextStabilizer(min_frames=2, window=3)
+    stabilizer.update("Player12 joined the server\nPlayer12 joined the server")
+    stable = stabilizer.update("Player12 joined the server")
+    assert stable == "Player12 joined the server", stable
+
+
+def main():
+    tests = [
+        test_ocr_variants_are_merged,
+        test_similar_lines_in_same_frame_stay_separate,
+        test_variant_matches_its_own_line,
+        test_repeated_line_is_emitted_once,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
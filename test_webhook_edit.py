@@ -0,0 +1,138 @@
+"""
+Test rolling-message edit mode DiscordWebhook terhadap FakeDiscordServer
+lokal (tidak butuh Discord asli). Server mencatat semua request HTTP.
+
+Usage:
+    python test_webhook_edit.py
+"""
+
+import sys
+import time
+
+from discord_webhook import DiscordWebhook
+from fake_discord import FakeDiscordServer
+
+
+def start_server(latency=0.0):
+    # Tanpa rate limit server: pacing client sendiri yang diuji di sini
+    return FakeDiscordServer(latency=latency, rate_limit=0).start()
+
+
+def make_webhook(server, **options):
+    options.setdefault("coalesce_window", 0)
+    return DiscordWebhook(
+        server.webhook_url(), edit_mode=True, edit_max_priority=0, **options
+    )
+
+
+def methods(server):
+    return [
+        (request.method, request.path.rsplit("/", 1)[-1], request.query)
+        for request in server.requests
+    ]
+
+
+def content(server, message_id):
+    return server.messages[message_id]["content"]
+
+
+def test_routine_lines_edit_live_message():
+    server = start_server()
+    webhook = make_webhook(server)
+    for index in range(3):
+        webhook.send_ocr_result(f"Player{index} joined", priority=0)
+        time.sleep(0.1)
+    webhook.close()
+
+    requests = methods(server)
+    assert requests[0] == ("POST", "token", {"wait": ["true"]}), requests
+    assert [method for method, _, _ in requests[1:]] == ["PATCH", "PATCH"], requests
+    assert requests[1][1] == "1", requests
+    assert (
+        content(server, "1")
+        == "```\nPlayer0 joined\nPlayer1 joined\nPlayer2 joined\n```"
+    )
+
+
+def test_updates_during_edit_are_coalesced():
+    server = start_server(latency=0.2)
+    webhook = make_webhook(server)
+    for index in range(20):
+        webhook.send_ocr_result(f"Player{index} joined", priority=0)
+        time.sleep(0.02)
+    webhook.close()
+
+    # 20 update, tapi hanya state terakhir yang dikirim setiap request
+    assert len(server.requests) <= 5, methods(server)
+    final = content(server, "1")
+    assert all(f"Player{index} joined" in final for index in range(20)), final
+
+
+def test_important_event_posts_new_message():
+    server = start_server()
+    webhook = make_webhook(server)
+    webhook.send_ocr_result("Player0 joined", priority=0)
+    time.sleep(0.1)
+    webhook.send_ocr_result("Divine Secret 1/1000 Aetherfin!", priority=5)
+    time.sleep(0.1)
+    webhook.send_ocr_result("Player1 joined", priority=0)
+    webhook.close()
+
+    assert methods(server) == [
+        ("POST", "token", {"wait": ["true"]}),
+        ("POST", "token", {}),
+        ("POST", "token", {"wait": ["true"]}),
+    ], methods(server)
+    assert content(server, "3") == "```\nPlayer1 joined\n```"
+
+
+def test_full_live_message_starts_new_one():
+    server = start_server()
+    webhook = make_webhook(server)
+    line = "x" * 900
+    for _ in range(3):
+        webhook.send_ocr_result(line, priority=0)
+        time.sleep(0.1)
+    webhook.close()
+
+    # 2 x 900 masih muat di 2000 char, yang ketiga harus message baru
+    assert [method for method, _, _ in methods(server)] == ["POST", "PATCH", "POST"]
+    assert all(len(message["content"]) <= 2000 for message in server.messages.values())
+
+
+def test_deleted_live_message_is_reposted():
+    server = start_server()
+    webhook = make_webhook(server)
+    webhook.send_ocr_result("Player0 joined", priority=0)
+    time.sleep(0.1)
+    server.delete_message("1")
+    webhook.send_ocr_result("Player1 joined", priority=0)
+    webhook.close()
+
+    assert [method for method, _, _ in methods(server)] == ["POST", "PATCH", "POST"]
+    assert content(server, "2") == "```\nPlayer0 joined\nPlayer1 joined\n```"
+
+
+def main():
+    tests = [
+        test_routine_lines_edit_live_message,
+        test_updates_during_edit_are_coalesced,
+        test_important_event_posts_new_message,
+        test_full_live_message_starts_new_one,
+        test_deleted_live_message_is_reposted,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
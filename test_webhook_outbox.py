@@ -0,0 +1,121 @@
+"""
+Test retry DiscordWebhook + Outbox terhadap FakeDiscordServer lokal (tidak
+butuh Discord asli): batch yang dipecah ke beberapa request di-ack per
+request, jadi chunk yang sudah diterima Discord tidak dikirim ulang saat
+chunk lain gagal.
+
+Usage:
+    python test_webhook_outbox.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+from discord_outbox import Outbox
+from discord_webhook import DiscordWebhook
+from fake_discord import FakeDiscordServer
+
+# Marker unik per message supaya bisa dicocokkan di payload yang di-coalesce
+MARKER = re.compile(r"\bmsg-(\d+)\b")
+
+
+class PickyDiscordServer(FakeDiscordServer):
+    """Menolak (400) setiap payload yang berisi "REJECT" """
+
+    @staticmethod
+    def _validate(body, edit=False):
+        if isinstance(body, dict) and "REJECT" in (body.get("content") or ""):
+            return {"message": "Invalid Form Body", "code": 50035}
+        return FakeDiscordServer._validate(body, edit)
+
+
+def make_outbox():
+    path = os.path.join(tempfile.mkdtemp(prefix="test_outbox_"), "outbox.db")
+    return Outbox(path, base_backoff=0.1, max_backoff=0.5)
+
+
+def delivery_counts(server):
+    counts = {}
+    for request in server.delivered():
+        for seq in MARKER.findall(request.body.get("content") or ""):
+            counts[int(seq)] = counts.get(int(seq), 0) + 1
+    return counts
+
+
+def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+def send_batch(webhook, texts):
+    # Semua masuk dalam satu coalesce window -> satu batch, beberapa chunk
+    for text in texts:
+        webhook.send_ocr_result(text)
+
+
+def test_failed_chunk_does_not_repost_delivered_chunks():
+    server = FakeDiscordServer(rate_limit=0, error_rate=0.3, seed=7).start()
+    outbox = make_outbox()
+    webhook = DiscordWebhook(server.webhook_url(), coalesce_window=0.5, outbox=outbox)
+    # ~600 char per message: 3 message per chunk, 10 chunk per batch
+    send_batch(webhook, [f"msg-{seq} " + "x" * 600 for seq in range(30)])
+
+    arrived = wait_for(lambda: len(delivery_counts(server)) == 30, 20)
+    webhook.close()
+    server.stop()
+
+    counts = delivery_counts(server)
+    assert arrived, f"not delivered: {sorted(set(range(30)) - set(counts))}"
+    duplicates = {seq: count for seq, count in counts.items() if count > 1}
+    assert not duplicates, f"delivered more than once: {duplicates}"
+    assert server.status_counts().get(500, 0) > 0, server.status_counts()
+    assert len(outbox) == 0, outbox.status()
+    outbox.close()
+
+
+def test_rejected_message_only_drops_itself():
+    server = PickyDiscordServer(rate_limit=0).start()
+    outbox = make_outbox()
+    webhook = DiscordWebhook(server.webhook_url(), coalesce_window=0.5, outbox=outbox)
+    texts = [f"msg-{seq} " + "x" * 600 for seq in range(9)]
+    texts[7] = "msg-7 REJECT"
+    send_batch(webhook, texts)
+    webhook.close()
+    server.stop()
+
+    counts = delivery_counts(server)
+    assert set(counts) == set(range(9)) - {7}, sorted(counts)
+    duplicates = {seq: count for seq, count in counts.items() if count > 1}
+    assert not duplicates, f"delivered more than once: {duplicates}"
+    assert outbox.dropped == 1, outbox.status()
+    assert len(outbox) == 0, outbox.status()
+    outbox.close()
+
+
+def main():
+    tests = [
+        test_failed_chunk_does_not_repost_delivered_chunks,
+        test_rejected_message_only_drops_itself,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Test rate limit DiscordWebhook terhadap FakeDiscordServer lokal (tidak
+butuh Discord asli): burst message harus tetap sampai semua walaupun
+server membalas 429, dan webhook yang lambat / kena 429 tidak boleh
+menahan webhook lain di delivery engine yang sama.
+
+Usage:
+    python test_webhook_ratelimit.py
+"""
+
+import re
+import sys
+import time
+
+from discord_webhook import DiscordWebhook
+from fake_discord import FakeDiscordServer
+
+# Marker unik per message supaya bisa dicocokkan di payload yang di-coalesce
+MARKER = re.compile(r"\bmsg-(\d+)\b")
+
+
+def start_server(**options):
+    options.setdefault("rate_limit", 5)
+    options.setdefault("seed", 42)
+    return FakeDiscordServer(**options).start()
+
+
+def make_webhook(server, webhook_id=1):
+    return DiscordWebhook(server.webhook_url(webhook_id), coalesce_window=0)
+
+
+def delivered_markers(server):
+    markers = set()
+    for request in server.delivered():
+        markers.update(
+            int(seq) for seq in MARKER.findall(request.body.get("content") or "")
+        )
+    return markers
+
+
+def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def send_burst(webhook, count, spacing=0.05):
+    for seq in range(count):
+        webhook.send_ocr_result(f"msg-{seq} Player{seq} joined")
+        time.sleep(spacing)
+
+
+def test_burst_survives_429s():
+    # Selain bucket 5 request / 2 detik, 30% request dibalas 429 acak
+    server = start_server(rate_limit_chance=0.3, retry_after=0.2)
+    webhook = make_webhook(server)
+    send_burst(webhook, 20)
+    webhook.close()
+    server.stop()
+
+    missing = set(range(20)) - delivered_markers(server)
+    assert not missing, f"not delivered: {sorted(missing)}"
+    assert webhook.rate_limited_count > 0, server.status_counts()
+    assert server.status_counts().get(429, 0) > 0, server.status_counts()
+
+
+def test_burst_stays_within_bucket():
+    server = start_server(rate_period=1.0)
+    webhook = make_webhook(server)
+    send_burst(webhook, 20, spacing=0.02)
+    webhook.close()
+    server.stop()
+
+    # Pacing client sendiri: tidak perlu ditolak server sama sekali
+    missing = set(range(20)) - delivered_markers(server)
+    assert not missing, f"not delivered: {sorted(missing)}"
+    assert server.status_counts().get(429, 0) == 0, server.status_counts()
+
+
+def check_other_webhook_not_blocked(bad_server):
+    good_server = start_server()
+    bad = make_webhook(bad_server)
+    good = make_webhook(good_server, webhook_id=2)
+    try:
+        send_burst(bad, 10, spacing=0)
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        good.send_ocr_result("msg-0 Player0 joined")
+        arrived = wait_for(lambda: delivered_markers(good_server) == {0}, 2.0)
+        elapsed = time.monotonic() - start
+        assert arrived, "second webhook never delivered"
+        assert elapsed < 0.5, f"second webhook waited {elapsed:.2f}s"
+    finally:
+        good.close()
+        bad.close(timeout=1)
+        good_server.stop()
+        bad_server.stop()
+
+
+def test_slow_webhook_does_not_block_other():
+    check_other_webhook_not_blocked(start_server(latency=1.0))
+
+
+def test_rate_limited_webhook_does_not_block_other():
+    check_other_webhook_not_blocked(
+        start_server(rate_limit_chance=1.0, retry_after=2.0)
+    )
+
+
+def main():
+    tests = [
+        test_burst_survives_429s,
+        test_burst_stays_within_bucket,
+        test_slow_webhook_does_not_block_other,
+        test_rate_limited_webhook_does_not_block_other,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Text Stabilizer
+Stabilkan output OCR antar frame: background yang bergerak membuat tesseract
+membaca baris yang sama sedikit berbeda tiap frame ("Megalodon" /
+"Megalocdon" / "Mega1odon"), dan setiap variasi dianggap text baru.
+
+Setiap baris dikelompokkan dengan bacaan mirip dari frame sebelumnya.
+Baris baru di-emit sekali, setelah terbaca di minimal min_frames dari
+window frame terakhir, memakai variasi yang paling sering (majority vote).
+"""
+
+from collections import Counter, deque
+from difflib import SequenceMatcher
+
+
+class _Candidate:
+    """Satu baris (semua variasi bacaannya) yang sedang diamati"""
+
+    __slots__ = ("variants", "frames", "last_frame", "emitted")
+
+    def __init__(self):
+        self.variants = Counter()
+        self.frames = deque()
+        self.last_frame = 0
+        self.emitted = False
+
+
+class TextStabilizer:
+    """Majority vote per baris di window K frame"""
+
+    def __init__(self, min_frames=2, window=3, similarity=0.85):
+        """
+        Args:
+            min_frames (int): Baris di-emit setelah terbaca di N frame
+            window (int): Jumlah frame terakhir yang dihitung
+            similarity (float): Rasio minimal (0..1) supaya dua bacaan
+                dianggap baris yang sama
+        """
+        self.min_frames = min_frames
+        self.window = max(window, min_frames)
+        self.similarity = similarity
+
+        # key (lowercase) -> _Candidate, urutan = pertama kali muncul
+        self._candidates = {}
+        self._frame = 0
+
+        # Stats
+        self.frames = 0
+        self.lines_in = 0
+        self.lines_emitted = 0
+
+    def _find(self, key, claimed):
+        """
+        Candidate untuk baris (exact dulu, lalu fuzzy)
+
+        Hanya candidate dari frame sebelumnya yang boleh di-match: baris
+        lain di frame yang sama adalah baris berbeda, walaupun mirip
+        ("Shiro caught a Narwhal" / "Kuro caught a Narwhal").
+
+        Args:
+            key (str): Baris (lowercase)
+            claimed (set): Key yang sudah diproses di frame ini
+        """
+        frame = self._frame
+        candidate = self._candidates.get(key)
+        if candidate is not None and (candidate.last_frame != frame or key in claimed):
+            return candidate
+
+        best = None
+        best_ratio = self.similarity
+        for other_key, candidate in self._candidates.items():
+            if candidate.last_frame == frame:
+                continue
+            matcher = SequenceMatcher(None, key, other_key)
+            if (
+                matcher.real_quick_ratio() >= best_ratio
+                and matcher.quick_ratio() >= best_ratio
+            ):
+                ratio = matcher.ratio()
+                if ratio >= best_ratio and (best is None or ratio > best_ratio):
+                    best = candidate
+                    best_ratio = ratio
+        if best is not None:
+            # Variasi baru ikut di-index supaya frame berikutnya exact
+            self._candidates[key] = best
+        return best
+
+    def update(self, text):
+        """
+        Masukkan text satu frame
+
+        Args:
+            text (str): Raw OCR text (multi-line)
+
+        Returns:
+            str: Baris yang baru stabil (dipisah newline), "" jika tidak ada
+        """
+        self._frame += 1
+        self.frames += 1
+        frame = self._frame
+
+        order = []
+        claimed = set()
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            self.lines_in += 1
+
+            key = line.lower()
+            candidate = self._find(key, claimed)
+            if candidate is None:
+                candidate = self._candidates[key] = _Candidate()
+            claimed.add(key)
+
+            candidate.variants[line] += 1
+            if candidate.last_frame != frame:
+                candidate.last_frame = frame
+                candidate.frames.append(frame)
+                order.append(candidate)
+
+        # Buang frame di luar window dan candidate yang sudah hilang
+        oldest = frame - self.window + 1
+        for key, candidate in list(self._candidates.items()):
+            while candidate.frames and candidate.frames[0] < oldest:
+                candidate.frames.popleft()
+            if not candidate.frames:
+                del self._candidates[key]
+
+        stable = []
+        for candidate in order:
+            if not candidate.emitted and len(candidate.frames) >= self.min_frames:
+                candidate.emitted = True
+                stable.append(candidate.variants.most_common(1)[0][0])
+
+        self.lines_emitted += len(stable)
+        return "\n".join(stable)
+
+    def reset(self):
+        """Lupakan semua candidate (misal setelah capture area berubah)"""
+        self._candidates.clear()
+
+    def status(self):
+        """Ringkasan untuk log"""
+        return (
+            f"🧮 Stabilizer: {self.lines_emitted}/{self.lines_in} lines emitted "
+            f"over {self.frames} frames (K={self.min_frames}, window={self.window})"
+        )